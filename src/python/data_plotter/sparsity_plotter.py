@@ -39,6 +39,9 @@ class DataProcessor:
             return None
 
     def prepare_data(self):
+        if isinstance(self.data, DataFrame):
+            return self.prepare_table()
+
         if not self.data:
             return None, None
 
@@ -53,6 +56,25 @@ class DataProcessor:
         }
         return buildings, prepared_data
 
+    def prepare_table(self, column="zero_elements"):
+        """Reads the per-network `column` from the sparsity table of `BuildingProcessor.calculate_sparsity`."""
+        networks = [
+            network
+            for network in self.data.index.unique("network")
+            if network not in ("Sum", "Type", "Campus", "Average")
+        ]
+        if not networks:
+            return None, None
+
+        table = self.data.loc[networks, column].unstack("network").fillna(0)
+        return list(table.index), {network: table[network].tolist() for network in networks}
+
+    def aggregate_table(self, column="zero_elements"):
+        """The `column` of the network aggregate ('Sum') rows, by building."""
+        if not isinstance(self.data, DataFrame) or "Sum" not in self.data.index.unique("network"):
+            return {}
+        return self.data.loc["Sum", column].to_dict()
+
 
 class DataPlotter:
     
@@ -126,12 +148,8 @@ class DataPlotter:
 
 
     def create_aggregate_bar_chart(self, fig, ax, width, colors, buildings, x, title):
-        zero_elements_sum = []
-        for building in buildings:
-            if "Sum" in data and building in data["Sum"]:
-                zero_elements_sum.append(data["Sum"][building]["zero_elements"])
-            else:
-                zero_elements_sum.append(0)
+        aggregate = self.data_processor.aggregate_table()
+        zero_elements_sum = [aggregate.get(building, 0) for building in buildings]
 
         x = np.ravel(x)
         zero_elements_sum = np.ravel(zero_elements_sum)
@@ -167,12 +185,10 @@ class DataPlotter:
         show_plot=True,
         output_dir="./data/output/building-plots/all-buildings",
     ):
-        if data is not None:
+        aggregate = self.data_processor.aggregate_table()
+        if aggregate:
             fig, ax = plt.subplots(figsize=(18, 15))
-            if "Sum" in data:
-                buildings = list(data["Sum"].keys())
-            else:
-                buildings = []
+            buildings = list(aggregate.keys())
 
             x = np.arange(len(buildings))
             date_range = "default_date_range"
@@ -0,0 +1,327 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the Dynamic Mode Decomposition (DMD) of the (building x time) snapshot matrix: the StreamingDMD and DMDEngine classes.
+
+DMD fits the linear operator A with x(t + 1) ~ A x(t) between consecutive snapshots (columns) of the matrix, X = M[:, :-1] and Y = M[:, 1:] (views, not copies), and returns the eigenvalues and modes of A:
+- exact:        A is projected on the rank-r left singular vectors of X from the dense SVD
+- randomized:   the same with the randomized SVD of `svd.py`, O(r * buildings * time)
+
+The eigenvalues are per grid step; `mode_table` turns them into periods (hours) and growth rates (per hour).
+
+StreamingDMD is the online DMD (Zhang, Rowley, Deem and Cattafesta): it keeps the full (building x building) operator A = Y X^T (X X^T)^-1 and P = (X X^T)^-1 and updates both with a rank-1 (Sherman-Morrison) step for every new snapshot. An update costs O(buildings^2), whatever the length of the history, so new minutes are added without refactoring the history. A forgetting factor < 1 weights the older snapshots down geometrically.
+
+DMDEngine runs the exact or randomized DMD on every date chunk (one per `CHUNK_WINDOW` of `config2.json`) of the normalized 'Sum' matrix on the shared worker pool, and writes every chunk to `<chunk>/dmd/modes.npz` (or `rand-dmd`). `benchmark` times the streaming update per snapshot against refitting the exact DMD on the whole history, and writes `dmd-timings.csv`.
+
+Example: fit on the history, then add every new minute
+
+    stream = StreamingDMD.fit(matrix.values[:, :-1440])
+    stream.extend(matrix.values[:, -1440:])
+    eigenvalues, modes = stream.eigs(rank=10)
+
+"""
+
+import time
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from joblib import delayed
+
+from src.python.processor.config_manager import ConfigManager
+from src.python.processor.data_processor import BASE_DIR, worker_pool
+from src.python.decomps.matrix import BuildingMatrix
+from src.python.decomps.svd import randomized_svd, dense_svd
+
+
+logger = logging.getLogger(__name__)
+
+
+METHODS = ('exact', 'randomized')
+
+
+def dmd(snapshots:          np.ndarray,
+        rank:               int,
+        method:             str = 'exact',
+        oversample:         int = 10,
+        power_iterations:   int = 4,
+        seed:               int = 0,
+        tol:                float = 1e-8    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the eigenvalues (r), modes (building x r) and amplitudes (r) of the rank-`rank` DMD of the (building x time) `snapshots`."""
+
+    if method not in METHODS:
+        raise ValueError(f"Unknown DMD method: {method}. Expected one of {METHODS}.")
+
+    snapshots   = np.asarray(snapshots, dtype=np.float32)
+    x, y        = snapshots[:, :-1], snapshots[:, 1:]
+
+    if method == 'randomized':
+        u, s, vt = randomized_svd(x, rank, oversample, power_iterations, seed)
+
+    else:
+        u, s, vt = dense_svd(x)
+        u, s, vt = u[:, :rank], s[:rank], vt[:rank]
+
+    # Singular values at round-off level would blow up the projection
+    keep        = s > tol * s[0] if len(s) and s[0] > 0 else np.zeros(len(s), dtype=bool)
+    u, s, vt    = u[:, keep].astype(np.float64), s[keep].astype(np.float64), vt[keep].astype(np.float64)
+
+    y_v                     = (y @ vt.T.astype(np.float32)).astype(np.float64) / s
+    eigenvalues, vectors    = np.linalg.eig(u.T @ y_v)
+    modes                   = y_v @ vectors
+    amplitudes              = np.linalg.lstsq(modes, snapshots[:, 0].astype(np.float64), rcond=None)[0]
+
+    return eigenvalues, modes, amplitudes
+
+
+def mode_table(eigenvalues: np.ndarray, amplitudes: np.ndarray, step: pd.Timedelta) -> pd.DataFrame:
+    """The period (hours), growth rate (per hour) and amplitude of every mode, for eigenvalues per grid step `step`."""
+
+    hours       = step / pd.Timedelta(hours=1)
+    with np.errstate(divide='ignore'):
+        rates   = np.log(eigenvalues.astype(np.complex128)) / hours
+        periods = np.where(np.abs(rates.imag) > 0, 2 * np.pi / np.abs(rates.imag), np.inf)
+
+    table = pd.DataFrame({'eigenvalue':     eigenvalues,
+                          'period_hours':   periods,
+                          'growth_rate':    rates.real,
+                          'amplitude':      np.abs(amplitudes)})
+
+    return table.sort_values('amplitude', ascending=False, ignore_index=True)
+
+
+###############################################################################
+#
+#   Class: StreamingDMD
+#
+###############################################################################
+
+class StreamingDMD:
+
+    def __init__(
+        self,
+        n_buildings     : int,
+        forgetting      : float = 1.0,
+        regularization  : float = 1e-6
+        ):
+
+        self.forgetting     =   forgetting
+        self.regularization =   regularization
+        self.operator       =   np.zeros((n_buildings, n_buildings))
+        self.precision      =   np.eye(n_buildings) / regularization
+        self.last           =   None
+        self.updates        =   0
+
+
+    @classmethod
+    def fit(cls, snapshots: np.ndarray, forgetting: float = 1.0, regularization: float = 1e-6, block: int = 65536) -> 'StreamingDMD':
+        """
+        Initializes the operator from the (building x time) history in one batch solve. X X^T and Y X^T
+        are accumulated in float64 over blocks of `block` snapshots, so the history is never copied whole.
+        """
+
+        snapshots   = np.asarray(snapshots)
+        n, length   = snapshots.shape
+        stream      = cls(n, forgetting, regularization)
+        gram        = np.zeros((n, n))
+        cross       = np.zeros((n, n))
+
+        for start in range(0, length - 1, block):
+            end     = min(start + block, length - 1)
+            x       = snapshots[:, start:end].astype(np.float64)
+            gram   += x @ x.T
+            cross  += snapshots[:, start + 1:end + 1].astype(np.float64) @ x.T
+
+        if length > 1:
+            stream.precision    = np.linalg.inv(gram + regularization * np.eye(n))
+            stream.operator     = cross @ stream.precision
+            stream.updates      = length - 1
+
+        stream.last = snapshots[:, -1].astype(np.float64) if length else None
+
+        return stream
+
+
+    ##################################
+    #   Updates
+    ##################################
+    def update(self, x: np.ndarray, y: np.ndarray) -> 'StreamingDMD':
+        """Adds the snapshot pair x -> y with a rank-1 update of the operator and of P = (X X^T)^-1."""
+
+        precision   = self.precision / self.forgetting
+        px          = precision @ x
+        gain        = 1.0 / (1.0 + x @ px)
+
+        self.operator   += gain * np.outer(y - self.operator @ x, px)
+        self.precision   = precision - gain * np.outer(px, px)
+        self.updates    += 1
+
+        return self
+
+
+    def extend(self, snapshots: np.ndarray) -> 'StreamingDMD':
+        """Adds the new (building x time) snapshots, each paired with the snapshot before it."""
+
+        snapshots = np.asarray(snapshots, dtype=np.float64)
+
+        for column in snapshots.T:
+            if self.last is not None:
+                self.update(self.last, column)
+
+            self.last = column.copy()
+
+        return self
+
+
+    def eigs(self, rank: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """The eigenvalues and modes of the current operator, the `rank` largest in magnitude when given."""
+
+        eigenvalues, modes  = np.linalg.eig(self.operator)
+        order               = np.argsort(-np.abs(eigenvalues))[:rank]
+
+        return eigenvalues[order], modes[:, order]
+
+
+def _decompose_chunk(values:            np.ndarray,
+                     rank:              int,
+                     method:            str,
+                     oversample:        int,
+                     power_iterations:  int,
+                     seed:              int     ) -> Dict:
+    """Worker: the DMD of one chunk, with its timing."""
+
+    start_time                          = time.perf_counter()
+    eigenvalues, modes, amplitudes      = dmd(values, rank, method, oversample, power_iterations, seed)
+
+    return {'eigenvalues': eigenvalues, 'modes': modes, 'amplitudes': amplitudes, 'seconds': time.perf_counter() - start_time}
+
+
+###############################################################################
+#
+#   Class: DMDEngine
+#
+###############################################################################
+
+class DMDEngine:
+
+    def __init__(
+        self,
+        rank                : int   = None,
+        method              : str   = 'exact',
+        oversample          : int   = 10,
+        power_iterations    : int   = 4,
+        window              : str   = None,
+        cpu_cores           : int   = multiprocessing.cpu_count(),
+        output_directory    : Path  = None,
+        seed                : int   = 0,
+        config_name                 = "Config1",
+        config_file                 = "config2.json"
+        ):
+
+        if method not in METHODS:
+            raise ValueError(f"Unknown DMD method: {method}. Expected one of {METHODS}.")
+
+        self.config             =   ConfigManager(config_file).get_configuration(config_name)
+        self.rank               =   rank or self.config['DMD_RANK']
+        self.method             =   method
+        self.oversample         =   oversample
+        self.power_iterations   =   power_iterations
+        self.window             =   window or self.config['CHUNK_WINDOW']
+        self.cpu_cores          =   cpu_cores
+        self.output_directory   =   Path(output_directory or BASE_DIR.joinpath(self.config['DECOMP_DIRECTORY']))
+        self.seed               =   seed
+
+
+    @property
+    def folder_name(self) -> str:
+        return 'rand-dmd' if self.method == 'randomized' else 'dmd'
+
+
+    def decompose(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The eigenvalues, modes and amplitudes of the DMD of one (building x time) matrix."""
+        return dmd(matrix, self.rank, self.method, self.oversample, self.power_iterations, self.seed)
+
+
+    ##################################
+    #   Chunked runs
+    ##################################
+    def run(self, results: Dict) -> pd.DataFrame:
+        """
+        Decomposes every date chunk of the normalized 'Sum' matrix of `results` (the output of
+        `aggregate_network_data`) in parallel and writes the modes. Returns the modes of every chunk
+        (`mode_table`) with the chunk dates and timing.
+        """
+
+        matrix  = BuildingMatrix.from_results(results)
+        chunks  = list(matrix.chunks(self.window))
+        tasks   = [delayed(_decompose_chunk)(chunk.values, self.rank, self.method, self.oversample, self.power_iterations, self.seed)
+                   for start_date, end_date, chunk in chunks]
+        outputs = worker_pool(self.cpu_cores)(tasks)
+        tables  = []
+
+        for (start_date, end_date, chunk), output in zip(chunks, outputs):
+            path = chunk.save(BuildingMatrix.folder(self.output_directory, start_date, end_date, self.folder_name), 'modes.npz',
+                              eigenvalues   = output['eigenvalues'],
+                              modes         = output['modes'].astype(np.complex64),
+                              amplitudes    = output['amplitudes'])
+            logger.info(f"{path.parent.name}\tsaved to: {path.parent}")
+
+            table = mode_table(output['eigenvalues'], output['amplitudes'], chunk.index[1] - chunk.index[0] if len(chunk.index) > 1 else pd.Timedelta(minutes=1))
+            tables.append(table.assign(start=start_date, end=end_date, method=self.method, seconds=output['seconds']))
+
+        return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+
+
+    ##################################
+    #   Streaming timings
+    ##################################
+    def benchmark(self, results: Dict, history: Sequence[float] = (0.25, 0.5, 0.75, 1.0), snapshots: int = 1440) -> pd.DataFrame:
+        """
+        For every fraction of the 'Sum' matrix in `history`, times adding `snapshots` new snapshots with the
+        streaming update (per snapshot) against refitting the exact DMD on the history plus one snapshot, and
+        writes the timings to `dmd-timings.csv`.
+        """
+
+        matrix  = BuildingMatrix.from_results(results).values
+        rows    = []
+
+        for fraction in history:
+            end = int(fraction * matrix.shape[1])
+
+            if end <= snapshots + 1:
+                continue
+
+            start_time  = time.perf_counter()
+            stream      = StreamingDMD.fit(matrix[:, :end - snapshots])
+            fit_seconds = time.perf_counter() - start_time
+
+            start_time  = time.perf_counter()
+            stream.extend(matrix[:, end - snapshots:end])
+            per_update  = (time.perf_counter() - start_time) / snapshots
+
+            start_time  = time.perf_counter()
+            dmd(matrix[:, :end], self.rank, 'exact')
+            refit       = time.perf_counter() - start_time
+
+            rows.append({'history': end, 'buildings': matrix.shape[0], 'initial_fit_seconds': fit_seconds,
+                         'update_seconds': per_update, 'exact_refit_seconds': refit, 'speedup': refit / per_update})
+
+        timings = pd.DataFrame(rows)
+
+        if rows:
+            self.output_directory.mkdir(parents=True, exist_ok=True)
+            timings.to_csv(self.output_directory.joinpath('dmd-timings.csv'), index=False)
+
+        return timings
@@ -0,0 +1,115 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the BuildingMatrix class, the (building x time) float32 matrix that the decompositions work on.
+
+It is built from the 'Sum' frames of `BuildingProcessor.aggregate_network_data`, which share one time grid. Each building is min-max normalized over the whole range (as the normalized plots are), and grid points without data are 0, so the matrix has no NaN. The matrix is split into date chunks (e.g. one per month) whose results are written to the existing output layout:
+
+    data/output/building-plots/chunks/normalized/"%b-%d-%Y"_to_"%b-%d-%Y"/<method>
+
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+
+
+DATETIME    = 'datetime'
+DEVICECOUNT = 'devicecount'
+
+
+###############################################################################
+#
+#   Class: BuildingMatrix
+#
+###############################################################################
+
+class BuildingMatrix:
+
+    def __init__(
+        self,
+        values      : np.ndarray,
+        index       : pd.DatetimeIndex,
+        buildings   : List[str]
+        ):
+
+        self.values     =   np.ascontiguousarray(values, dtype=np.float32)
+        self.index      =   pd.DatetimeIndex(index)
+        self.buildings  =   np.asarray(buildings, dtype=object)
+
+        if self.values.shape != (len(self.buildings), len(self.index)):
+            raise ValueError(f"Matrix shape {self.values.shape} does not match the labels ({len(self.buildings)}, {len(self.index)})")
+
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+
+    @classmethod
+    def from_results(cls, results: Dict, key: str = 'Sum', normalize: bool = True) -> 'BuildingMatrix':
+        """Stacks the `{building: df}` entry `key` of `aggregate_network_data` into a (building x time) matrix."""
+
+        frames  = {building: df for building, df in results[key].items() if not df.empty}
+        index   = pd.DatetimeIndex(next(iter(frames.values()))[DATETIME]) if frames else pd.DatetimeIndex([])
+        values  = np.stack([df[DEVICECOUNT].to_numpy(dtype=np.float32) for df in frames.values()]) if frames else \
+                  np.zeros((0, 0), dtype=np.float32)
+
+        if normalize and values.size:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                low     = np.nanmin(values, axis=1, keepdims=True)
+                high    = np.nanmax(values, axis=1, keepdims=True)
+                values  = np.where(high > low, (values - low) / (high - low), 0)
+
+        return cls(np.nan_to_num(values, nan=0.0), index, list(frames))
+
+
+    ##################################
+    #   Date chunks
+    ##################################
+    def chunks(self, window: str = 'MS') -> Iterator[Tuple[pd.Timestamp, pd.Timestamp, 'BuildingMatrix']]:
+        """Yields (first time, last time, sub-matrix) for every `window` (e.g. 'MS' for months) of the grid."""
+
+        if len(self.index) == 0:
+            return
+
+        boundaries  = [self.index[0]] + [b for b in pd.date_range(self.index[0], self.index[-1], freq=window) if b > self.index[0]]
+        starts      = np.searchsorted(self.index.values, np.array(boundaries, dtype='datetime64[ns]'), side='left')
+        ends        = np.r_[starts[1:], len(self.index)]
+
+        for start, end in zip(starts, ends):
+            if end > start:
+                yield self.index[start], self.index[end - 1], BuildingMatrix(self.values[:, start:end], self.index[start:end], self.buildings)
+
+
+    @staticmethod
+    def folder(output_directory: Path, start_date: pd.Timestamp, end_date: pd.Timestamp, method: str) -> Path:
+        """The output folder of one chunk and method, as named by `PlotSaver`."""
+        return Path(output_directory).joinpath(f"{start_date.strftime('%b-%d-%Y')}_to_{end_date.strftime('%b-%d-%Y')}", method)
+
+
+    def save(self, folder: Path, filename: str, **arrays) -> Path:
+        """Writes `arrays` with the building labels and the int64 ns grid of this matrix to `folder/filename`."""
+
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        path   = folder.joinpath(filename)
+
+        np.savez(path,
+                 **arrays,
+                 buildings  = self.buildings.astype(str),
+                 datetime   = self.index.values.astype('datetime64[ns]').astype(np.int64)
+                 )
+
+        return path
@@ -0,0 +1,294 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the NMFEngine class, which factors the normalized (building x time) matrix of every date chunk as X ~ W H with W, H >= 0.
+
+W (building x rank) holds the building loadings and H (rank x time) the temporal patterns. The updates are vectorized NumPy:
+- HALS (default): hierarchical alternating least squares, one closed-form update per factor row/column
+- MU: the Lee-Seung multiplicative updates
+
+TSNMF adds a temporal smoothness penalty `smoothness * ||H D||^2` (D the first difference along time). With HALS each row of H is then the solution of a tridiagonal system, solved with `scipy.linalg.solveh_banded`; with MU the penalty enters as a graph Laplacian.
+
+Warm starts: the chunks are fitted in time order and each chunk starts from the W of the previous chunk (H from a few H-only updates), so it converges in fewer iterations and its factors line up with the previous chunk's. The chunks are split into contiguous segments that run on the shared worker pool; every segment starts from the same W, fitted once on an hourly decimation of the whole matrix, so the factors are also comparable across segments.
+
+Every chunk is written to `<chunk>/nmf/factors.npz` (or `tsnmf`), and the iterations, error and time of every chunk to `nmf-log.csv` (or `tsnmf-log.csv`) in the output directory.
+
+"""
+
+import time
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from joblib import delayed
+from scipy.linalg import solveh_banded
+
+from src.python.processor.config_manager import ConfigManager
+from src.python.processor.data_processor import BASE_DIR, worker_pool
+from src.python.decomps.matrix import BuildingMatrix
+
+
+logger  = logging.getLogger(__name__)
+
+EPSILON = 1e-10
+METHODS = ('hals', 'mu')
+
+
+def relative_error(matrix: np.ndarray, w: np.ndarray, h: np.ndarray, norm: float = None) -> float:
+    """||X - W H||_F / ||X||_F from the small (rank x rank) products, without forming W H."""
+
+    norm        = np.linalg.norm(matrix) if norm is None else norm
+    residual    = norm**2 - 2 * np.sum(w * (matrix @ h.T)) + np.sum((w.T @ w) * (h @ h.T))
+
+    return float(np.sqrt(max(residual, 0.0)) / norm) if norm else 0.0
+
+
+def _smooth_system(diagonal: float, smoothness: float, length: int) -> np.ndarray:
+    """Upper banded form of (diagonal * I + smoothness * L), L the first-difference Laplacian of `length` points."""
+
+    banded          = np.empty((2, length))
+    banded[0]       = -smoothness
+    banded[1]       = diagonal + 2 * smoothness
+    banded[1, 0]    = diagonal + smoothness
+    banded[1, -1]   = diagonal + smoothness
+
+    return banded
+
+
+##################################
+#   Updates
+##################################
+def _update_h(matrix: np.ndarray, w: np.ndarray, h: np.ndarray, method: str, smoothness: float) -> np.ndarray:
+
+    wtx = w.T @ matrix
+    wtw = w.T @ w
+
+    if method == 'mu':
+        numerator   = wtx
+        denominator = wtw @ h
+
+        if smoothness:
+            neighbours      = np.zeros_like(h)
+            neighbours[:, 1:]  += h[:, :-1]
+            neighbours[:, :-1] += h[:, 1:]
+            degree          = np.full(h.shape[1], 2.0, dtype=h.dtype)
+            degree[[0, -1]] = 1.0
+            numerator       = numerator   + smoothness * neighbours
+            denominator     = denominator + smoothness * degree * h
+
+        return h * numerator / np.maximum(denominator, EPSILON)
+
+    for j in range(h.shape[0]):
+        target = wtx[j] - wtw[j] @ h + wtw[j, j] * h[j]
+
+        if smoothness and h.shape[1] > 1:
+            h[j] = np.maximum(solveh_banded(_smooth_system(wtw[j, j], smoothness, h.shape[1]), target, check_finite=False), EPSILON)
+
+        else:
+            h[j] = np.maximum(target / max(wtw[j, j], EPSILON), EPSILON)
+
+    return h
+
+
+def _update_w(matrix: np.ndarray, w: np.ndarray, h: np.ndarray, method: str) -> np.ndarray:
+
+    xht = matrix @ h.T
+    hht = h @ h.T
+
+    if method == 'mu':
+        return w * xht / np.maximum(w @ hht, EPSILON)
+
+    for j in range(w.shape[1]):
+        w[:, j] = np.maximum(w[:, j] + (xht[:, j] - w @ hht[:, j]) / max(hht[j, j], EPSILON), EPSILON)
+
+    return w
+
+
+def _normalize(w: np.ndarray, h: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scales the columns of W to unit norm (and the rows of H inversely), so warm-started factors keep one scale."""
+
+    scale = np.maximum(np.linalg.norm(w, axis=0), EPSILON)
+    return w / scale, h * scale[:, None]
+
+
+def fit(matrix:     np.ndarray,
+        rank:       int,
+        w:          np.ndarray  = None,
+        h:          np.ndarray  = None,
+        method:     str         = 'hals',
+        smoothness: float       = 0.0,
+        max_iter:   int         = 200,
+        tol:        float       = 1e-4,
+        seed:       int         = 0     ) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """
+    Factors `matrix` ~ W H. A given `w` is a warm start; H then starts from a few H-only updates.
+    Stops when the relative error improves by less than `tol`. Returns W, H and the fit log.
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"Unknown NMF method: {method}. Expected one of {METHODS}.")
+
+    start_time  = time.perf_counter()
+    matrix      = np.asarray(matrix, dtype=np.float64)
+    norm        = np.linalg.norm(matrix)
+    rng         = np.random.default_rng(seed)
+    scale       = np.sqrt(max(matrix.mean(), EPSILON) / rank)
+    warm        = w is not None
+
+    w = np.array(w, dtype=np.float64) if warm else rng.random((matrix.shape[0], rank)) * scale
+
+    if h is None:
+        h = rng.random((rank, matrix.shape[1])) * scale
+
+        for _ in range(10 if warm else 0):
+            h = _update_h(matrix, w, h, method, smoothness)
+
+    h       = np.array(h, dtype=np.float64)
+    error   = relative_error(matrix, w, h, norm)
+    errors  = [error]
+
+    for iteration in range(1, max_iter + 1):
+        h       = _update_h(matrix, w, h, method, smoothness)
+        w       = _update_w(matrix, w, h, method)
+        w, h    = _normalize(w, h)
+        error   = relative_error(matrix, w, h, norm)
+        errors.append(error)
+
+        if errors[-2] - error < tol * max(errors[-2], EPSILON):
+            break
+
+    log = {'iterations': iteration, 'error': error, 'converged': iteration < max_iter, 'warm': warm,
+           'seconds': time.perf_counter() - start_time}
+
+    return w.astype(np.float32), h.astype(np.float32), log
+
+
+def _fit_segment(chunks:        List[np.ndarray],
+                 w:             np.ndarray,
+                 rank:          int,
+                 method:        str,
+                 smoothness:    float,
+                 max_iter:      int,
+                 tol:           float,
+                 seed:          int,
+                 warm_start:    bool    ) -> List[Tuple[np.ndarray, np.ndarray, Dict]]:
+    """Worker: fits consecutive chunks, each warm-started from the W of the one before."""
+
+    fits = []
+
+    for values in chunks:
+        fitted_w, fitted_h, log = fit(values, rank, w, None, method, smoothness, max_iter, tol, seed)
+        fits.append((fitted_w, fitted_h, log))
+
+        if warm_start:
+            w = fitted_w
+
+    return fits
+
+
+###############################################################################
+#
+#   Class: NMFEngine
+#
+###############################################################################
+
+class NMFEngine:
+
+    def __init__(
+        self,
+        rank                : int   = None,
+        method              : str   = 'hals',
+        smoothness          : float = 0.0,
+        max_iter            : int   = 200,
+        tol                 : float = 1e-4,
+        warm_start          : bool  = True,
+        window              : str   = None,
+        cpu_cores           : int   = multiprocessing.cpu_count(),
+        output_directory    : Path  = None,
+        seed                : int   = 0,
+        config_name                 = "Config1",
+        config_file                 = "config2.json"
+        ):
+
+        self.config             =   ConfigManager(config_file).get_configuration(config_name)
+        self.rank               =   rank or self.config['NMF_RANK']
+        self.method             =   method
+        self.smoothness         =   smoothness
+        self.max_iter           =   max_iter
+        self.tol                =   tol
+        self.warm_start         =   warm_start
+        self.window             =   window or self.config['CHUNK_WINDOW']
+        self.cpu_cores          =   cpu_cores
+        self.output_directory   =   Path(output_directory or BASE_DIR.joinpath(self.config['DECOMP_DIRECTORY']))
+        self.seed               =   seed
+
+
+    @classmethod
+    def tsnmf(cls, smoothness: float = None, **kwargs) -> 'NMFEngine':
+        """An NMFEngine with the temporal smoothness penalty (`TSNMF_SMOOTHNESS` by default)."""
+
+        engine              = cls(**kwargs)
+        engine.smoothness   = engine.config['TSNMF_SMOOTHNESS'] if smoothness is None else smoothness
+
+        return engine
+
+
+    @property
+    def folder_name(self) -> str:
+        return 'tsnmf' if self.smoothness else 'nmf'
+
+
+    def initial_w(self, matrix: BuildingMatrix) -> np.ndarray:
+        """The W shared by every segment: a cold fit on the hourly means of the whole matrix."""
+
+        hourly      = pd.DataFrame(matrix.values.T, index=matrix.index).resample('h').mean().to_numpy().T
+        w, _, _     = fit(np.nan_to_num(hourly), self.rank, None, None, self.method, self.smoothness, self.max_iter, self.tol, self.seed)
+
+        return w
+
+
+    ##################################
+    #   Chunked runs
+    ##################################
+    def run(self, results: Dict) -> pd.DataFrame:
+        """
+        Factors every date chunk of the normalized 'Sum' matrix of `results` (the output of
+        `aggregate_network_data`), writes the factors and returns the per-chunk log.
+        """
+
+        matrix      = BuildingMatrix.from_results(results)
+        chunks      = list(matrix.chunks(self.window))
+        w           = self.initial_w(matrix) if self.warm_start and chunks else None
+        segments    = [segment for segment in np.array_split(np.arange(len(chunks)), max(min(self.cpu_cores, len(chunks)), 1)) if len(segment)]
+
+        tasks       = [delayed(_fit_segment)([chunks[c][2].values for c in segment], w, self.rank, self.method,
+                                             self.smoothness, self.max_iter, self.tol, self.seed, self.warm_start)
+                       for segment in segments]
+        fits        = [fitted for segment_fits in worker_pool(self.cpu_cores)(tasks) for fitted in segment_fits]
+        rows        = []
+
+        for (start_date, end_date, chunk), (fitted_w, fitted_h, log) in zip(chunks, fits):
+            path = chunk.save(BuildingMatrix.folder(self.output_directory, start_date, end_date, self.folder_name), 'factors.npz', w=fitted_w, h=fitted_h)
+            logger.info(f"{start_date:%b-%d-%Y}: {log['iterations']} iterations, error {log['error']:.4f}, {log['seconds']:.2f} s, saved to: {path.parent}")
+            rows.append({'start': start_date, 'end': end_date, 'rank': self.rank, 'method': self.method,
+                         'smoothness': self.smoothness, **log})
+
+        table = pd.DataFrame(rows)
+
+        if rows:
+            self.output_directory.mkdir(parents=True, exist_ok=True)
+            table.to_csv(self.output_directory.joinpath(f"{self.folder_name}-log.csv"), index=False)
+
+        return table
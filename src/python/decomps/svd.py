@@ -0,0 +1,187 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the SVDEngine class, which computes the truncated SVD of the (building x time) matrix per date chunk.
+
+The truncated SVD is randomized (Halko, Martinsson and Tropp): the range of the matrix is sampled with a Gaussian test matrix of rank + oversample columns, refined with a few power iterations, and the SVD is taken of the small projected matrix. For rank k it costs O(k * buildings * time) instead of the O(buildings^2 * time) of the dense SVD. The products are float32; only the small Gram matrix of the projection is float64.
+
+The date chunks (one per `CHUNK_WINDOW` of `config2.json`) are decomposed in parallel on the shared worker pool, and every chunk is written to the existing output layout (see `matrix.py`):
+- trunc-svd/modes.npz   the rank-k modes: U (building x k), s (k), Vt (k x time)
+- svd/modes.npz         the dense SVD, when `dense` is set
+
+With `dense`, each chunk is also decomposed with the dense SVD, and the timings and the error of the truncated SVD are written to `svd-timings.csv` in the output directory.
+
+"""
+
+import time
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+from joblib import delayed
+
+from src.python.processor.config_manager import ConfigManager
+from src.python.processor.data_processor import BASE_DIR, worker_pool
+from src.python.decomps.matrix import BuildingMatrix
+
+
+logger = logging.getLogger(__name__)
+
+
+def randomized_svd(matrix:              np.ndarray,
+                   rank:                int,
+                   oversample:          int = 10,
+                   power_iterations:    int = 4,
+                   seed:                int = 0     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the rank-`rank` (U, s, Vt) of `matrix` by randomized range finding, in float32."""
+
+    matrix  = np.asarray(matrix, dtype=np.float32)
+    rank    = min(rank, *matrix.shape)
+    samples = min(rank + oversample, *matrix.shape)
+    rng     = np.random.default_rng(seed)
+
+    # Orthonormal basis of the sampled range, refined by power iterations. Only the small
+    # (building x samples) side is re-orthonormalized; a QR of the long time side costs more than the products.
+    basis, _    = np.linalg.qr(matrix @ rng.standard_normal((matrix.shape[1], samples), dtype=np.float32))
+
+    for _ in range(power_iterations):
+        basis, _    = np.linalg.qr(matrix @ (matrix.T @ basis))
+
+    # SVD of the (samples x time) projection through its (samples x samples) Gram matrix, in float64
+    projected           = basis.T @ matrix
+    eigvals, eigvecs    = np.linalg.eigh(projected.astype(np.float64) @ projected.T.astype(np.float64))
+    order               = np.argsort(eigvals)[::-1][:rank]
+    s                   = np.sqrt(np.clip(eigvals[order], 0, None))
+    eigvecs             = eigvecs[:, order]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vt = np.where(s[:, None] > 0, (eigvecs.T @ projected) / s[:, None], 0)
+
+    return (basis @ eigvecs).astype(np.float32), s.astype(np.float32), vt.astype(np.float32)
+
+
+def dense_svd(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return np.linalg.svd(np.asarray(matrix, dtype=np.float32), full_matrices=False)
+
+
+def relative_error(matrix: np.ndarray, u: np.ndarray, s: np.ndarray, vt: np.ndarray) -> float:
+    """The relative Frobenius error of the reconstruction U diag(s) Vt."""
+
+    norm = np.linalg.norm(matrix)
+    return float(np.linalg.norm(matrix - (u * s) @ vt) / norm) if norm else 0.0
+
+
+def _decompose_chunk(values:            np.ndarray,
+                     rank:              int,
+                     oversample:        int,
+                     power_iterations:  int,
+                     seed:              int,
+                     dense:             bool    ) -> Dict:
+    """Worker: the randomized (and optionally dense) SVD of one chunk, with their timings."""
+
+    start_time      = time.perf_counter()
+    u, s, vt        = randomized_svd(values, rank, oversample, power_iterations, seed)
+    result          = {'truncated': (u, s, vt), 'randomized_seconds': time.perf_counter() - start_time,
+                       'truncated_error': relative_error(values, u, s, vt)}
+
+    if dense:
+        start_time                  = time.perf_counter()
+        u, s, vt                    = dense_svd(values)
+        result['dense']             = (u, s, vt)
+        result['dense_seconds']     = time.perf_counter() - start_time
+        result['optimal_error']     = relative_error(values, u[:, :rank], s[:rank], vt[:rank])
+
+    return result
+
+
+###############################################################################
+#
+#   Class: SVDEngine
+#
+###############################################################################
+
+class SVDEngine:
+
+    def __init__(
+        self,
+        rank                : int   = None,
+        oversample          : int   = 10,
+        power_iterations    : int   = 4,
+        window              : str   = None,
+        cpu_cores           : int   = multiprocessing.cpu_count(),
+        output_directory    : Path  = None,
+        seed                : int   = 0,
+        config_name                 = "Config1",
+        config_file                 = "config2.json"
+        ):
+
+        self.config             =   ConfigManager(config_file).get_configuration(config_name)
+        self.rank               =   rank or self.config['SVD_RANK']
+        self.oversample         =   oversample
+        self.power_iterations   =   power_iterations
+        self.window             =   window or self.config['CHUNK_WINDOW']
+        self.cpu_cores          =   cpu_cores
+        self.output_directory   =   Path(output_directory or BASE_DIR.joinpath(self.config['DECOMP_DIRECTORY']))
+        self.seed               =   seed
+
+
+    def decompose(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The rank-k randomized SVD of one (building x time) matrix."""
+        return randomized_svd(matrix, self.rank, self.oversample, self.power_iterations, self.seed)
+
+
+    ##################################
+    #   Chunked runs
+    ##################################
+    def run(self, results: Dict, dense: bool = False) -> pd.DataFrame:
+        """
+        Decomposes every date chunk of the normalized 'Sum' matrix of `results` (the output of
+        `aggregate_network_data`) in parallel and writes the modes. Returns one row per chunk with
+        the timings and errors (the dense columns only with `dense`).
+        """
+
+        matrix  = BuildingMatrix.from_results(results)
+        chunks  = list(matrix.chunks(self.window))
+        tasks   = [delayed(_decompose_chunk)(chunk.values, self.rank, self.oversample, self.power_iterations, self.seed, dense)
+                   for start_date, end_date, chunk in chunks]
+        outputs = worker_pool(self.cpu_cores)(tasks)
+        rows    = []
+
+        for (start_date, end_date, chunk), output in zip(chunks, outputs):
+            u, s, vt    = output['truncated']
+            path        = chunk.save(BuildingMatrix.folder(self.output_directory, start_date, end_date, 'trunc-svd'), 'modes.npz', u=u, s=s, vt=vt)
+            logger.info(f"{path.parent.name}\tsaved to: {path.parent}")
+
+            row = {'start': start_date, 'end': end_date, 'buildings': chunk.shape[0], 'times': chunk.shape[1], 'rank': self.rank,
+                   'randomized_seconds': output['randomized_seconds'], 'truncated_error': output['truncated_error']}
+
+            if dense:
+                u, s, vt    = output['dense']
+                path        = chunk.save(BuildingMatrix.folder(self.output_directory, start_date, end_date, 'svd'), 'modes.npz', u=u, s=s, vt=vt)
+                logger.info(f"{path.parent.name}\tsaved to: {path.parent}")
+
+                row.update({'dense_seconds':    output['dense_seconds'],
+                            'optimal_error':    output['optimal_error'],
+                            'speedup':          output['dense_seconds'] / output['randomized_seconds']})
+
+            rows.append(row)
+
+        timings = pd.DataFrame(rows)
+
+        if dense and rows:
+            self.output_directory.mkdir(parents=True, exist_ok=True)
+            timings.to_csv(self.output_directory.joinpath('svd-timings.csv'), index=False)
+
+        return timings
@@ -0,0 +1,128 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the reader and writer of the WiFi archive (`.wfa`), a compact binary copy of one building's WiFi report on one network.
+
+Layout (little-endian):
+- A 64-byte header: magic `WFA1`, version, number of rows, the first and last timestamp, and the byte offsets of the two arrays
+- The timestamps as int64 nanoseconds since the epoch, sorted
+- The device counts as int32
+
+Both arrays are opened with `np.memmap`, so a date-range query is a binary search on the timestamps followed by a slice: nothing is parsed, and only the pages of the requested range are read from disk.
+
+The archives are written once from the CSV reports by `BuildingProcessor.convert_to_archive`, into `ARCHIVE_DIRECTORY` (see `config2.json`), and `DataReader` reads any `.wfa` path transparently.
+
+"""
+
+from pathlib import Path
+from typing import Tuple
+import numpy as np
+
+from src.python.processor.atomic import atomic_write
+
+
+ARCHIVE_SUFFIX  = '.wfa'
+MAGIC           = b'WFA1'
+VERSION         = 1
+HEADER_SIZE     = 64
+
+HEADER_DTYPE    = np.dtype([('magic',           'S4'),
+                            ('version',         '<u4'),
+                            ('rows',            '<i8'),
+                            ('first',           '<i8'),
+                            ('last',            '<i8'),
+                            ('times_offset',    '<i8'),
+                            ('counts_offset',   '<i8')
+                            ])
+
+
+def write_archive(archive_path: Path, times: np.ndarray, counts: np.ndarray) -> Path:
+    """Writes sorted timestamps (datetime64 or int64 ns) and device counts to `archive_path`."""
+
+    times   = np.ascontiguousarray(np.asarray(times).astype('datetime64[ns]').view('<i8'))
+    counts  = np.ascontiguousarray(counts, dtype='<i4')
+
+    if len(times) != len(counts):
+        raise ValueError(f"{len(times)} timestamps but {len(counts)} counts.")
+
+    if len(times) > 1 and (np.diff(times) < 0).any():
+        raise ValueError("The timestamps of an archive must be sorted.")
+
+    header                  = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic']         = MAGIC
+    header['version']       = VERSION
+    header['rows']          = len(times)
+    header['first']         = times[0]  if len(times) else 0
+    header['last']          = times[-1] if len(times) else 0
+    header['times_offset']  = HEADER_SIZE
+    header['counts_offset'] = HEADER_SIZE + times.nbytes
+
+    def write(f):
+        f.write(header.tobytes().ljust(HEADER_SIZE, b'\0'))
+        f.write(times.tobytes())
+        f.write(counts.tobytes())
+
+    return atomic_write(archive_path, write)
+
+
+def read_header(archive_path: Path) -> np.void:
+
+    with open(archive_path, 'rb') as f:
+        header = np.frombuffer(f.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)
+
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"{archive_path} is not a WiFi archive.")
+
+    if header['version'][0] != VERSION:
+        raise ValueError(f"{archive_path} has archive version {header['version'][0]}, expected {VERSION}.")
+
+    return header[0]
+
+
+def read_archive(archive_path:  Path,
+                 start_date     = None,
+                 end_date       = None  ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the (datetime64[ns] timestamps, int32 counts) of the rows in [start_date, end_date].
+
+    The returned arrays are copies of the requested slice only, so the archive is closed on return.
+    """
+
+    header  = read_header(archive_path)
+    rows    = int(header['rows'])
+
+    if rows == 0:
+        return np.zeros(0, dtype='datetime64[ns]'), np.zeros(0, dtype=np.int32)
+
+    times   = np.memmap(archive_path, dtype='<i8', mode='r', offset=int(header['times_offset']),  shape=(rows,))
+    counts  = np.memmap(archive_path, dtype='<i4', mode='r', offset=int(header['counts_offset']), shape=(rows,))
+
+    first   = np.searchsorted(times, _nanoseconds(start_date), side='left')  if start_date is not None else 0
+    last    = np.searchsorted(times, _nanoseconds(end_date),   side='right') if end_date   is not None else rows
+
+    return np.array(times[first:last]).view('datetime64[ns]'), np.array(counts[first:last], dtype=np.int32)
+
+
+def archive_bounds(archive_path: Path) -> Tuple[np.datetime64, np.datetime64]:
+    """Returns the first and last timestamp of an archive from its header, or (None, None) if it is empty."""
+
+    header = read_header(archive_path)
+
+    if header['rows'] == 0:
+        return None, None
+
+    return np.datetime64(int(header['first']), 'ns'), np.datetime64(int(header['last']), 'ns')
+
+
+def _nanoseconds(date) -> int:
+    return np.datetime64(date, 'ns').astype(np.int64)
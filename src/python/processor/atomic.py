@@ -0,0 +1,51 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the atomic_write function, which writes the files that other processes may read at the same time: the cache entries (`series_cache.py`), the archives (`archive.py`), the range indexes (`range_index.py`) and the render manifest (`batch_render.py`).
+
+The file is written to a temporary file next to it, named after the writing process, and then moved over `path` with `os.replace`, which is atomic on one filesystem. A reader (e.g. a parallel worker) therefore sees either the previous file or the complete new one, never a partial write. The temporary file is removed if the write fails.
+
+Example:
+
+    atomic_write(path, lambda f: np.savez(f, times=times, offsets=offsets))
+
+"""
+
+import os
+from pathlib import Path
+from typing import IO, Callable
+
+
+def atomic_write(path: Path, writer: Callable[[IO], None], mode: str = 'wb') -> Path:
+    """Calls `writer` with a file opened in `mode` on a temporary file, then moves it over `path`. Returns `path`."""
+
+    path        = Path(path)
+    temp_path   = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with open(temp_path, mode) as f:
+            writer(f)
+
+        os.replace(temp_path, path)
+
+    except BaseException:
+        try:
+            os.remove(temp_path)
+
+        except OSError:
+            pass
+
+        raise
+
+    return path
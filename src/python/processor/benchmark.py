@@ -0,0 +1,328 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the SyntheticWiFiData and Benchmark classes, a reproducible benchmark suite for the processing pipeline that does not need the private WiFi dataset.
+
+SyntheticWiFiData writes a WiFiData-style tree (one folder per network, one `<BUILDING>_Extracted_Data_8-16-2019.csv` report per building) with a configurable number of buildings and rows, irregular sampling intervals, and outages (gaps with no rows).
+
+Benchmark times every stage of the pipeline separately:
+- list:         listing the building files of all networks
+- read:         reading the CSV files with declared dtypes (datetime kept as text)
+- parse:        parsing the datetime column with the fixed format
+- interpolate:  resampling every series onto the shared grid
+- process:      the full parallel `process_tensor` for each core count
+- aggregate:    the Sum, Type, Campus and Average reductions
+- sparsity:     `calculate_sparsity` on the aggregated results
+
+The list, read, parse and interpolate stages run in a single process so that they can be compared across commits; `process` shows the parallel scaling. Results are written as JSON together with the machine information and the git commit, and `plot_scaling` renders the core-scaling plot of the original SpeedTest from them.
+
+"""
+
+import json
+import time
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from src.python.processor.data_processor import DataReader, BuildingProcessor, COMMON
+from src.python.processor.resampler import BatchResampler
+
+
+NETWORKS = ['Eduroam', 'UCBGuest', 'UCBWireless']
+
+
+###############################################################################
+#
+#   Class: SyntheticWiFiData
+#
+###############################################################################
+
+class SyntheticWiFiData:
+    """Writes synthetic WiFi report files with irregular sampling and outages."""
+
+    def __init__(
+        self,
+        directory           : Path,
+        n_buildings         : int   = 30,
+        n_rows              : int   = 100_000,
+        start_date          : str   = '2019-08-16',
+        mean_interval       : int   = 300,
+        interval_jitter     : float = 0.5,
+        gap_probability     : float = 1e-4,
+        gap_length          : int   = 6 * 3600,
+        missing_probability : float = 0.05,
+        seed                : int   = 0
+        ):
+
+        self.directory              =   Path(directory)
+        self.n_buildings            =   n_buildings
+        self.n_rows                 =   n_rows
+        self.start_date             =   pd.Timestamp(start_date)
+        self.mean_interval          =   mean_interval
+        self.interval_jitter        =   interval_jitter
+        self.gap_probability        =   gap_probability
+        self.gap_length             =   gap_length
+        self.missing_probability    =   missing_probability
+        self.seed                   =   seed
+        self.buildings              =   [f"B{i:03d}" for i in range(n_buildings)]
+
+
+    def _series(self, rng: np.random.Generator) -> pd.DataFrame:
+
+        # Irregular sampling: intervals of `mean_interval` seconds, +/- `interval_jitter` of it
+        low         = max(1, int(self.mean_interval * (1 - self.interval_jitter)))
+        high        = int(self.mean_interval * (1 + self.interval_jitter)) + 1
+        intervals   = rng.integers(low, high, self.n_rows)
+
+        # Outages: an occasional interval is stretched by `gap_length` seconds
+        intervals[rng.random(self.n_rows) < self.gap_probability] += self.gap_length
+
+        seconds     = np.cumsum(intervals)
+        daily       = 1 + np.sin(2 * np.pi * (seconds % 86400) / 86400 - np.pi / 2)
+        counts      = rng.poisson(200 * daily * rng.uniform(0.2, 2.0)).astype(np.int32)
+        times       = self.start_date + pd.to_timedelta(seconds, unit='s')
+
+        return pd.DataFrame({'datetime': times.strftime('%Y-%m-%d %H:%M:%S'), 'devicecount': counts})
+
+
+    def write(self) -> Dict[str, int]:
+        """Writes the files and returns the number of files and bytes written."""
+
+        rng     = np.random.default_rng(self.seed)
+        files   = 0
+        size    = 0
+
+        for network in NETWORKS:
+            network_directory = self.directory.joinpath(network)
+            network_directory.mkdir(parents=True, exist_ok=True)
+
+            for building in self.buildings:
+
+                # Not every building reports on every network
+                if rng.random() < self.missing_probability:
+                    continue
+
+                file_path = network_directory.joinpath(f"{building}{COMMON}")
+                self._series(rng).to_csv(file_path, header=False, index=False)
+
+                files   += 1
+                size    += file_path.stat().st_size
+
+        return {'files': files, 'bytes': size}
+
+
+    def parameters(self) -> Dict:
+        return {'n_buildings':          self.n_buildings,
+                'n_rows':               self.n_rows,
+                'start_date':           self.start_date.isoformat(),
+                'mean_interval':        self.mean_interval,
+                'interval_jitter':      self.interval_jitter,
+                'gap_probability':      self.gap_probability,
+                'gap_length':           self.gap_length,
+                'missing_probability':  self.missing_probability,
+                'seed':                 self.seed
+                }
+
+
+###############################################################################
+#
+#   Class: Benchmark
+#
+###############################################################################
+
+class Benchmark:
+
+    def __init__(
+        self,
+        cpu_cores       : List[int]     = (1, 2, 4),
+        sample_freqs    : List[str]     = ('1Min', '5Min'),
+        data_directory  : Path          = None,
+        synthetic       : Dict          = None,
+        start_date      : datetime      = None,
+        end_date        : datetime      = None,
+        repeats         : int           = 3
+        ):
+
+        self.cpu_cores          =   [cores for cores in cpu_cores if cores <= multiprocessing.cpu_count()]
+        self.sample_freqs       =   list(sample_freqs)
+        self.data_directory     =   Path(data_directory) if data_directory else None
+        self.synthetic          =   synthetic or {}
+        self.start_date         =   start_date
+        self.end_date           =   end_date
+        self.repeats            =   repeats
+        self.results            =   []
+        self.dataset            =   {}
+
+
+    ##################################
+    #   Timing
+    ##################################
+    def _best_of(self, function) -> Tuple[float, object]:
+        """Returns the best wall-clock time of `repeats` calls of `function`, and the result of the last call."""
+
+        best = np.inf
+
+        for _ in range(self.repeats):
+            start_time  = time.perf_counter()
+            result      = function()
+            best        = min(best, time.perf_counter() - start_time)
+
+        return round(best, 4), result
+
+
+    def _processor(self, sample_freq: str, cores: int, data_directory: Path) -> BuildingProcessor:
+        data_reader = DataReader(start_date=self.start_date, end_date=self.end_date, sample_freq=sample_freq)
+        return BuildingProcessor(data_reader, cpu_cores=cores, use_cache=False, use_archive=False, data_directory=data_directory)
+
+
+    def _time_stages(self, sample_freq: str, data_directory: Path) -> Dict[str, float]:
+        """Times the single-process list, read, parse, interpolate, aggregate and sparsity stages."""
+
+        processor   = self._processor(sample_freq, 1, data_directory)
+        stages      = {}
+
+        stages['list'], file_paths   = self._best_of(processor.building_files)
+        files                        = [file_path for file_path in file_paths.values() if file_path.exists()]
+        readers                      = [DataReader(file_path=file_path, sample_freq=sample_freq) for file_path in files]
+
+        read_options    = {'header':   None,
+                           'names':    ['datetime', 'devicecount'],
+                           'dtype':    {'datetime': str, 'devicecount': np.int32}
+                           }
+
+        stages['read'], frames       = self._best_of(lambda: [pd.read_csv(file_path, engine='c', **read_options) for file_path in files])
+        stages['parse'], times       = self._best_of(lambda: [reader.parse_datetime(frame['datetime']) for reader, frame in zip(readers, frames)])
+        counts                       = [frame['devicecount'].values for frame in frames]
+        grid                         = processor.shared_grid(files)
+
+        stages['interpolate'], _     = self._best_of(lambda: BatchResampler(grid, kind=processor.data_reader.kind).resample(
+                                                             [t.values for t in times], counts))
+
+        tensor                       = processor.process_tensor()
+        stages['aggregate'], results = self._best_of(lambda: processor.aggregate_network_data(tensor))
+        stages['sparsity'], _        = self._best_of(lambda: processor.calculate_sparsity(results))
+
+        self.dataset.setdefault('grid_points', {})[sample_freq] = len(grid)
+
+        return stages
+
+
+    def _time_processing(self, sample_freq: str, data_directory: Path) -> Dict[int, float]:
+        """Times the parallel `process_tensor` for every core count."""
+
+        process_times = {}
+
+        for cores in self.cpu_cores:
+            processor = self._processor(sample_freq, cores, data_directory)
+
+            # Start the worker pool outside of the timed runs
+            processor.process_tensor()
+            process_times[cores], _ = self._best_of(processor.process_tensor)
+            print(f"\t{cores} cores:\t{process_times[cores]} seconds")
+
+        return process_times
+
+
+    def run(self) -> List[Dict]:
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            data_directory = self.data_directory or Path(temporary_directory)
+
+            if self.data_directory is None:
+                generator       = SyntheticWiFiData(data_directory, **self.synthetic)
+                self.dataset    = {'source': 'synthetic', **generator.parameters(), **generator.write()}
+
+            else:
+                self.dataset    = {'source': str(self.data_directory)}
+
+            for sample_freq in self.sample_freqs:
+                print(f'\nBenchmarking sample frequency:\t {sample_freq}\n')
+
+                stages = self._time_stages(sample_freq, data_directory)
+
+                for stage, seconds in stages.items():
+                    print(f"\t{stage}:\t{seconds} seconds")
+
+                self.results.append({'sample_freq': sample_freq,
+                                     'stages':      stages,
+                                     'process':     self._time_processing(sample_freq, data_directory)
+                                     })
+
+        return self.results
+
+
+    ##################################
+    #   Output
+    ##################################
+    def machine_info(self) -> Dict:
+
+        try:
+            commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {'platform':     platform.platform(),
+                'processor':    platform.processor() or platform.machine(),
+                'cpu_count':    multiprocessing.cpu_count(),
+                'python':       platform.python_version(),
+                'numpy':        np.__version__,
+                'pandas':       pd.__version__,
+                'commit':       commit,
+                'timestamp':    datetime.now().isoformat(timespec='seconds')
+                }
+
+
+    def save(self, output_path: Path) -> Path:
+        """Writes the results, dataset parameters and machine information to a JSON file."""
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            json.dump({'machine':   self.machine_info(),
+                       'dataset':   self.dataset,
+                       'repeats':   self.repeats,
+                       'results':   self.results
+                       }, f, indent=4)
+
+        return output_path
+
+
+    @staticmethod
+    def plot_scaling(results_path: Path) -> None:
+        """Renders the processing time vs. number of CPU cores plot from a saved results file."""
+
+        import matplotlib.pyplot as plt
+
+        with open(results_path, 'r') as f:
+            results = json.load(f)['results']
+
+        plt.figure(figsize=(10, 6))
+
+        for result in results:
+            cores = sorted(int(c) for c in result['process'])
+            plt.plot(cores, [result['process'][str(c)] for c in cores], label=f"Sample Frequency: {result['sample_freq']}")
+
+        plt.xlabel('Number of CPU Cores')
+        plt.ylabel('Time to Process Data (s)')
+        plt.title('Processing Time vs Number of CPU Cores for Different Sample Frequencies')
+        plt.legend()
+        plt.show()
+
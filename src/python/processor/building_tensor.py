@@ -0,0 +1,200 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the BuildingTensor class, the dense result of the BuildingProcessor.
+
+All interpolated series live in one contiguous float32 array of shape (network x building x time) that shares a single DatetimeIndex. Grid points outside the span of a building's data (or buildings missing from a network) are NaN. The network aggregates are vectorized reductions along the axes of this array:
+- Sum:      sum over the network axis                       -> (building x time)
+- Type:     sum over networks and the buildings of a type   -> (time)
+- Campus:   sum over networks and all buildings             -> (time)
+- Average:  Type divided by the number of series of a type  -> (time)
+
+The Type sums (and those of any grouping of `grouping.py`) are one matrix product of a (group x building) membership matrix with the Sum array. A reduction is NaN only where every series it covers is NaN. The `to_results` method returns the nested dict-of-DataFrame layout used by the plotters.
+
+"""
+
+from typing import Dict, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from src.python.processor.resampler import resample_frames
+from src.python.processor.grouping import Grouping
+
+
+DATETIME    = 'datetime'
+DEVICECOUNT = 'devicecount'
+
+
+def nan_sum(values: np.ndarray, axis) -> np.ndarray:
+    """Sums `values` over `axis` treating NaN as 0, but stays NaN where every element is NaN."""
+
+    valid   = ~np.isnan(values)
+    total   = np.where(valid, values, 0).sum(axis=axis, dtype=np.float32)
+
+    return np.where(valid.any(axis=axis), total, np.nan).astype(np.float32)
+
+
+###############################################################################
+#
+#   Class: BuildingTensor
+#
+###############################################################################
+
+class BuildingTensor:
+
+    def __init__(
+        self,
+        values      : np.ndarray,
+        index       : pd.DatetimeIndex,
+        networks    : List[str],
+        buildings   : List[str]
+        ):
+
+        self.values     =   np.ascontiguousarray(values, dtype=np.float32)
+        self.index      =   pd.DatetimeIndex(index)
+        self.networks   =   np.asarray(networks,  dtype=object)
+        self.buildings  =   np.asarray(buildings, dtype=object)
+
+        if self.values.shape != (len(self.networks), len(self.buildings), len(self.index)):
+            raise ValueError(f"Tensor shape {self.values.shape} does not match the labels "
+                             f"({len(self.networks)}, {len(self.buildings)}, {len(self.index)})")
+
+
+    @property
+    def present(self) -> np.ndarray:
+        """(network x building) mask of the series that hold any data."""
+        return ~np.isnan(self.values).all(axis=2)
+
+
+    ##################################
+    #   Construction
+    ##################################
+    @classmethod
+    def from_results(cls,
+                     results:       Dict[str, Dict[str, pd.DataFrame]],
+                     sample_freq:   str,
+                     start_date     = None,
+                     end_date       = None  ) -> "BuildingTensor":
+        """Builds a tensor from the nested {network: {building: DataFrame}} output of `process_directories`."""
+
+        networks    = list(results.keys())
+        buildings   = list(dict.fromkeys(b for network in networks for b in results[network]))
+        position    = {building: j for j, building in enumerate(buildings)}
+        frames      = [df for network in networks for df in results[network].values()]
+
+        if start_date is None:
+            start_date  = min((df[DATETIME].iloc[ 0] for df in frames), default=None)
+
+        if end_date is None:
+            end_date    = max((df[DATETIME].iloc[-1] for df in frames), default=None)
+
+        index   = pd.date_range(start=start_date, end=end_date, freq=sample_freq) if frames else pd.DatetimeIndex([])
+        values  = np.full((len(networks), len(buildings), len(index)), np.nan, dtype=np.float32)
+
+        rows    = [(i, position[building]) for i, network in enumerate(networks) for building in results[network]]
+
+        # Re-sample every series onto the shared grid in one batch; exact on the grid points a series already has
+        if rows:
+            network_rows, building_rows = zip(*rows)
+            values[list(network_rows), list(building_rows)] = resample_frames(frames, index, kind='linear')
+
+        return cls(values, index, networks, buildings)
+
+
+    ##################################
+    #   Vectorized reductions
+    ##################################
+    def building_mask(self, building_list: List[str]) -> np.ndarray:
+        return np.isin(self.buildings, building_list)
+
+    def network_sum(self) -> np.ndarray:
+        """(building x time) sum of every building over all networks."""
+        return nan_sum(self.values, axis=0)
+
+    def campus_sum(self) -> np.ndarray:
+        """(time) sum over all networks and buildings."""
+        return nan_sum(self.values.reshape(-1, len(self.index)), axis=0)
+
+    def group_sum(self, building_list: List[str]) -> np.ndarray:
+        """(time) sum over all networks of the buildings in `building_list`."""
+        mask = self.building_mask(building_list)
+        return nan_sum(self.values[:, mask].reshape(-1, len(self.index)), axis=0)
+
+    def group_count(self, building_list: List[str]) -> int:
+        """Number of (network, building) series with data among the buildings in `building_list`."""
+        return int(self.present[:, self.building_mask(building_list)].sum())
+
+    def grouping_sums(self, grouping: Grouping, network_sum: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (group x time) sums of every group of `grouping` over all networks and buildings it covers, and the 
+        number of series with data in every group. One matrix product over the building (or network) axis.
+        """
+
+        if grouping.axis == 'building':
+            per_member  = self.network_sum() if network_sum is None else network_sum
+            members     = self.buildings
+            present     = self.present.sum(axis=0)
+
+        else:
+            per_member  = nan_sum(self.values, axis=1)
+            members     = self.networks
+            present     = self.present.sum(axis=1)
+
+        return grouping.sum(per_member, members), grouping.count(present, members)
+
+
+    ##################################
+    #   Dict-of-DataFrame views
+    ##################################
+    def frame(self, series: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({DATETIME: self.index, DEVICECOUNT: series})
+
+    def grouping_results(self, grouping: Grouping, network_sum: np.ndarray = None) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]:
+        """The {group: df} sums and averages (sum / number of series) of `grouping`; empty frames for groups without data."""
+
+        sums, counts    = self.grouping_sums(grouping, network_sum)
+        group_sums      = {}
+        averages        = {}
+
+        for group, series, count in zip(grouping.names, sums, counts):
+            group_sums[group]   = self.frame(series)         if count else pd.DataFrame()
+            averages[group]     = self.frame(series / count) if count else pd.DataFrame()
+
+        return group_sums, averages
+
+    def to_results(self, groups: Union[Grouping, Dict[str, List[str]]]) -> Dict:
+        """
+        Returns the nested dict layout of `BuildingProcessor.aggregate_network_data`:
+        {network: {building: df}, 'Sum': {building: df}, 'Type': {group: df}, 'Campus': df, 'Average': {group: df}}
+
+        'Type' and 'Average' are the sums and averages of the building grouping `groups`.
+        """
+
+        present = self.present
+        results = {
+            network: {building: self.frame(self.values[i, j])
+                      for j, building in enumerate(self.buildings) if present[i, j]}
+            for i, network in enumerate(self.networks)
+            }
+
+        grouping                = groups if isinstance(groups, Grouping) else Grouping(groups)
+        network_sum             = self.network_sum()
+        type_sums, averages     = self.grouping_results(grouping, network_sum)
+
+        results['Sum']      = {building: self.frame(network_sum[j])
+                               for j, building in enumerate(self.buildings) if present[:, j].any()}
+        results['Type']     = type_sums
+        results['Campus']   = self.frame(self.campus_sum())
+        results['Average']  = averages
+
+        return results
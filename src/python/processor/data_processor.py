@@ -4,9 +4,9 @@
 #
 # AUTHOR:         TYLER A. REISER  
 # CREATED:        SEPTEMBER   2023  
-# MODIFIED:       NOVEMBER    2024
+# MODIFIED:       OCTOBER     2026
 #
-# COPYRIGHT (c) 2024 Tyler A. Reiser
+# COPYRIGHT (c) 2026 Tyler A. Reiser
 #
 ########################################################################
 
@@ -16,32 +16,67 @@
 This module contains the DataReader, SparsityCalculator, and BuildingProcessor classes for processing, analyzing, and interpolating network information from the CU Boulder campus. 
 
 Key functionalities of this module include:
-- Reading time series data from a CSV file
-- Interpolating the time series data
+- Reading time series data from a CSV file, a `.wfa` archive (see `archive.py`), or an `.h5` file
+- Interpolating the time series data (see `resampler.py`)
 - Processing data for a specific building
 - Processing data for all buildings
 - Calculating the sparsity of the data
 - Aggregating network data
 
+All interpolated series are stacked into a BuildingTensor (see `building_tensor.py`), a single float32 (network x building x time) array on one shared DatetimeIndex. The Sum, Type, Campus and Average aggregates are vectorized reductions over its axes, and `process_all_buildings` returns them as the usual nested dict of DataFrames.
+
 The CSV files to be processed should be placed in the csv_directory specified when creating a DataReader object. The BuildingProcessor class can be used to process all buildings, calculate processing time, and calculate sparsity if required. The SparsityCalculator class is used to calculate the sparsity of the data.
 
+`process_tensor` preallocates the tensor as a memmap (on `/dev/shm` where available); the joblib workers write their resampled series straight into it and return only metadata, so no DataFrames are pickled back to the parent.
+
+Per-stage timings (read, parse, filter, interpolate, aggregate, sparsity), bytes and rows read, and peak RSS per building are collected by the Instrumentation class (see `instrumentation.py`) when `INSTRUMENT` is enabled in `config2.json` or `instrument=True` is passed.
+
+Interpolated building series are cached on disk by the SeriesCache class (see `series_cache.py`) when `USE_CACHE` is enabled in `config2.json`, so a warm run skips reading and interpolation entirely.
+
 """
 
+import io
 import os
+import copy
+import atexit
 import time
+import weakref
+import tempfile
 import multiprocessing
 from datetime import datetime
 from typing import List, Dict, Tuple
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
 from joblib import Parallel, delayed
 from pathlib import Path
 from scipy.interpolate import UnivariateSpline
 
 
+try:
+    import pyarrow
+    HAS_PYARROW = True
+    
+except ImportError:
+    HAS_PYARROW = False
+
+
+try:
+    import h5py
+    HAS_H5PY = True
+    
+except ImportError:
+    HAS_H5PY = False
+
+
 from src.python.processor.config_manager import ConfigManager
 from src.python.processor.sparsity import SparsityCalculator
+from src.python.processor.series_cache import SeriesCache
+from src.python.processor.building_tensor import BuildingTensor
+from src.python.processor.resampler import BatchResampler
+from src.python.processor.instrumentation import Instrumentation
+from src.python.processor.archive import ARCHIVE_SUFFIX, read_archive, archive_bounds, write_archive
+from src.python.processor.range_index import TimeOffsetIndex
+from src.python.processor.grouping import Grouping, load_groupings
 
 
 BASE_DIR = Path.cwd()
@@ -73,7 +108,10 @@ class DataReader:
         end_date   : datetime  = None,
         config_name    = "Config1",
         config_file    = "config2.json",
-        sample_freq    = "1Min"
+        sample_freq    = "1Min",
+        kind           = "linear",
+        fast_read      = None,
+        margin         = None
         ):
         
         self.start_date         =   start_date
@@ -82,10 +120,20 @@ class DataReader:
         self.config_manager     =   ConfigManager(config_file)
         self.config             =   self.config_manager.get_configuration(config_name)
         self.sample_freq        =   sample_freq
+        self.kind               =   kind
+        self.margin             =   pd.Timedelta(margin) if margin is not None else pd.Timedelta(0)
         self.save_interpolated  =   self.config[  'SAVE_INTERPOLATED' ]
         self.devicecount        =   self.config[  'DEVICECOUNT'       ]
         self.datetime           =   self.config[  'DATETIME'          ]
+        self.fast_read          =   self.config[  'FAST_READ'         ] if fast_read is None else fast_read
+        self.datetime_format    =   self.config[  'DATETIME_FORMAT'   ]
+        self.read_engine        =   self.config[  'READ_ENGINE'       ]
+        self.read_chunksize     =   self.config[  'READ_CHUNKSIZE'    ]
         self.save_directory     =   BASE_DIR.joinpath('data','output','interpolated-data')
+        self.instrumentation    =   Instrumentation(enabled=False)
+        self.range_index        =   TimeOffsetIndex(BASE_DIR.joinpath(self.config['RANGE_INDEX_DIRECTORY']),
+                                                    every=self.config['RANGE_INDEX_ROWS']
+                                                    ) if self.config['USE_RANGE_INDEX'] else None
 
     
     def read_time_series_data(self) -> pd.DataFrame:
@@ -96,45 +144,225 @@ class DataReader:
         ##################################
         #   Read `CSV` files
         ##################################
-        if self.file_path.suffix == '.csv':
-            data_mat = pd.read_csv(self.file_path, header=None, names=[self.datetime, self.devicecount])
+        if self.file_path.suffix == '.csv' and self.fast_read:
+            return self._read_csv_fast()
+        
+        elif self.file_path.suffix == '.csv':
+            with self.instrumentation.timer('read'):
+                data_mat = pd.read_csv(self.file_path, header=None, names=[self.datetime, self.devicecount])
 
+        ##################################
+        #   Read `WFA` archives
+        ##################################
+        elif self.file_path.suffix == ARCHIVE_SUFFIX:
+            return self._read_archive()
+        
         ##################################
         #   Read `H5` files
         ################################## 
         elif self.file_path.suffix == '.h5':
-            with h5py.File(self.file_path, 'r') as hdf:
-                print("Keys of the .h5 file:")
-                print(list(hdf.keys()))
-                data_mat = hdf.get('dataset1')
+            if not HAS_H5PY:
+                raise ImportError("Reading .h5 files requires h5py.")
+            
+            # Read the dataset into memory before the file closes
+            with self.instrumentation.timer('read'), h5py.File(self.file_path, 'r') as hdf:
+                dataset = hdf['dataset1'][()]
+                
+            data_mat = pd.DataFrame(dataset) if dataset.dtype.names else pd.DataFrame(dataset, columns=[self.datetime, self.devicecount])
+            
+            if data_mat[self.datetime].dtype == object:
+                data_mat[self.datetime] = data_mat[self.datetime].str.decode('utf-8')
+        
+        else:
+            raise ValueError(f"Unsupported file type: {self.file_path.suffix}")
 
-        data_mat[self.datetime] = pd.to_datetime(data_mat[self.datetime])
+        with self.instrumentation.timer('parse'):
+            data_mat[self.datetime] = pd.to_datetime(data_mat[self.datetime])
 
         if self.start_date or self.end_date:
-            data_mat = data_mat[(data_mat[self.datetime] >= self.start_date if self.start_date  else True) &
-                                (data_mat[self.datetime] <= self.end_date   if self.end_date    else True)
-                                ]
+            data_mat = self._filter_dates(data_mat)
             
         return data_mat
+    
+    
+    def _read_bounds(self) -> Tuple[datetime, datetime]:
+        """Returns the range of rows to read: the start and end date widened by `margin`.
+        
+        The margin keeps the samples just outside the range, which are the interpolation 
+        neighbours of the first and last grid points.
+        """
+        return (self.start_date - self.margin if self.start_date else None,
+                self.end_date   + self.margin if self.end_date   else None)
+    
+    
+    def read_time_bounds(self) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """Returns the first and last timestamp of a time-sorted CSV file from its first and last line only."""
+        
+        if self.file_path.suffix == ARCHIVE_SUFFIX:
+            first, last = archive_bounds(self.file_path)
+            return (pd.Timestamp(first), pd.Timestamp(last)) if first is not None else (None, None)
+        
+        with open(self.file_path, 'rb') as f:
+            first_line = f.readline()
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 4096, 0))
+            last_line  = f.read().rstrip(b'\r\n').rsplit(b'\n', 1)[-1]
+            
+        if not first_line.strip():
+            return None, None
+        
+        first, last = self.parse_datetime(pd.Series([line.decode().split(',')[0] for line in (first_line, last_line)]))
+        
+        return first, last
+    
+    
+    def _filter_dates(self, data_mat: pd.DataFrame) -> pd.DataFrame:
+        start_date, end_date = self._read_bounds()
+        
+        with self.instrumentation.timer('filter'):
+            return data_mat[(data_mat[self.datetime] >= start_date if start_date  else True) &
+                            (data_mat[self.datetime] <= end_date   if end_date    else True)
+                            ]
+    
+    
+    def parse_datetime(self, column: pd.Series) -> pd.Series:
+        """Parses with the fixed `DATETIME_FORMAT`, falling back to format inference if it does not match."""
+        
+        with self.instrumentation.timer('parse'):
+            return self._parse_datetime_column(column)
+        
+        
+    def _parse_datetime_column(self, column: pd.Series) -> pd.Series:
+        
+        if self.datetime_format:
+            try:
+                return pd.to_datetime(column, format=self.datetime_format)
+            
+            except (ValueError, TypeError):
+                pass
+            
+        return pd.to_datetime(column)
+    
+    
+    def _read_archive(self) -> pd.DataFrame:
+        """Reads the rows in the date range from a `.wfa` archive by slicing its memory-mapped arrays."""
+        
+        self.instrumentation.count('bytes', os.path.getsize(self.file_path))
+        
+        with self.instrumentation.timer('read'):
+            times, counts = read_archive(self.file_path, *self._read_bounds())
+            
+        return pd.DataFrame({self.datetime: times, self.devicecount: counts})
+    
+    
+    ##################################
+    #   Fast `CSV` ingestion
+    ##################################
+    def _read_csv_fast(self) -> pd.DataFrame:
+        """
+        Reads a CSV file with declared dtypes (int32 devicecount) and a fixed datetime format.
+        
+        With a date range and `USE_RANGE_INDEX`, only the byte range of the dates is read (see 
+        `range_index.py`). Otherwise, with the `c` engine the file is read in chunks of 
+        `READ_CHUNKSIZE` rows, and reading stops at the first chunk past `end_date`; this assumes 
+        the file is sorted by time, as the WiFi reports are. The `pyarrow` engine (if installed) 
+        reads the whole file with multiple threads and filters afterwards.
+        """
+        
+        read_options = {'header':   None,
+                        'names':    [self.datetime, self.devicecount],
+                        'dtype':    {self.datetime: str, self.devicecount: np.int32}
+                        }
+        
+        if self.range_index is not None and (self.start_date or self.end_date):
+            return self._read_csv_range(read_options)
+        
+        self.instrumentation.count('bytes', os.path.getsize(self.file_path))
+        
+        if self.read_engine == 'pyarrow' and HAS_PYARROW:
+            with self.instrumentation.timer('read'):
+                data_mat            = pd.read_csv(self.file_path, engine='pyarrow', **read_options)
+            data_mat[self.datetime] = self.parse_datetime(data_mat[self.datetime])
+            
+            return self._filter_dates(data_mat) if self.start_date or self.end_date else data_mat
+        
+        chunks                  = []
+        start_date, end_date    = self._read_bounds()
+        
+        with pd.read_csv(self.file_path, engine='c', chunksize=self.read_chunksize, **read_options) as reader:
+            while True:
+                with self.instrumentation.timer('read'):
+                    chunk = next(reader, None)
+                
+                if chunk is None:
+                    break
+                
+                # Check the chunk bounds before parsing the whole chunk
+                first, last = self.parse_datetime(chunk[self.datetime].iloc[[0, -1]])
+                
+                if end_date and first > end_date:
+                    break
+                
+                if start_date and last < start_date:
+                    continue
+                
+                chunk[self.datetime] = self.parse_datetime(chunk[self.datetime])
+                chunks.append(self._filter_dates(chunk) if self.start_date or self.end_date else chunk)
+        
+        if not chunks:
+            return self._empty_frame()
+        
+        return pd.concat(chunks, ignore_index=True)
+    
+    
+    def _empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({self.datetime:     pd.Series(dtype='datetime64[ns]'), 
+                             self.devicecount:  pd.Series(dtype=np.int32)
+                             })
 
+    def _read_csv_range(self, read_options: Dict) -> pd.DataFrame:
+        """Reads only the byte range of the date range, located with the persisted TimeOffsetIndex."""
+        
+        with self.instrumentation.timer('index'):
+            first, last = self.range_index.byte_range(self.file_path, *self._read_bounds(), parse=self.parse_datetime)
+        
+        self.instrumentation.count('bytes', last - first)
+        
+        with self.instrumentation.timer('read'):
+            with open(self.file_path, 'rb') as f:
+                f.seek(first)
+                window = f.read(last - first)
+                
+            if not window.strip():
+                return self._empty_frame()
+            
+            data_mat = pd.read_csv(io.BytesIO(window), engine='c', **read_options)
+        
+        data_mat[self.datetime] = self.parse_datetime(data_mat[self.datetime])
+        
+        return self._filter_dates(data_mat).reset_index(drop=True)
+    
+    
     ##################################
     #   Linear interpolation
+    #   (or 'previous' / 'zero' fill)
     ##################################
     def interpolate_time_series_data(self, data: pd.DataFrame) -> pd.DataFrame:
         
-        # Get start and end date if none is passed
-        if self.start_date is None or self.start_date < data.index.min():
-            self.start_date = data.index.min()
-            
-        if self.end_date is None or self.end_date > data.index.max():
-            self.end_date   = data.index.max()
+        # Anchor the grid on the start date, or on the sample frequency if none is passed,
+        # so that every building lands on the same grid points
+        start_date  = self.start_date if self.start_date is not None else data.index.min().ceil(self.sample_freq)
+        end_date    = self.end_date   if self.end_date   is not None else data.index.max()
         
         # LINEAR INTERPOLATION
-        interpolation_range = pd.date_range(start=self.start_date, end=self.end_date, freq=self.sample_freq)
-        f                   = interp1d(data.index.values.astype(float), data[self.devicecount],kind='linear')
-        interpolated_values = f(interpolation_range.values.astype(float))
+        interpolation_range = pd.date_range(start=start_date, end=end_date, freq=self.sample_freq)
+        resampler           = BatchResampler(interpolation_range, kind=self.kind)
+        interpolated_values = resampler.resample_series(data.index.values, data[self.devicecount].values)
         interpolated_df     = pd.DataFrame(interpolated_values, index=interpolation_range, columns=[self.devicecount])
         
+        # Keep only the span covered by the data
+        interpolated_df     = interpolated_df.loc[interpolated_df.first_valid_index():interpolated_df.last_valid_index()]
+        
         # Save linearly interpolated data
         if self.save_interpolated:
             save_path   = "interpolated-data.csv"
@@ -173,6 +401,161 @@ class DataReader:
         return smoothed_df
 
 
+####################################################################################
+#
+#   Worker pool
+#
+####################################################################################
+
+_WORKER_POOLS = {}
+
+
+def worker_pool(n_jobs: int) -> Parallel:
+    """
+    Returns a persistent joblib pool with `n_jobs` workers, started on first use and kept 
+    alive across calls (and across BuildingProcessor instances) until the interpreter exits.
+    Tasks are dispatched one at a time, in the order given.
+    """
+    
+    if n_jobs not in _WORKER_POOLS:
+        pool = Parallel(n_jobs=n_jobs, batch_size=1, pre_dispatch='all')
+        pool.__enter__()
+        atexit.register(pool.__exit__, None, None, None)
+        _WORKER_POOLS[n_jobs] = pool
+        
+    return _WORKER_POOLS[n_jobs]
+
+
+def _file_size(file_path: Path) -> int:
+    try:
+        return file_path.stat().st_size
+    
+    except OSError:
+        return 0
+
+
+def _chunk_start(path: Path) -> List[int]:
+    """The first grid time of an `aggregates.npz` chunk (empty for an empty chunk), closing the file."""
+    
+    with np.load(path) as chunk:
+        return chunk['datetime'][:1].tolist()
+
+
+####################################################################################
+#
+#   Shared-memory worker
+#
+####################################################################################
+
+# Memory-backed files (tmpfs) keep the shared output array out of the page cache writeback
+SHARED_DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def _remove_shared(path: str) -> None:
+    try:
+        os.remove(path)
+        
+    except OSError:
+        pass
+
+
+def _compact_buildings(output: np.memmap, present: np.ndarray) -> np.ndarray:
+    """
+    Moves the rows of the `present` buildings of the (network x building x time) `output` to the front 
+    of its buffer, in place, and returns them as a contiguous (network x present x time) view. Every row 
+    moves to an offset at or before its own, so copying the rows in order never overwrites an unread row.
+    """
+    
+    networks, buildings, length = output.shape
+    kept                        = np.flatnonzero(present)
+    
+    if len(kept) == buildings:
+        return output
+    
+    rows = output.reshape(networks * buildings, length)
+    
+    for i in range(networks):
+        for new, old in enumerate(kept):
+            if i * len(kept) + new != i * buildings + old:
+                rows[i * len(kept) + new] = rows[i * buildings + old]
+                
+    return rows[:networks * len(kept)].reshape(networks, len(kept), length)
+
+
+def _resample_into_shared(output_path:      str,
+                          shape:            Tuple[int, int, int],
+                          position:         Tuple[int, int],
+                          reader_options:   Dict,
+                          grid:             pd.DatetimeIndex,
+                          cache:            SeriesCache = None,
+                          cache_key:        str         = None,
+                          instrument:       bool        = False ) -> Tuple:
+    """
+    Reads one building file, resamples it onto `grid` and writes the result straight into the 
+    (network x building x time) memmap at `output_path`. Returns only (position, rows, first, last, 
+    stats), where [first, last) is the span of grid points with data and `stats` is the exported 
+    Instrumentation of this building (None unless `instrument`), or None if the file is missing.
+    
+    This is a module-level function so that joblib does not pickle the BuildingProcessor.
+    """
+    
+    instrumentation             = Instrumentation(enabled=instrument)
+    data_reader                 = DataReader(**reader_options)
+    data_reader.instrumentation = instrumentation
+    
+    try:
+        data_mat = data_reader.read_time_series_data()
+        
+    except FileNotFoundError:
+        print(f"No file found with the name {data_reader.file_path}.")
+        return None
+    
+    instrumentation.count('rows', len(data_mat))
+    
+    with instrumentation.timer('interpolate'):
+        values  = BatchResampler(grid, kind=data_reader.kind).resample_series(data_mat[data_reader.datetime].values,
+                                                                              data_mat[data_reader.devicecount].values)
+        valid   = np.flatnonzero(~np.isnan(values))
+    
+    if len(valid) == 0:
+        return position, len(data_mat), 0, 0, instrumentation.export() if instrument else None
+    
+    first, last = valid[0], valid[-1] + 1
+    
+    with instrumentation.timer('write'):
+        output  = np.memmap(output_path, dtype=np.float32, mode='r+', shape=shape)
+        output[position[0], position[1], first:last] = values[first:last]
+        output.flush()
+        del output
+    
+        if cache is not None:
+            cache.store(cache_key, pd.DataFrame({data_reader.datetime:    grid[first:last], 
+                                                 data_reader.devicecount: values[first:last]
+                                                 }))
+            
+    stats = instrumentation.export() if instrument else None
+        
+    return position, len(data_mat), first, last, stats
+
+
+def _convert_to_archive(csv_filepath: Path, archive_path: Path) -> Path:
+    """Reads a whole CSV report and writes it to a `.wfa` archive, sorted by time."""
+    
+    data_reader = DataReader(file_path=csv_filepath)
+    data_mat    = data_reader.read_time_series_data().sort_values(data_reader.datetime, kind='stable')
+    
+    return write_archive(archive_path, data_mat[data_reader.datetime].values, data_mat[data_reader.devicecount].values)
+
+
+def _report_gaps(reader_options: Dict, threshold: pd.Timedelta) -> pd.DataFrame:
+    """Reads the timestamps of one building file and returns its one-row missing-report gap statistics."""
+    
+    data_reader = DataReader(**reader_options)
+    data_mat    = data_reader.read_time_series_data()
+    
+    return SparsityCalculator().calculate_report_gaps([data_mat[data_reader.datetime].values], threshold)
+
+
 ####################################################################################
 #
 #   Class: BuildingProcessor
@@ -189,8 +572,12 @@ class BuildingProcessor:
         cpu_cores:   int    = multiprocessing.cpu_count(), 
         record_time: bool   = False,
         sparsity_check: bool    = None,
+        use_cache:      bool    = None,
+        use_archive:    bool    = None,
+        instrument:     bool    = None,
         config_name             = "Config1",
-        config_file             = "config2.json"
+        config_file             = "config2.json",
+        data_directory: Path    = CSV_DIRECTORY
         ):
         
         self.data_reader    = data_reader
@@ -204,12 +591,19 @@ class BuildingProcessor:
         self.general        = self.config[  'GENERAL'       ]
         self.residential    = self.config[  'RESIDENTIAL'   ]
         self.community      = self.config[  'COMMUNITY'     ]
+        self.groupings      = load_groupings(self.config)
+        self.use_cache      = self.config[  'USE_CACHE'     ] if use_cache is None else use_cache
+        self.cache          = SeriesCache(BASE_DIR.joinpath(self.config['CACHE_DIRECTORY']),
+                                          max_bytes=int(self.config['CACHE_MAX_MB'] * 1024**2)
+                                          ) if self.use_cache else None
+        self.instrumentation = Instrumentation(enabled=self.config['INSTRUMENT'] if instrument is None else instrument)
+        self.use_archive    = self.config[  'USE_ARCHIVE'   ] if use_archive is None else use_archive
+        self.archive_directory = BASE_DIR.joinpath(self.config['ARCHIVE_DIRECTORY'])
         self.start_date     = data_reader.start_date
         self.end_date       = data_reader.end_date 
+        self.read_margin    = data_reader.margin
         self.directories    = [
-            BASE_DIR.joinpath('data',
-                              'input',
-                              'WiFiData-old', dir_name) for dir_name in ['Eduroam','UCBGuest','UCBWireless']
+            Path(data_directory).joinpath(dir_name) for dir_name in ['Eduroam','UCBGuest','UCBWireless']
             ]
         
     def _get_building_identifiers(self, filename: str)  ->  str:
@@ -219,76 +613,93 @@ class BuildingProcessor:
         filenames = os.listdir(directory)
         return [self._get_building_identifiers(filename) for filename in filenames]
 
-    def _process_building_data(self, 
-                               data_reader:     DataReader, 
-                               building_name:   str, 
-                               directory:       Path )  -> Tuple[str, pd.DataFrame]:
-        
-        csv_filename    = f"{building_name}{COMMON}" if self.use_common else building_name
-        csv_filepath    = directory.joinpath(csv_filename)
-        
-        data_reader     = DataReader(file_path   = csv_filepath, 
-                                     start_date  = self.start_date,
-                                     end_date    = self.end_date,
-                                     sample_freq = self.data_reader.sample_freq
-                                     )
+    def _get_csv_filepath(self, building_name: str, directory: Path) -> Path:
+        """Returns the raw CSV report of a building, never its archive."""
+        csv_filename = f"{building_name}{COMMON}" if self.use_common else building_name
+        return directory.joinpath(csv_filename)
+
+    def _get_building_filepath(self, building_name: str, directory: Path) -> Path:
+        csv_filepath = self._get_csv_filepath(building_name, directory)
         
-        try:
-            data_mat = data_reader.read_time_series_data()
-            data_mat = data_mat.set_index('datetime')
+        if self.use_archive:
+            archive_filepath = self._get_archive_filepath(csv_filepath)
             
-        except FileNotFoundError:
-            print(f"No file found with the name {csv_filepath}.")
-            return building_name
-        
-        if data_mat.empty:
-            return building_name
-        
-        # INTERPOLATION
-        #interpolated_data = data_reader.smooth_time_series_data(data_mat)
-        interpolated_data = data_reader.interpolate_time_series_data(data_mat)
-        
-        if self.start_date or self.end_date:
-            interpolated_data = interpolated_data[
-                (interpolated_data.index >= self.start_date if self.start_date else True) &
-                (interpolated_data.index <= self.end_date if self.end_date else True)
-                ]
+            # Only an archive written after the last change of its CSV is used
+            if archive_filepath.exists() and (not csv_filepath.exists() or 
+                                              archive_filepath.stat().st_mtime_ns >= csv_filepath.stat().st_mtime_ns):
+                return archive_filepath
             
-        return building_name, interpolated_data.reset_index().rename(columns={'index':'datetime'})
+        return csv_filepath
 
+    def _get_archive_filepath(self, csv_filepath: Path) -> Path:
+        return self.archive_directory.joinpath(csv_filepath.parent.name, csv_filepath.with_suffix(ARCHIVE_SUFFIX).name)
+
+    def _get_cache_key(self, building_name: str, directory: Path) -> str:
+        return self.cache.make_key(self._get_building_filepath(building_name, directory),
+                                   self.start_date,
+                                   self.end_date,
+                                   self.data_reader.sample_freq,
+                                   self.data_reader.kind,
+                                   margin = self.read_margin
+                                   )
 
     def process_all_buildings(self) -> Dict[str, Dict[str, pd.DataFrame]]:
         start_time  = time.time()
-        results     = self.process_directories()
-        results     = self.aggregate_network_data(results)
+        results     = self.aggregate_network_data(self.process_tensor())
         total_time  = self.calculate_processing_time(start_time)
         
         # OUTPUT PRINTED 
         print(f"{total_time} seconds using {self.cpu_cores} CPU cores")
+        
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries ({stats['bytes'] / 1024**2:.1f} MB)")
 
         if self.record_time:
             return total_time
         
         if self.sparsity_check:
-            results = self.calculate_sparsity(results)
+            with self.instrumentation.timer('sparsity'):
+                results = self.calculate_sparsity(results)
+                
+        if self.instrumentation.enabled:
+            print(self.instrumentation.summary())
             
         return results
 
 
-    def process_directories(self):
-        results = {}
+    def building_files(self) -> Dict[Tuple[int, str], Path]:
+        """Returns the file of every (network index, building) pair, in directory listing order."""
         
-        for directory in self.directories:
-            
-            network_name    = os.path.basename(directory)
-            building_list   = [self.building_id] if self.building_id else self._get_buildings(directory)
-            
-            network_results = Parallel(n_jobs=self.cpu_cores)(
-                delayed(self._process_building_data)(
-                    self.data_reader, building_name, directory) for building_name in building_list
-                )
+        files = {}
+        
+        for i, directory in enumerate(self.directories):
+            building_list = [self.building_id] if self.building_id else self._get_buildings(directory)
             
-            results[network_name] = {k: v for k, v in network_results if not v.empty}
+            for building_name in building_list:
+                files[(i, building_name)] = self._get_building_filepath(building_name, directory)
+                
+        return files
+    
+    
+    def _schedule(self, pairs: List[Tuple[int, str]], files: Dict[Tuple[int, str], Path]) -> List[Tuple[int, str]]:
+        """Orders the (network, building) pairs largest file first, so that no long task starts last."""
+        return sorted(pairs, key=lambda pair: _file_size(files[pair]), reverse=True)
+    
+    
+    def process_directories(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Returns the {network: {building: df}} interpolated series, each trimmed to the span of its data.
+        
+        A view of `process_tensor`: the workers write into its shared memmap, so no DataFrame or 
+        BuildingProcessor is pickled, and the cache is served and filled there.
+        """
+        
+        tensor  = self.process_tensor()
+        results = {network: {} for network in tensor.networks}
+        
+        for i, j in zip(*np.nonzero(tensor.present)):
+            results[tensor.networks[i]][tensor.buildings[j]] = tensor.frame(tensor.values[i, j]).dropna().reset_index(drop=True)
             
         return results
     
@@ -300,106 +711,276 @@ class BuildingProcessor:
     #   - Campus Sum
     ##################################
     
-    def aggregate_network_data(self, results):
+    def building_groups(self) -> Dict[str, List[str]]:
+        """The building types: the groups of the 'type' entry of `GROUPINGS`."""
+        return self.groupings['type'].groups
+    
+    
+    def build_tensor(self, results) -> BuildingTensor:
+        """Stacks the {network: {building: df}} output of `process_directories` on one shared time grid."""
         
-        counts_type =   {   'general':      0, 
-                            'residential':  0, 
-                            'community':    0   
-                            } 
+        networks = {network: results[network] for network in ['Eduroam', 'UCBGuest', 'UCBWireless'] if network in results}
         
-        for network in  [   'Eduroam',  'UCBGuest', 'UCBWireless'   ]:
-            if network in results:
-                for building, df in results[network].items():
-                    
-                    #######################################
-                    #   Determine building type
-                    #######################################
-                    building_type = None
-                    
-                    if building     in  self.general:
-                        building_type   =   'general'
-                        
-                    elif building   in  self.residential:
-                        building_type   =   'residential'
-                        
-                    elif building   in  self.community:
-                        building_type   =   'community'
-                    
-                    #######################################
-                    #   Update 'Sum' dictionary
-                    ####################################### 
-                    if 'Sum'    not in results:
-                        results['Sum'] = {}
-                        
-                    if building not in results['Sum']:
-                        results['Sum'][building] = df.copy()
-                        
-                    else:
-                        results['Sum'][building]['devicecount'] += df['devicecount']
-                     
-                    #######################################
-                    #   Update 'Type' dictionary
-                    #######################################  
-                    if 'Type'   not in results:
-                        results['Type'] = {'general':       pd.DataFrame(), 
-                                           'residential':   pd.DataFrame(), 
-                                           'community':     pd.DataFrame()
-                                           }
-
-                    if building_type:
-                        if results['Type'][building_type].empty:
-                            results['Type'][building_type] = df.copy()
-                            
-                        else:
-                            results['Type'][building_type]['devicecount'] += df['devicecount']
-                        
-                        # Increment count for this building type
-                        counts_type[building_type] += 1
-                        
-                    #######################################
-                    #   Update 'Campus' dictionary
-                    #######################################  
-                    if 'Campus' not in results:
-                        results['Campus'] = df.copy()
-                        
-                    else:
-                        results['Campus']['devicecount'] += df['devicecount']
+        return BuildingTensor.from_results(networks,
+                                           sample_freq  = self.data_reader.sample_freq,
+                                           start_date   = self.start_date,
+                                           end_date     = self.end_date
+                                           )
+    
+    
+    def process_tensor(self) -> BuildingTensor:
+        """
+        Returns the (network x building x time) tensor of all interpolated series.
+        
+        The tensor is preallocated as a memmap on the shared grid, and every worker writes its 
+        resampled series into its own (network, building) row and returns only the span it 
+        filled. No DataFrame or BuildingProcessor is pickled between processes. All (network, 
+        building) pairs go through one largest-file-first queue on the persistent `worker_pool`.
+        
+        The memmap is not copied back: the buildings without data are compacted out in place, 
+        and the returned tensor is a view of it. Its file is removed once the tensor is released.
+        """
+        
+        networks    = [os.path.basename(directory) for directory in self.directories]
+        files       = self.building_files()
+        buildings   = list(dict.fromkeys(building_name for _, building_name in files))
+        position    = {building_name: j for j, building_name in enumerate(buildings)}
         
+        with self.instrumentation.timer('grid'):
+            index   = self.shared_grid(files.values())
+            
+        shape       = (len(networks), len(buildings), len(index))
+        
+        # The tensor keeps the shared memmap as its storage; the file is removed when the memmap is released
+        handle, output_path = tempfile.mkstemp(suffix='.dat', dir=SHARED_DIRECTORY)
+        os.close(handle)
         
-        #######################################
-        #   Calculating the average
-        #######################################
+        try:
+            output      = np.memmap(output_path, dtype=np.float32, mode='w+', shape=shape)
+            weakref.finalize(output, _remove_shared, output_path)
+            output[:]   = np.nan
+            output.flush()
+            tasks       = []
+            present     = np.zeros(len(buildings), dtype=bool)
+            
+            for (i, building_name) in self._schedule(list(files), files):
+                file_path   = files[(i, building_name)]
+                cache_key   = self._get_cache_key(building_name, self.directories[i]) if self.cache is not None else None
+                
+                cached_data = None
+                
+                # Warm buildings are placed by the parent; only the misses go to the workers
+                if self.cache is not None:
+                    with self.instrumentation.timer('cache', key=f"{networks[i]}/{building_name}"):
+                        cached_data = self.cache.load(cache_key)
                         
-        # Initialize DataFrame for average for each building type
-        if 'Average' not in results:
-            results['Average'] =    {   'general':      pd.DataFrame(),
-                                        'residential':  pd.DataFrame(),
-                                        'community':    pd.DataFrame()
-                                        }
-            
-        # Calculate average for each type of building 
-        for building_type in ['general', 'residential', 'community']:
-            
-            if counts_type[building_type] > 0:
-                temp_df = results['Type'][building_type].copy()
+                        if cached_data is not None:
+                            row                                 = BatchResampler(index).resample_series(cached_data['datetime'].values, 
+                                                                                                        cached_data['devicecount'].values)
+                            output[i, position[building_name]]  = row
+                            present[position[building_name]]   |= not np.isnan(row).all()
+                if cached_data is not None:
+                    continue
                 
-                # Calculate average
-                temp_df[    'devicecount'   ] /= counts_type[building_type]
+                tasks.append(delayed(_resample_into_shared)(output_path,
+                                                            shape,
+                                                            (i, position[building_name]),
+                                                            self._reader_options(file_path),
+                                                            index,
+                                                            self.cache,
+                                                            cache_key,
+                                                            self.instrumentation.enabled
+                                                            ))
                 
-                # Store average in dictionary
-                results[    'Average'       ][building_type] = temp_df    
+            output.flush()
+            
+            # Wall-clock time of the whole pool; the per-building stages are merged from the workers
+            with self.instrumentation.timer('parallel'):
+                metadata = worker_pool(self.cpu_cores)(tasks)
+            
+            for result in metadata:
+                if result is not None:
+                    (i, j), _, first, last, stats = result
+                    present[j] |= last > first
+                    self.instrumentation.merge(stats, key=f"{networks[i]}/{buildings[j]}")
+                    
+        except BaseException:
+            _remove_shared(output_path)
+            raise
+            
+        if self.cache is not None:
+            self.cache.evict()
+        
+        # Drop the buildings that have no data on any network, known from the spans the workers filled, 
+        # without rescanning or copying the tensor
+        return BuildingTensor(_compact_buildings(output, present), index, networks, np.asarray(buildings, dtype=object)[present])
+    
+    
+    def _reader_options(self, file_path: Path) -> Dict:
+        return {'file_path':    file_path,
+                'start_date':   self.start_date,
+                'end_date':     self.end_date,
+                'sample_freq':  self.data_reader.sample_freq,
+                'kind':         self.data_reader.kind,
+                'margin':       self.read_margin
+                }
+    
+    
+    def shared_grid(self, file_paths) -> pd.DatetimeIndex:
+        """Returns the grid of the tensor, using the first and last line of every file for a missing start or end date."""
         
-        # PLOTTING AVERAGE     
-        #plt.figure()
-        #plt.plot(results['Average']['general']['devicecount'],      label='General'     )
-        #plt.plot(results['Average']['residential']['devicecount'],  label='Residential' )
-        #plt.plot(results['Average']['community']['devicecount'],    label='Community'   )
-        #plt.legend()
-        #plt.show()
+        start_date, end_date = self.start_date, self.end_date
         
+        if start_date is None or end_date is None:
+            bounds = [DataReader(file_path=file_path).read_time_bounds() for file_path in file_paths if file_path.exists()]
+            bounds = [(first, last) for first, last in bounds if first is not None]
+            
+            if not bounds:
+                return pd.DatetimeIndex([])
+            
+            start_date  = start_date if start_date is not None else min(first for first, _ in bounds).ceil(self.data_reader.sample_freq)
+            end_date    = end_date   if end_date   is not None else max(last  for _, last  in bounds)
+            
+        return pd.date_range(start=start_date, end=end_date, freq=self.data_reader.sample_freq)
+    
+    
+    def aggregate_network_data(self, results):
+        """
+        Adds the 'Sum', 'Type', 'Campus' and 'Average' aggregates to `results`.
+        
+        `results` may be the dict returned by `process_directories` or a BuildingTensor. The 
+        aggregates are reductions of the tensor along its network and building axes; the 
+        per-network building frames are returned on the same shared time grid.
+        """
+        
+        tensor = results if isinstance(results, BuildingTensor) else self.build_tensor(results)
+        
+        with self.instrumentation.timer('aggregate'):
+            return tensor.to_results(self.groupings['type'])
+
+
+    def aggregate_groupings(self, tensor: BuildingTensor, names: List[str] = None) -> Dict[str, Dict[str, Dict[str, pd.DataFrame]]]:
+        """
+        Returns {grouping: {'Sum': {group: df}, 'Average': {group: df}}} for the groupings of `GROUPINGS` 
+        in `names` (default all), each one matrix product over the building or network axis of `tensor`.
+        """
+        
+        names       = list(self.groupings) if names is None else names
+        network_sum = tensor.network_sum()
+        results     = {}
+        
+        with self.instrumentation.timer('aggregate'):
+            for name in names:
+                sums, averages  = tensor.grouping_results(self.groupings[name], network_sum)
+                results[name]   = {'Sum': sums, 'Average': averages}
+                
         return results
 
 
+    ##################################
+    #   Chunked processing
+    ##################################
+    
+    def _chunk_bounds(self, window: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Splits [start_date, end_date] at the `window` boundaries (e.g. 'MS' for month starts)."""
+        
+        step        = pd.Timedelta(self.data_reader.sample_freq)
+        start_date  = pd.Timestamp(self.start_date)
+        end_date    = pd.Timestamp(self.end_date)
+        boundaries  = [start_date] + [b for b in pd.date_range(start_date, end_date, freq=window) if b > start_date]
+        
+        return [(chunk_start, chunk_end - step) for chunk_start, chunk_end in zip(boundaries, boundaries[1:])] + \
+               [(boundaries[-1], end_date)]
+    
+    
+    def process_chunked(self, window: str = None, output_directory: Path = None) -> List[Path]:
+        """
+        Processes [start_date, end_date] one time window at a time and writes the aggregates of 
+        every window to `<output_directory>/<"%b-%d-%Y">_to_<"%b-%d-%Y">/aggregates.npz`.
+        
+        Only one window of interpolated series is held in memory at a time, so the peak memory 
+        is set by `window` (default `CHUNK_WINDOW` in `config2.json`) rather than by the total 
+        span. Rows within `CHUNK_MARGIN` of a window are read as interpolation neighbours so 
+        that the windows join without gaps. Returns the paths of the written files.
+        """
+        
+        if self.start_date is None or self.end_date is None:
+            raise ValueError("Chunked processing needs both a start_date and an end_date.")
+        
+        window              = window or self.config['CHUNK_WINDOW']
+        output_directory    = Path(output_directory or BASE_DIR.joinpath(self.config['CHUNK_DIRECTORY']))
+        paths               = []
+        
+        for chunk_start, chunk_end in self._chunk_bounds(window):
+            chunk_processor             = copy.copy(self)
+            chunk_processor.start_date  = chunk_start
+            chunk_processor.end_date    = chunk_end
+            chunk_processor.read_margin = max(self.read_margin, pd.Timedelta(self.config['CHUNK_MARGIN']))
+            
+            tensor      = chunk_processor.process_tensor()
+            folder_name = f"{chunk_start.strftime('%b-%d-%Y')}_to_{chunk_end.strftime('%b-%d-%Y')}"
+            path        = output_directory.joinpath(folder_name, 'aggregates.npz')
+            
+            self.save_aggregates(tensor, path)
+            paths.append(path)
+            print(f"{folder_name}\tsaved to: {path.parent}")
+            
+            del tensor
+            
+        return paths
+    
+    
+    def save_aggregates(self, tensor: BuildingTensor, path: Path) -> None:
+        """Writes the Sum, Type, Campus and Average aggregates of `tensor` to an NPZ file."""
+        
+        grouping            = self.groupings['type']
+        network_sum         = tensor.network_sum()
+        type_sums, counts   = tensor.grouping_sums(grouping, network_sum)
+        present             = tensor.present.any(axis=0)
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path,
+                 datetime   = tensor.index.values.astype('datetime64[ns]').astype(np.int64),
+                 buildings  = tensor.buildings[present].astype(str),
+                 groups     = np.array(grouping.names),
+                 sum        = network_sum[present],
+                 type       = type_sums,
+                 campus     = tensor.campus_sum(),
+                 counts     = counts
+                 )
+    
+    
+    @staticmethod
+    def load_aggregates(paths: List[Path]) -> Dict:
+        """
+        Joins the files written by `process_chunked` into the 'Sum', 'Type', 'Campus' and 'Average' 
+        entries of the `aggregate_network_data` layout.
+        """
+        
+        sums, type_sums, averages, campus = {}, {}, {}, []
+        
+        for path in sorted(paths, key=_chunk_start):
+            with np.load(path) as chunk:
+                index = pd.to_datetime(chunk['datetime'])
+                
+                for building, series in zip(chunk['buildings'], chunk['sum']):
+                    sums.setdefault(str(building), []).append(pd.DataFrame({'datetime': index, 'devicecount': series}))
+                    
+                for group, series, count in zip(chunk['groups'], chunk['type'], chunk['counts']):
+                    type_sums.setdefault(str(group), []).append(pd.DataFrame({'datetime': index, 'devicecount': series}))
+                    averages.setdefault(str(group),  []).append(pd.DataFrame({'datetime': index, 'devicecount': series / count if count else np.nan}))
+                    
+                campus.append(pd.DataFrame({'datetime': index, 'devicecount': chunk['campus']}))
+                
+        join = lambda frames: pd.concat(frames, ignore_index=True)
+        
+        return {'Sum':      {building: join(frames) for building, frames in sums.items()},
+                'Type':     {group:    join(frames) for group,    frames in type_sums.items()},
+                'Campus':   join(campus),
+                'Average':  {group:    join(frames) for group,    frames in averages.items()}
+                }
+
+
     def calculate_processing_time(self, start_time):
         
         end_time = time.time()
@@ -410,13 +991,90 @@ class BuildingProcessor:
         return total_time_rounded
 
 
-    def calculate_sparsity(self, results):
+    ##################################
+    #   Binary archive
+    ##################################
+    
+    def convert_to_archive(self, overwrite: bool = False) -> List[Path]:
+        """
+        Converts every CSV report of the networks to a `.wfa` archive in `ARCHIVE_DIRECTORY`
+        (see `archive.py`), on the worker pool. Archives newer than their CSV are skipped unless 
+        `overwrite`. Returns the paths of the archives written.
+        """
+        
+        tasks = []
+        
+        for i, directory in enumerate(self.directories):
+            building_list = [self.building_id] if self.building_id else self._get_buildings(directory)
+            
+            for building_name in building_list:
+                csv_filename    = f"{building_name}{COMMON}" if self.use_common else building_name
+                csv_filepath    = directory.joinpath(csv_filename)
+                archive_path    = self._get_archive_filepath(csv_filepath)
+                
+                if not csv_filepath.exists():
+                    continue
+                
+                if not overwrite and archive_path.exists() and archive_path.stat().st_mtime_ns >= csv_filepath.stat().st_mtime_ns:
+                    continue
+                
+                tasks.append((csv_filepath, archive_path))
+        
+        tasks = sorted(tasks, key=lambda task: _file_size(task[0]), reverse=True)
+        
+        return worker_pool(self.cpu_cores)(delayed(_convert_to_archive)(csv_filepath, archive_path) for csv_filepath, archive_path in tasks)
+    
+    
+    def calculate_sparsity(self, results, report_gaps: bool = False) -> pd.DataFrame:
+        """
+        Returns one table with the sparsity of every series in `results` (the output of 
+        `aggregate_network_data`), indexed by (network, building). The 'Sum', 'Type', 'Average' 
+        and 'Campus' aggregates are rows under those names. All series are stacked and measured 
+        in one pass; see `SparsityCalculator.calculate_table` for the columns.
+        
+        With `report_gaps`, the missing-report gaps of the raw timestamps (longer than 
+        `GAP_THRESHOLD`) are added for the (network, building) series. This reads every raw 
+        file again, so it is off by default.
+        """
         
         sparsity_calculator = SparsityCalculator()
+        labels              = []
+        series              = []
+        
+        for network, v in results.items():
+            frames = {network: v} if isinstance(v, pd.DataFrame) else v
+            
+            for building, df in frames.items():
+                if not df.empty:
+                    labels.append((network, building))
+                    series.append(df[self.data_reader.devicecount].to_numpy(dtype=np.float32))
+                    
+        values = np.full((len(series), max((len(v) for v in series), default=0)), np.nan, dtype=np.float32)
+        
+        for row, v in zip(values, series):
+            row[:len(v)] = v
+            
+        table = sparsity_calculator.calculate_table(values, labels, pd.Timedelta(self.data_reader.sample_freq))
+        
+        if report_gaps:
+            table = table.join(self.calculate_report_gaps())
+            
+        return table
+    
+    
+    def calculate_report_gaps(self) -> pd.DataFrame:
+        """Returns the missing-report gaps of every building file, indexed by (network, building)."""
+        
+        files       = self.building_files()
+        pairs       = [pair for pair in self._schedule(list(files), files) if files[pair].exists()]
+        threshold   = pd.Timedelta(self.config['GAP_THRESHOLD'])
+        gaps        = worker_pool(self.cpu_cores)(
+            delayed(_report_gaps)(self._reader_options(files[pair]), threshold) for pair in pairs
+            )
+        
+        if not pairs:
+            return pd.DataFrame()
         
-        sparsity_results    = {
-            network: sparsity_calculator.calculate_sparsity(v) if isinstance(v, pd.DataFrame) else {
-                k: sparsity_calculator.calculate_sparsity(df) for k, df in v.items()} for network, v in results.items()
-            }
+        labels = [(os.path.basename(self.directories[i]), building_name) for i, building_name in pairs]
         
-        return sparsity_results
+        return pd.concat(gaps, ignore_index=True).set_axis(pd.MultiIndex.from_tuples(labels, names=['network', 'building']))
@@ -0,0 +1,138 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the Grouping class, which turns the building lists of the configuration into label vectors and group sums.
+
+A grouping maps group names to members along one axis of the BuildingTensor: buildings (e.g. the building types) or networks. It is compiled once per list of members into:
+- an integer label vector (the group of every member, -1 for none), when the groups are disjoint
+- a (group x member) 0/1 membership matrix, which also allows overlapping groups
+
+so the sums of every group are one matrix product over the member axis instead of one masked sum per group.
+
+The groupings are read from the `GROUPINGS` key of `config2.json`. A group is a list of members or the name of a configuration key that holds one (e.g. "GENERAL"), so a new grouping (zones, custom lists) needs a configuration change only:
+
+    "GROUPINGS": {
+        "type":     {"axis": "building", "groups": {"general": "GENERAL", "residential": "RESIDENTIAL"}},
+        "network":  {"axis": "network",  "groups": {"Eduroam": ["Eduroam"], "UCBGuest": ["UCBGuest"]}}
+    }
+
+"""
+
+from typing import Dict, List, Sequence
+import numpy as np
+
+
+AXES = ('network', 'building')
+
+
+###############################################################################
+#
+#   Class: Grouping
+#
+###############################################################################
+
+class Grouping:
+
+    def __init__(
+        self,
+        groups  : Dict[str, Sequence[str]],
+        axis    : str   = 'building'
+        ):
+
+        if axis not in AXES:
+            raise ValueError(f"Unknown grouping axis: {axis}. Expected one of {AXES}.")
+
+        self.groups     =   {group: list(members) for group, members in groups.items()}
+        self.axis       =   axis
+        self._compiled  =   {}
+
+
+    @classmethod
+    def from_config(cls, spec: Dict, config: Dict) -> 'Grouping':
+        """Builds a grouping from one entry of `GROUPINGS`, resolving the configuration keys among its groups."""
+
+        groups = {group: config[members] if isinstance(members, str) else members for group, members in spec['groups'].items()}
+        return cls(groups, spec.get('axis', 'building'))
+
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.groups)
+
+
+    @property
+    def disjoint(self) -> bool:
+        members = [member for group in self.groups.values() for member in group]
+        return len(members) == len(set(members))
+
+
+    ##################################
+    #   Compilation
+    ##################################
+    def labels(self, members: Sequence[str]) -> np.ndarray:
+        """Returns the index of the group of every one of `members`, or -1 for members in no group."""
+
+        if not self.disjoint:
+            raise ValueError("A label vector needs disjoint groups; use `membership` for overlapping groups.")
+
+        lookup = {member: g for g, group in enumerate(self.groups.values()) for member in group}
+        return np.array([lookup.get(member, -1) for member in members], dtype=np.int64)
+
+
+    def membership(self, members: Sequence[str]) -> np.ndarray:
+        """Returns the (group x member) 0/1 float32 matrix of `members`, compiled once per list of members."""
+
+        key = tuple(members)
+
+        if key not in self._compiled:
+            matrix = np.zeros((len(self.groups), len(key)), dtype=np.float32)
+
+            if self.disjoint:
+                labels  = self.labels(key)
+                grouped = np.flatnonzero(labels >= 0)
+                matrix[labels[grouped], grouped] = 1
+
+            else:
+                for g, group in enumerate(self.groups.values()):
+                    matrix[g] = np.isin(np.asarray(key, dtype=object), group)
+
+            self._compiled[key] = matrix
+
+        return self._compiled[key]
+
+
+    ##################################
+    #   Reductions
+    ##################################
+    def sum(self, values: np.ndarray, members: Sequence[str]) -> np.ndarray:
+        """
+        Returns the (group x time) sums of the (member x time) `values`, treating NaN as 0 but
+        NaN where every member of a group is NaN, as `nan_sum`.
+        """
+
+        matrix  = self.membership(members)
+        valid   = ~np.isnan(values)
+        sums    = matrix @ np.where(valid, values, 0).astype(np.float32)
+        covered = matrix @ valid.astype(np.float32)
+
+        return np.where(covered > 0, sums, np.nan).astype(np.float32)
+
+
+    def count(self, present: np.ndarray, members: Sequence[str]) -> np.ndarray:
+        """Returns the number of series with data in every group, from the per-member series counts `present`."""
+        return (self.membership(members) @ np.asarray(present, dtype=np.float32)).astype(np.int64)
+
+
+def load_groupings(config: Dict) -> Dict[str, Grouping]:
+    """Returns every grouping of the `GROUPINGS` key of `config`."""
+    return {name: Grouping.from_config(spec, config) for name, spec in config['GROUPINGS'].items()}
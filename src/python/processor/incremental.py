@@ -0,0 +1,345 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the IncrementalProcessor class, which keeps the processed campus data up to date as new rows are appended to the WiFi report files.
+
+For every (network, building) file the processor keeps a high-water mark: the byte offset up to which the file has been read, and the time and value of the last sample. A refresh:
+- Reads only the bytes appended since the last refresh (up to the last complete line)
+- Resamples just the new tail onto the existing time grid, using the last known sample as the left neighbour
+- Updates the Sum, Type, Campus and Average aggregates in place for the affected grid columns only
+
+so a refresh costs time proportional to the new data rather than to the full history. The first refresh reads every file from the start. A file that shrinks (e.g. it was rotated or rewritten) is read again from the start.
+
+"""
+
+import io
+import os
+import json
+from pathlib import Path
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+from src.python.processor.building_tensor import BuildingTensor, nan_sum
+from src.python.processor.resampler import BatchResampler, to_nanoseconds
+
+
+###############################################################################
+#
+#   Class: IncrementalProcessor
+#
+###############################################################################
+
+class IncrementalProcessor:
+
+    def __init__(self, building_processor, initial_capacity: int = 1024):
+
+        self.processor      =   building_processor
+        self.data_reader    =   building_processor.data_reader
+        self.sample_freq    =   self.data_reader.sample_freq
+        self.kind           =   self.data_reader.kind
+        self.start_date     =   building_processor.start_date
+        self.end_date       =   building_processor.end_date
+        self.grouping       =   building_processor.groupings['type']
+        self.groups         =   self.grouping.groups
+        self.networks       =   [os.path.basename(directory) for directory in building_processor.directories]
+        self.buildings      =   []
+        self.marks          =   {}
+        self.step           =   pd.Timedelta(self.sample_freq).value
+        self.origin         =   None
+        self.length         =   0
+        self.values         =   np.full((len(self.networks), 0, initial_capacity), np.nan, dtype=np.float32)
+        self.sums           =   np.full((0, initial_capacity), np.nan, dtype=np.float32)
+        self.type_sums      =   np.full((len(self.groups), initial_capacity), np.nan, dtype=np.float32)
+        self.campus         =   np.full(initial_capacity, np.nan, dtype=np.float32)
+
+
+    ##################################
+    #   Storage
+    ##################################
+    @property
+    def capacity(self) -> int:
+        return self.values.shape[2]
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.origin + self.step * np.arange(self.length, dtype=np.int64))
+
+    def _reserve(self, length: int) -> None:
+        """Grows the time axis (doubling its capacity) so that it holds `length` grid points."""
+
+        if length <= self.capacity:
+            return
+
+        capacity = max(length, 2 * self.capacity)
+
+        def grow(array):
+            grown = np.full(array.shape[:-1] + (capacity,), np.nan, dtype=np.float32)
+            grown[..., :self.length] = array[..., :self.length]
+            return grown
+
+        self.values, self.sums, self.type_sums, self.campus = (
+            grow(self.values), grow(self.sums), grow(self.type_sums), grow(self.campus))
+
+    def _add_building(self, building: str) -> int:
+        self.buildings.append(building)
+        self.values = np.concatenate([self.values, np.full((len(self.networks), 1, self.capacity), np.nan, dtype=np.float32)], axis=1)
+        self.sums   = np.concatenate([self.sums,   np.full((1, self.capacity), np.nan, dtype=np.float32)], axis=0)
+        return len(self.buildings) - 1
+
+
+    ##################################
+    #   Reading appended rows
+    ##################################
+    def _read_tail(self, file_path: Path, mark: dict) -> pd.DataFrame:
+        """Returns the complete rows appended to `file_path` since `mark` and advances the mark."""
+
+        size = os.path.getsize(file_path)
+
+        if size < mark['offset']:
+            mark.update(offset=0, last_time=None, last_value=None)
+
+        with open(file_path, 'rb') as f:
+            f.seek(mark['offset'])
+            appended = f.read(size - mark['offset'])
+
+        # A partially written last line is left for the next refresh
+        appended = appended[:appended.rfind(b'\n') + 1]
+
+        if not appended:
+            return pd.DataFrame()
+
+        mark['offset'] += len(appended)
+
+        rows = pd.read_csv(io.BytesIO(appended),
+                           header   = None,
+                           names    = [self.data_reader.datetime, self.data_reader.devicecount],
+                           dtype    = {self.data_reader.datetime: str}
+                           )
+        rows[self.data_reader.datetime] = self.data_reader.parse_datetime(rows[self.data_reader.datetime])
+
+        return rows
+
+
+    def _file_paths(self) -> Dict[tuple, Path]:
+        file_paths = {}
+
+        for network, directory in zip(self.networks, self.processor.directories):
+            if not directory.exists():
+                continue
+
+            building_list = [self.processor.building_id] if self.processor.building_id else self.processor._get_buildings(directory)
+
+            for building in building_list:
+                # The marks are byte offsets into the appended CSV, so the archive is never read here
+                file_path = self.processor._get_csv_filepath(building, directory)
+
+                if file_path.exists():
+                    file_paths[(network, building)] = file_path
+
+        return file_paths
+
+
+    ##################################
+    #   Refresh
+    ##################################
+    def refresh(self) -> int:
+        """Ingests every appended row and updates the aggregates. Returns the number of new rows."""
+
+        tails = {}
+
+        for key, file_path in self._file_paths().items():
+            mark    = self.marks.setdefault(f"{key[0]}/{key[1]}", {'offset': 0, 'last_time': None, 'last_value': None})
+            rows    = self._read_tail(file_path, mark)
+
+            if not rows.empty:
+                tails[key] = (rows, mark)
+
+        if not tails:
+            return 0
+
+        if self.origin is None:
+            first_time  = min(rows[self.data_reader.datetime].min() for rows, _ in tails.values())
+            start_date  = pd.Timestamp(self.start_date) if self.start_date is not None else first_time.ceil(self.sample_freq)
+            self.origin = to_nanoseconds([start_date])[0]
+
+        # Every new tail is prefixed with the last sample it already had, which is the left
+        # neighbour of the first new grid points
+        series  = []
+        dirty   = []
+
+        for (network, building), (rows, mark) in tails.items():
+            times   = to_nanoseconds(rows[self.data_reader.datetime].values)
+            counts  = rows[self.data_reader.devicecount].to_numpy(dtype=np.float64)
+            new     = times > mark['last_time'] if mark['last_time'] is not None else np.ones(len(times), dtype=bool)
+            times, counts = times[new], counts[new]
+
+            if len(times) == 0:
+                continue
+
+            if mark['last_time'] is not None:
+                times   = np.insert(times,  0, mark['last_time'])
+                counts  = np.insert(counts, 0, mark['last_value'])
+
+            mark['last_time'], mark['last_value'] = int(times[-1]), float(counts[-1])
+
+            j = self.buildings.index(building) if building in self.buildings else self._add_building(building)
+            series.append((self.networks.index(network), j, times, counts))
+            dirty.append(max(-(-(times[0] - self.origin) // self.step), 0))
+
+        if not series:
+            return 0
+
+        last_time = max(times[-1] for _, _, times, _ in series)
+
+        if self.end_date is not None:
+            last_time = min(last_time, to_nanoseconds([pd.Timestamp(self.end_date)])[0])
+
+        first_cell  = min(dirty)
+        length      = max(int((last_time - self.origin) // self.step) + 1, self.length)
+
+        if first_cell >= length:
+            return sum(len(rows) for rows, _ in tails.values())
+
+        self._reserve(length)
+        self.length = length
+
+        # Resample all new tails on the dirty part of the grid in one batch
+        grid        = pd.DatetimeIndex(self.origin + self.step * np.arange(first_cell, length, dtype=np.int64))
+        resampled   = BatchResampler(grid, kind=self.kind).resample([s[2] for s in series], [s[3] for s in series])
+
+        for (i, j, _, _), row in zip(series, resampled):
+            covered = ~np.isnan(row)
+            self.values[i, j, first_cell:length][covered] = row[covered]
+
+        self._update_aggregates(first_cell, length)
+
+        return sum(len(rows) for rows, _ in tails.values())
+
+
+    ##################################
+    #   Aggregates
+    ##################################
+    def _update_aggregates(self, first_cell: int, last_cell: int) -> None:
+        """Recomputes the aggregates of the grid columns [first_cell, last_cell) only."""
+
+        window                                  = self.values[:, :, first_cell:last_cell]
+        self.sums[:, first_cell:last_cell]      = nan_sum(window, axis=0)
+        self.campus[first_cell:last_cell]       = nan_sum(window.reshape(-1, last_cell - first_cell), axis=0)
+
+        # One product with the membership matrix of the 'type' grouping, compiled once per list of buildings
+        self.type_sums[:, first_cell:last_cell] = self.grouping.sum(self.sums[:, first_cell:last_cell], self.buildings)
+
+    def group_counts(self) -> np.ndarray:
+        present = ~np.isnan(self.values[:, :, :self.length]).all(axis=2)
+        return self.grouping.count(present.sum(axis=0), self.buildings)
+
+
+    ##################################
+    #   Views
+    ##################################
+    def tensor(self) -> BuildingTensor:
+        return BuildingTensor(self.values[:, :, :self.length], self.index, self.networks, self.buildings)
+
+    def results(self) -> Dict:
+        """Returns the nested dict layout of `BuildingProcessor.aggregate_network_data`."""
+
+        index   = self.index
+        frame   = lambda series: pd.DataFrame({self.data_reader.datetime: index, self.data_reader.devicecount: series})
+        present = ~np.isnan(self.values[:, :, :self.length]).all(axis=2)
+
+        results = {
+            network: {building: frame(self.values[i, j, :self.length])
+                      for j, building in enumerate(self.buildings) if present[i, j]}
+            for i, network in enumerate(self.networks)
+            }
+
+        type_sums   = {}
+        averages    = {}
+
+        for g, (group, count) in enumerate(zip(self.grouping.names, self.group_counts())):
+            type_sums[group]    = frame(self.type_sums[g, :self.length])         if count else pd.DataFrame()
+            averages[group]     = frame(self.type_sums[g, :self.length] / count) if count else pd.DataFrame()
+
+        results['Sum']      = {building: frame(self.sums[j, :self.length])
+                               for j, building in enumerate(self.buildings) if present[:, j].any()}
+        results['Type']     = type_sums
+        results['Campus']   = frame(self.campus[:self.length])
+        results['Average']  = averages
+
+        return results
+
+
+    ##################################
+    #   Persistence
+    ##################################
+    def save(self, directory: Path) -> None:
+        """Writes the grid, series and high-water marks so that a later run can resume."""
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.savez(directory.joinpath('series.npz'), values=self.values[:, :, :self.length])
+
+        with open(directory.joinpath('state.json'), 'w') as f:
+            json.dump({'origin':        int(self.origin) if self.origin is not None else None,
+                       'step':          int(self.step),
+                       'sample_freq':   self.sample_freq,
+                       'kind':          self.kind,
+                       'start_date':    self._date_key(self.start_date),
+                       'end_date':      self._date_key(self.end_date),
+                       'groups':        self.groups,
+                       'networks':      self.networks,
+                       'buildings':     self.buildings,
+                       'marks':         self.marks
+                       }, f, indent=4)
+
+
+    @staticmethod
+    def _date_key(date) -> str:
+        return pd.Timestamp(date).isoformat() if date is not None else None
+
+
+    def load(self, directory: Path) -> bool:
+        """Restores a state written by `save`. Returns False if there is none or it does not match."""
+
+        directory = Path(directory)
+
+        if not directory.joinpath('state.json').exists():
+            return False
+
+        with open(directory.joinpath('state.json'), 'r') as f:
+            state = json.load(f)
+
+        # A state saved for another date range or grouping would resume with series outside of this range
+        expected = (self.sample_freq, self.kind, self._date_key(self.start_date), self._date_key(self.end_date), self.groups, self.networks)
+
+        if tuple(state.get(key) for key in ('sample_freq', 'kind', 'start_date', 'end_date', 'groups', 'networks')) != expected:
+            return False
+
+        with np.load(directory.joinpath('series.npz')) as series:
+            values = series['values']
+
+        self.origin     = state['origin']
+        self.buildings  = state['buildings']
+        self.marks      = state['marks']
+        self.length     = 0
+        self.values     = np.full(values.shape[:2] + (self.capacity,), np.nan, dtype=np.float32)
+        self.sums       = np.full((len(self.buildings), self.capacity), np.nan, dtype=np.float32)
+
+        self._reserve(values.shape[2])
+        self.length                         = values.shape[2]
+        self.values[:, :, :self.length]     = values
+        self._update_aggregates(0, self.length)
+
+        return True
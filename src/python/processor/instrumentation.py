@@ -0,0 +1,210 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the Instrumentation class, an opt-in collection of stage timers and counters for the processing pipeline.
+
+Stages are timed with the `timer` context manager, and counts (bytes read, rows) are added with `count`. Both can be attributed to a key such as "Eduroam/AERO", so the slow building or network of a run can be found from the per-key report without re-running under a profiler.
+
+Workers run with their own Instrumentation and return its `export()` with their result; the parent folds it in with `merge`. A disabled Instrumentation records nothing, so the timers can stay in place in the code.
+
+Memory is reported two ways. The pool workers are persistent, so the peak RSS (`ru_maxrss`) of a worker is its high-water mark over every building it has processed; it is reported per worker process. Per key, `rss_delta` is the growth of the current RSS from the creation of the worker's Instrumentation (at the start of a building) to its `export()` (while the building's frames are still alive), which singles out the memory-hungry buildings.
+
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict
+import pandas as pd
+
+
+try:
+    import resource
+    HAS_RESOURCE = True
+
+except ImportError:
+    HAS_RESOURCE = False
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+
+except ImportError:
+    HAS_PSUTIL = False
+
+
+def peak_rss() -> int:
+    """Returns the peak resident set size of the current process in bytes, or 0 where it is not available."""
+
+    if not HAS_RESOURCE:
+        return 0
+
+    # `ru_maxrss` is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def current_rss() -> int:
+    """Returns the current resident set size of the current process in bytes, or 0 where it is not available."""
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    except (OSError, ValueError, IndexError):
+        return psutil.Process().memory_info().rss if HAS_PSUTIL else 0
+
+
+###############################################################################
+#
+#   Class: Instrumentation
+#
+###############################################################################
+
+class Instrumentation:
+
+    def __init__(self, enabled: bool = True):
+
+        self.enabled    =   enabled
+        self.stages     =   {}
+        self.counters   =   {}
+        self.records    =   {}
+        self.workers    =   {}
+        self.start_rss  =   current_rss() if enabled else 0
+
+
+    ##################################
+    #   Timers and counters
+    ##################################
+    @contextmanager
+    def timer(self, stage: str, key: str = None):
+        """Adds the wall-clock time of the `with` block to `stage` (and to `key`, if given)."""
+
+        if not self.enabled:
+            yield
+            return
+
+        start_time = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            elapsed = time.perf_counter() - start_time
+            totals  = self.stages.setdefault(stage, {'seconds': 0.0, 'calls': 0})
+            totals['seconds']   += elapsed
+            totals['calls']     += 1
+
+            if key is not None:
+                record          = self.records.setdefault(key, {})
+                record[stage]   = record.get(stage, 0.0) + elapsed
+
+
+    def count(self, name: str, value: int, key: str = None) -> None:
+
+        if not self.enabled:
+            return
+
+        self.counters[name] = self.counters.get(name, 0) + value
+
+        if key is not None:
+            record          = self.records.setdefault(key, {})
+            record[name]    = record.get(name, 0) + value
+
+
+    ##################################
+    #   Merging across workers
+    ##################################
+    def export(self) -> Dict:
+        """Returns the recorded stages and counters, the RSS growth since this Instrumentation was created and the peak RSS of this process."""
+        return {'stages': self.stages, 'counters': self.counters, 'rss_delta': current_rss() - self.start_rss,
+                'pid': os.getpid(), 'peak_rss': peak_rss()}
+
+
+    def merge(self, exported: Dict, key: str = None) -> None:
+        """Adds the `export()` of a worker, attributing all of it to `key` if given."""
+
+        if not self.enabled or not exported:
+            return
+
+        record = self.records.setdefault(key, {}) if key is not None else {}
+
+        for stage, totals in exported['stages'].items():
+            merged              = self.stages.setdefault(stage, {'seconds': 0.0, 'calls': 0})
+            merged['seconds']   += totals['seconds']
+            merged['calls']     += totals['calls']
+            record[stage]       = record.get(stage, 0.0) + totals['seconds']
+
+        for name, value in exported['counters'].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+            record[name]        = record.get(name, 0) + value
+
+        record['rss_delta']             = max(record.get('rss_delta', 0), exported['rss_delta'])
+        self.workers[exported['pid']]   = max(self.workers.get(exported['pid'], 0), exported['peak_rss'])
+
+
+    def reset(self) -> None:
+        self.stages, self.counters, self.records, self.workers = {}, {}, {}, {}
+
+
+    ##################################
+    #   Reports
+    ##################################
+    def stage_report(self) -> pd.DataFrame:
+        """Total seconds and calls per stage, slowest first."""
+
+        report = pd.DataFrame.from_dict(self.stages, orient='index', columns=['seconds', 'calls'])
+        return report.sort_values('seconds', ascending=False)
+
+
+    def report(self) -> pd.DataFrame:
+        """One row per key with its stage seconds, counters and RSS growth, slowest first."""
+
+        report = pd.DataFrame.from_dict(self.records, orient='index').fillna(0)
+
+        if report.empty:
+            return report
+
+        stages              = [stage for stage in self.stages if stage in report.columns]
+        report['seconds']   = report[stages].sum(axis=1)
+
+        return report.sort_values('seconds', ascending=False)
+
+
+    def network_report(self) -> pd.DataFrame:
+        """The per-key report summed over the "<network>/<building>" keys of each network."""
+
+        report = self.report()
+
+        if report.empty:
+            return report
+
+        networks = report.index.str.split('/').str[0]
+        return report.drop(columns='rss_delta', errors='ignore').groupby(networks).sum().sort_values('seconds', ascending=False)
+
+
+    def summary(self, top: int = 5) -> str:
+
+        lines = [f"{stage:<12}{totals['seconds']:>10.3f} s {int(totals['calls']):>8} calls"
+                 for stage, totals in self.stage_report().iterrows()]
+
+        lines += [f"{name:<12}{value:>12}" for name, value in self.counters.items()]
+        lines += [f"peak RSS    {peak_rss() / 1024**2:>10.1f} MB (parent)"]
+        lines += [f"peak RSS    {rss / 1024**2:>10.1f} MB (worker {pid})" for pid, rss in self.workers.items()]
+
+        report = self.report()
+
+        if not report.empty:
+            lines += ["\nBy network:", self.network_report().to_string()]
+            lines += [f"\nSlowest {min(top, len(report))}:", report.head(top).to_string()]
+
+        return "\n".join(lines)
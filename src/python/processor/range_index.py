@@ -0,0 +1,164 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the TimeOffsetIndex class, a persisted sparse index from timestamps to byte offsets in the WiFi report CSV files.
+
+For every file the index holds the byte offset and timestamp of every `every`-th line. It is built once from a single pass over the raw bytes, read in fixed-size blocks (only the sampled lines are parsed), and stored as an NPZ file next to the other outputs. An index is keyed on the file path and is rebuilt when the file's modification time or size changes.
+
+A date-range read then seeks to the last indexed line before the start date and stops at the first indexed line after the end date, so it reads at most `every` lines more than the range itself. The files must be sorted by time, as the WiFi reports are.
+
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Callable, Tuple
+import numpy as np
+import pandas as pd
+
+from src.python.processor.atomic import atomic_write
+
+
+# Bytes read per step when scanning a file for line starts
+BLOCK_SIZE = 64 * 1024**2
+
+
+###############################################################################
+#
+#   Class: TimeOffsetIndex
+#
+###############################################################################
+
+class TimeOffsetIndex:
+
+    def __init__(
+        self,
+        index_directory : Path  = Path.cwd().joinpath('data', 'output', 'range-index'),
+        every           : int   = 4096
+        ):
+
+        self.index_directory    =   Path(index_directory)
+        self.every              =   every
+
+
+    def _entry_path(self, file_path: Path) -> Path:
+        key = hashlib.sha1(json.dumps({'path': str(Path(file_path).resolve()), 'every': self.every}).encode()).hexdigest()
+        return self.index_directory.joinpath(f"{key}.npz")
+
+
+    ##################################
+    #   Build and load
+    ##################################
+    def build(self, file_path: Path, parse: Callable[[pd.Series], pd.Series]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the (int64 ns timestamps, byte offsets) of every `every`-th line of `file_path`.
+
+        `parse` converts a Series of datetime strings to datetimes (e.g. `DataReader.parse_datetime`).
+        """
+
+        size = os.path.getsize(file_path)
+
+        if size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        offsets = self._line_offsets(file_path)
+        offsets = offsets[offsets < size]
+
+        # Only the first field of the sampled lines is decoded and parsed
+        with open(file_path, 'rb') as f:
+            fields = []
+
+            for offset in offsets:
+                f.seek(offset)
+                fields.append(f.readline().split(b',', 1)[0].decode().strip())
+
+        times = parse(pd.Series(fields)).values.astype('datetime64[ns]').view(np.int64)
+
+        return times, offsets
+
+
+    def _line_offsets(self, file_path: Path) -> np.ndarray:
+        """
+        Returns the start offset of every `every`-th line, scanning the file in blocks of `BLOCK_SIZE` bytes.
+        The line count is carried across blocks, so the memory held is one block and the sampled offsets.
+        """
+
+        offsets = [np.zeros(1, dtype=np.int64)]
+        lines   = 1
+        base    = 0
+
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(BLOCK_SIZE)
+
+                if not block:
+                    break
+
+                # The newline i of the block starts line number `lines + i`
+                newlines    = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+                offsets.append(base + 1 + newlines[-lines % self.every::self.every].astype(np.int64))
+                lines      += len(newlines)
+                base       += len(block)
+
+        return np.concatenate(offsets)
+
+
+    def load(self, file_path: Path, parse: Callable[[pd.Series], pd.Series]) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the persisted index of `file_path`, building and storing it if it is missing or stale."""
+
+        stat        = os.stat(file_path)
+        entry_path  = self._entry_path(file_path)
+
+        try:
+            with np.load(entry_path) as entry:
+                if int(entry['mtime_ns']) == stat.st_mtime_ns and int(entry['size']) == stat.st_size:
+                    return entry['times'], entry['offsets']
+
+        except (OSError, ValueError, KeyError):
+            pass
+
+        times, offsets = self.build(file_path, parse)
+        atomic_write(entry_path, lambda f: np.savez(f, times=times, offsets=offsets, mtime_ns=stat.st_mtime_ns, size=stat.st_size))
+
+        return times, offsets
+
+
+    ##################################
+    #   Range lookup
+    ##################################
+    def byte_range(self,
+                   file_path:   Path,
+                   start_date,
+                   end_date,
+                   parse:       Callable[[pd.Series], pd.Series]) -> Tuple[int, int]:
+        """Returns the [first, last) byte range of `file_path` that holds every line in [start_date, end_date]."""
+
+        times, offsets  = self.load(file_path, parse)
+        size            = os.path.getsize(file_path)
+
+        if len(times) == 0:
+            return 0, 0
+
+        first   = 0
+        last    = size
+
+        if start_date is not None:
+            k       = np.searchsorted(times, pd.Timestamp(start_date).value, side='left') - 1
+            first   = int(offsets[max(k, 0)])
+
+        if end_date is not None:
+            k       = np.searchsorted(times, pd.Timestamp(end_date).value, side='right')
+            last    = int(offsets[k]) if k < len(offsets) else size
+
+        return first, max(first, last)
@@ -0,0 +1,162 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the BatchResampler class, which resamples many irregular (timestamp, devicecount) series onto one shared, evenly spaced time grid.
+
+Sample times are converted from int64 nanoseconds to fractional grid cells relative to the grid start, so that the grid points are the integers 0 .. len(grid) - 1. For the kinds below, each series is trimmed to the samples around the grid and every grid point is mapped to the last sample at or before it with one `np.repeat` over the sample run lengths, so no `interp1d` object, `pd.date_range` or binary search is built per file.
+
+Supported kinds:
+- linear:   linear interpolation between the neighbouring samples
+- previous: the value of the last sample at or before the grid point (zero-order hold)
+- zero:     the value of the last sample inside the grid cell ending at the grid point, 0 if the cell holds no sample
+
+The other `interp1d` kinds ('nearest', 'nearest-up', 'next', 'slinear', 'quadratic', 'cubic') fall back to `scipy.interpolate.interp1d` over all the samples of the series, on the same grid cells.
+
+Grid points before the first or after the last sample of a series are NaN for every kind.
+
+"""
+
+from typing import List, Sequence
+import numpy as np
+import pandas as pd
+from scipy.interpolate import interp1d
+
+
+KINDS           = ('linear', 'previous', 'zero')
+INTERP1D_KINDS  = ('nearest', 'nearest-up', 'next', 'slinear', 'quadratic', 'cubic')
+
+
+def to_nanoseconds(times) -> np.ndarray:
+    """Returns datetime-like values as int64 nanoseconds since the epoch."""
+    return np.asarray(times).astype('datetime64[ns]', copy=False).view(np.int64)
+
+
+###############################################################################
+#
+#   Class: BatchResampler
+#
+###############################################################################
+
+class BatchResampler:
+
+    def __init__(
+        self,
+        grid        : pd.DatetimeIndex,
+        kind        : str   = 'linear'
+        ):
+
+        if kind not in KINDS + INTERP1D_KINDS:
+            raise ValueError(f"Unknown resampling kind '{kind}'. Expected one of {KINDS + INTERP1D_KINDS}.")
+
+        grid_ns = to_nanoseconds(grid)
+        steps   = np.diff(grid_ns)
+
+        if len(steps) and (steps != steps[0]).any():
+            raise ValueError("BatchResampler requires an evenly spaced grid.")
+
+        self.grid       =   pd.DatetimeIndex(grid)
+        self.kind       =   kind
+        self.origin     =   grid_ns[0] if len(grid_ns) else 0
+        self.step       =   steps[0]   if len(steps)   else 1
+        self.length     =   len(grid_ns)
+
+
+    @classmethod
+    def from_range(cls, start_date, end_date, sample_freq: str, kind: str = 'linear') -> "BatchResampler":
+        return cls(pd.date_range(start=start_date, end=end_date, freq=sample_freq), kind=kind)
+
+
+    def resample(self,
+                 times:     Sequence[np.ndarray],
+                 values:    Sequence[np.ndarray]    ) -> np.ndarray:
+        """
+        Resamples every (times[i], values[i]) series onto the grid.
+
+        Each `times[i]` must be sorted. Returns a float32 array of shape (len(times), len(grid)).
+        """
+
+        output = np.full((len(times), self.length), np.nan, dtype=np.float32)
+
+        if self.length == 0:
+            return output
+
+        for row, (t, v) in enumerate(zip(times, values)):
+            self._resample_into(to_nanoseconds(t), np.asarray(v, dtype=np.float64), output[row])
+
+        return output
+
+
+    def resample_series(self, times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Resamples a single series onto the grid."""
+        return self.resample([times], [values])[0]
+
+
+    def _resample_into(self, times: np.ndarray, values: np.ndarray, output: np.ndarray) -> None:
+        """Writes one resampled series into its NaN-filled `output` row."""
+
+        # Keep only the samples that can be a neighbour of a grid point: from the last sample at or before
+        # the grid start to the first sample at or after the grid end. The interp1d splines are not local, so they keep all
+        if self.kind in KINDS:
+            grid_end    = self.origin + self.step * (self.length - 1)
+            lo          = max(np.searchsorted(times, self.origin, side='right') - 1, 0)
+            hi          = np.searchsorted(times, grid_end, side='left') + 1
+            times       = times[lo:hi]
+            values      = values[lo:hi]
+
+        cells = (times - self.origin) / self.step
+
+        if len(cells) == 0:
+            return
+
+        # Only the grid points between the first and last sample are filled
+        first_cell  = int(np.clip(np.ceil(cells[0]),       0, self.length))
+        last_cell   = int(np.clip(np.floor(cells[-1]) + 1, 0, self.length))
+
+        if last_cell <= first_cell:
+            return
+
+        grid_cells  = np.arange(first_cell, last_cell, dtype=np.float64)
+
+        if self.kind not in KINDS:
+            output[first_cell:last_cell] = interp1d(cells, values, kind=self.kind, assume_sorted=True)(grid_cells)
+            return
+
+        # Grid point g lies in [ceil(c_k), ceil(c_k+1)) of the last sample k at or before it, so the
+        # sample left of every grid point is one `np.repeat` of the sample indices: no search per grid point
+        starts  = np.clip(np.ceil(cells), first_cell, last_cell).astype(np.int64)
+        left    = np.repeat(np.arange(len(cells)), np.diff(np.r_[starts, last_cell]))
+
+        if self.kind == 'linear':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slopes = np.r_[np.diff(values) / np.diff(cells), 0.0]
+
+            output[first_cell:last_cell] = values[left] + (grid_cells - cells[left]) * slopes[left]
+
+        else:
+            resampled = values[left]
+
+            if self.kind == 'zero':
+                resampled[cells[left] <= grid_cells - 1.0] = 0.0
+
+            output[first_cell:last_cell] = resampled
+
+
+def resample_frames(frames:         List[pd.DataFrame],
+                    grid:           pd.DatetimeIndex,
+                    kind:           str = 'linear',
+                    datetime:       str = 'datetime',
+                    devicecount:    str = 'devicecount') -> np.ndarray:
+    """Resamples a list of (datetime, devicecount) DataFrames onto `grid` in one batch."""
+
+    return BatchResampler(grid, kind=kind).resample([df[datetime].values  for df in frames],
+                                                    [df[devicecount].values for df in frames])
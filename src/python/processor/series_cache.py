@@ -0,0 +1,184 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the SeriesCache class, a persistent on-disk cache of interpolated building series.
+
+Each entry is a compressed NPZ file holding the `datetime` (int64 nanoseconds) and `devicecount` columns of one building on one network. Entries are keyed on:
+- The source file path, modification time, and size
+- The start and end date of the requested range
+- The sample frequency
+- The interpolation kind
+- Any further reader options that change the result (e.g. the read margin)
+
+A changed source file produces a new key, so stale entries are never read; they age out through the size-bounded LRU eviction instead.
+
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+from src.python.processor.atomic import atomic_write
+
+
+###############################################################################
+#
+#   Class: SeriesCache
+#
+###############################################################################
+
+class SeriesCache:
+
+    def __init__(
+        self,
+        cache_directory : Path  = Path.cwd().joinpath('data', 'output', 'interpolated-cache'),
+        max_bytes       : int   = 2 * 1024**3
+        ):
+
+        self.cache_directory    =   Path(cache_directory)
+        self.max_bytes          =   max_bytes
+        self.hits               =   0
+        self.misses             =   0
+        self.evictions          =   0
+
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+
+
+    ##################################
+    #   Keys
+    ##################################
+    def make_key(self,
+                 file_path:     Path,
+                 start_date:    datetime,
+                 end_date:      datetime,
+                 sample_freq:   str,
+                 kind:          str,
+                 **options               )  -> Optional[str]:
+        """Returns the cache key of a source file and request, or None if the file does not exist."""
+
+        try:
+            stat = os.stat(file_path)
+
+        except OSError:
+            return None
+
+        key_fields = {
+            'path':         str(Path(file_path).resolve()),
+            'mtime_ns':     stat.st_mtime_ns,
+            'size':         stat.st_size,
+            'start_date':   pd.Timestamp(start_date).isoformat() if start_date is not None else None,
+            'end_date':     pd.Timestamp(end_date).isoformat()   if end_date   is not None else None,
+            'sample_freq':  sample_freq,
+            'kind':         kind,
+            **{name: str(value) for name, value in options.items()}
+            }
+
+        return hashlib.sha1(json.dumps(key_fields, sort_keys=True).encode()).hexdigest()
+
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_directory.joinpath(f"{key}.npz")
+
+
+    ##################################
+    #   Load and store
+    ##################################
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """Returns the cached DataFrame for `key`, or None on a miss."""
+
+        entry_path = self._entry_path(key) if key else None
+
+        if entry_path is None or not entry_path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            with np.load(entry_path) as entry:
+                data = pd.DataFrame({'datetime':     pd.to_datetime(entry['datetime']),
+                                     'devicecount':  entry['devicecount']
+                                     })
+
+        except (OSError, ValueError, KeyError):
+            # Corrupt or partially written entry: drop it and recompute
+            entry_path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # Touch the entry so the eviction policy sees it as recently used
+        os.utime(entry_path)
+        self.hits += 1
+
+        return data
+
+
+    def store(self, key: str, data: pd.DataFrame) -> None:
+        """Writes `data` (columns `datetime` and `devicecount`) to the cache under `key`."""
+
+        if key is None:
+            return
+
+        atomic_write(self._entry_path(key),
+                     lambda f: np.savez_compressed(f,
+                                                   datetime    = data['datetime'].values.astype('datetime64[ns]').astype(np.int64),
+                                                   devicecount = data['devicecount'].to_numpy()
+                                                   ))
+
+
+    ##################################
+    #   LRU eviction
+    ##################################
+    def evict(self) -> int:
+        """Deletes the least recently used entries until the cache fits in `max_bytes`."""
+
+        entries     = [(p, p.stat()) for p in self.cache_directory.glob('*.npz')]
+        total_bytes = sum(stat.st_size for _, stat in entries)
+        evicted     = 0
+
+        for entry_path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime_ns):
+            if total_bytes <= self.max_bytes:
+                break
+
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= stat.st_size
+            evicted     += 1
+
+        self.evictions += evicted
+
+        return evicted
+
+
+    def clear(self) -> None:
+        for entry_path in self.cache_directory.glob('*.npz'):
+            entry_path.unlink(missing_ok=True)
+
+
+    ##################################
+    #   Statistics
+    ##################################
+    def stats(self) -> Dict[str, float]:
+
+        entries = list(self.cache_directory.glob('*.npz'))
+        lookups = self.hits + self.misses
+
+        return {'hits':         self.hits,
+                'misses':       self.misses,
+                'hit_rate':     self.hits / lookups if lookups else 0.0,
+                'evictions':    self.evictions,
+                'entries':      len(entries),
+                'bytes':        sum(p.stat().st_size for p in entries)
+                }
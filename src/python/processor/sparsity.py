@@ -1,4 +1,4 @@
-
+from typing import Dict, List, Sequence, Tuple
 import numpy as np
 import pandas as pd
 
@@ -10,17 +10,97 @@ import pandas as pd
 ####################################################################################
 
 class SparsityCalculator:
-    
+
     def calculate_sparsity( self, data:pd.DataFrame  )  ->  pd.DataFrame:
-        """Calculates the sparsity of the data."""
-        
-        total_elements  = data.size
-        zero_elements   = total_elements - np.count_nonzero(data)
-        sparsity        = zero_elements  / float(total_elements)
-        
+        """Calculates the sparsity of the data (the devicecount column only, not the datetime column)."""
+
+        values          = data.drop(columns='datetime', errors='ignore')
+        total_elements  = values.size
+        zero_elements   = total_elements - np.count_nonzero(values)
+        sparsity        = zero_elements  / float(total_elements) if total_elements else np.nan
+
         sparsity_info = pd.DataFrame({'total_elements'   : [    total_elements  ],
                                       'zero_elements'    : [    zero_elements   ],
                                       'sparsity'         : [    sparsity        ]
                                       })
-        
-        return sparsity_info
\ No newline at end of file
+
+        return sparsity_info
+
+
+    ##################################
+    #   Batched statistics
+    ##################################
+    def calculate_table( self,
+                         values:    np.ndarray,
+                         labels:    Sequence[Tuple[str, str]],
+                         step:      pd.Timedelta   )  ->  pd.DataFrame:
+        """
+        Calculates the sparsity of every row of a (series x time) array in one pass.
+
+        NaN grid points (outside a series' span or between networks) are counted as missing,
+        not as zero. A zero run is a maximal stretch of consecutive zero grid points; its
+        duration is its length times `step`. Returns one row per (network, building) label.
+        """
+
+        values          = np.atleast_2d(values)
+        n_series        = values.shape[0]
+        missing         = np.isnan(values)
+        zeros           = values == 0
+
+        # Zero runs: +1 where a run starts and -1 one past where it ends, row by row
+        padded          = np.zeros((n_series, values.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = zeros
+        edges           = np.diff(padded, axis=1)
+        starts          = np.flatnonzero(edges ==  1)
+        ends            = np.flatnonzero(edges == -1)
+        run_rows        = starts // edges.shape[1]
+        run_lengths     = ends - starts
+
+        zero_runs       = np.bincount(run_rows, minlength=n_series)
+        longest_run     = np.zeros(n_series, dtype=np.int64)
+        np.maximum.at(longest_run, run_rows, run_lengths)
+
+        total_elements  = values.shape[1] - missing.sum(axis=1)
+        zero_elements   = zeros.sum(axis=1)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sparsity    = zero_elements / total_elements
+            mean_run    = np.bincount(run_rows, weights=run_lengths, minlength=n_series) / zero_runs
+
+        return pd.DataFrame({'total_elements':      total_elements,
+                             'zero_elements':       zero_elements,
+                             'missing_elements':    missing.sum(axis=1),
+                             'sparsity':            sparsity,
+                             'zero_runs':           zero_runs,
+                             'mean_zero_run':       pd.to_timedelta(mean_run * step.value, unit='ns'),
+                             'longest_zero_run':    pd.to_timedelta(longest_run * step.value, unit='ns')
+                             },
+                            index=pd.MultiIndex.from_tuples(list(labels), names=['network', 'building']))
+
+
+    def calculate_report_gaps( self,
+                               times:       List[np.ndarray],
+                               threshold:   pd.Timedelta   )  ->  pd.DataFrame:
+        """
+        Calculates the missing-report gaps of raw timestamp series in one pass.
+
+        A gap is an interval between consecutive reports longer than `threshold`. Returns one
+        row per series with the number of gaps, the longest gap, and the total time in gaps.
+        """
+
+        times       = [np.asarray(t).astype('datetime64[ns]').view(np.int64) for t in times]
+        lengths     = np.array([max(len(t) - 1, 0) for t in times], dtype=np.int64)
+        intervals   = np.concatenate([np.diff(t) for t in times]) if lengths.sum() else np.zeros(0, dtype=np.int64)
+        series_id   = np.repeat(np.arange(len(times)), lengths)
+        is_gap      = intervals > threshold.value
+
+        gap_count   = np.bincount(series_id[is_gap], minlength=len(times))
+        gap_time    = np.bincount(series_id[is_gap], weights=intervals[is_gap], minlength=len(times))
+        longest_gap = np.zeros(len(times), dtype=np.int64)
+        np.maximum.at(longest_gap, series_id[is_gap], intervals[is_gap])
+
+        return pd.DataFrame({'reports':         [len(t) for t in times],
+                             'report_gaps':     gap_count,
+                             'longest_gap':     pd.to_timedelta(longest_gap, unit='ns'),
+                             'gap_time':        pd.to_timedelta(gap_time.astype(np.int64), unit='ns')
+                             })
@@ -1,6 +1,16 @@
 
 
-from src.python.processor.data_processor import DataReader, BuildingProcessor
+import copy
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import interp1d
+
+from src.python.processor.data_processor import DataReader, BuildingProcessor, HAS_PYARROW
+from src.python.processor.resampler import BatchResampler
 
 import matplotlib.pyplot as plt
 
@@ -12,28 +22,182 @@ import matplotlib.pyplot as plt
 ####################################################################################
 
 class SpeedTest:
-    def __init__(self,cpu_cores,sample_freqs):
+    """
+    Times `process_tensor` over a range of core counts, for two schedules:
+    - per-network:  one barrier per network directory, as `process_directories` used to run
+    - flattened:    one largest-file-first queue over all (network, building) pairs
+    
+    The cache is disabled so that every run reads and interpolates every file.
+    """
+    
+    def __init__(self,cpu_cores,sample_freqs,schedules=('per-network', 'flattened')):
         self.cpu_cores = cpu_cores
         self.sample_freqs = sample_freqs
-        self.time_results = {freq: [] for freq in self.sample_freqs}
+        self.schedules = schedules
+        self.time_results = {(freq, schedule): [] for freq in self.sample_freqs for schedule in self.schedules}
+
+    def _run_schedule(self, processor, schedule):
+        start_time = time.perf_counter()
+        
+        if schedule == 'per-network':
+            for directory in processor.directories:
+                network_processor = copy.copy(processor)
+                network_processor.directories = [directory]
+                network_processor.process_tensor()
+        else:
+            processor.process_tensor()
+            
+        return np.round(time.perf_counter() - start_time, 3)
 
     def run(self):
         for freq in self.sample_freqs:
             print(f'\nProcessing all buildings for sample frequency:\t {freq}\n')
             for cores in self.cpu_cores:
                 data_reader = DataReader(sample_freq=freq)
-                processor   = BuildingProcessor(data_reader,record_time=True,cpu_cores=cores)
+                processor   = BuildingProcessor(data_reader,cpu_cores=cores,use_cache=False)
                 
-                time_result = processor.process_all_buildings()
-                self.time_results[freq].append(time_result)
+                for schedule in self.schedules:
+                    time_result = self._run_schedule(processor, schedule)
+                    self.time_results[(freq, schedule)].append(time_result)
+                    print(f"\t{cores} cores, {schedule}:\t{time_result} seconds")
 
     def plot_results(self):
         plt.figure(figsize=(10, 6))
         
-        for freq, results in self.time_results.items():
-            plt.plot(self.cpu_cores,results,label=f'Sample Frequency: {freq}')
+        for (freq, schedule), results in self.time_results.items():
+            plt.plot(self.cpu_cores,results,label=f'Sample Frequency: {freq} ({schedule})')
         plt.xlabel('Number of CPU Cores')
         plt.ylabel('Time to Process Data (s)')
         plt.title('Processing Time vs Number of CPU Cores for Different Sample Frequencies')
         plt.legend()
-        plt.show()
\ No newline at end of file
+        plt.show()
+
+
+####################################################################################
+#
+#   Class: ResamplerSpeedTest
+#
+####################################################################################
+
+class ResamplerSpeedTest:
+    """Times the per-building `interp1d` path against the BatchResampler on synthetic irregular series."""
+    
+    def __init__(self, sample_freqs=('1Min', '5Min', '0.1Min'), n_series=240, n_rows=20000, seed=0):
+        self.sample_freqs   = sample_freqs
+        self.n_series       = n_series
+        self.n_rows         = n_rows
+        self.rng            = np.random.default_rng(seed)
+        self.time_results   = {freq: {} for freq in self.sample_freqs}
+
+    def _synthetic_series(self):
+        start   = np.datetime64('2019-08-16T00:00:00', 'ns')
+        times   = [start + np.cumsum(self.rng.integers(60, 600, self.n_rows)).astype('timedelta64[s]') for _ in range(self.n_series)]
+        values  = [self.rng.integers(0, 500, self.n_rows).astype(np.float64) for _ in range(self.n_series)]
+        return times, values
+
+    def _grid(self, times, freq):
+        start   = pd.Timestamp(min(t[0] for t in times)).ceil(freq)
+        end     = max(t[-1] for t in times)
+        return pd.date_range(start=start, end=end, freq=freq)
+
+    def _interp1d_path(self, times, values, freq):
+        # One interp1d and one date_range per building, as in the original DataReader,
+        # then stacked on the shared grid like BuildingTensor does
+        grid    = self._grid(times, freq)
+        stacked = np.full((len(times), len(grid)), np.nan, dtype=np.float32)
+        
+        for i, (t, v) in enumerate(zip(times, values)):
+            interpolation_range = pd.date_range(start=pd.Timestamp(t[0]).ceil(freq), end=t[-1], freq=freq)
+            f                   = interp1d(t.astype(np.int64).astype(float), v, kind='linear')
+            interpolated_df     = pd.DataFrame(f(interpolation_range.values.astype(np.int64).astype(float)), index=interpolation_range)
+            first               = grid.get_loc(interpolated_df.index[0])
+            stacked[i, first:first + len(interpolated_df)] = interpolated_df[0].values
+
+    def _batch_path(self, times, values, freq):
+        BatchResampler(self._grid(times, freq)).resample(times, values)
+
+    def run(self):
+        times, values = self._synthetic_series()
+        
+        for freq in self.sample_freqs:
+            print(f'\nResampling {self.n_series} series of {self.n_rows} rows at sample frequency:\t {freq}\n')
+            
+            for name, path in [('interp1d', self._interp1d_path), ('batch', self._batch_path)]:
+                start_time = time.perf_counter()
+                path(times, values, freq)
+                self.time_results[freq][name] = np.round(time.perf_counter() - start_time, 3)
+                print(f"\t{name}:\t{self.time_results[freq][name]} seconds")
+
+    def plot_results(self):
+        plt.figure(figsize=(10, 6))
+        
+        x       = np.arange(len(self.sample_freqs))
+        width   = 0.35
+        for offset, name in [(-width / 2, 'interp1d'), (width / 2, 'batch')]:
+            plt.bar(x + offset, [self.time_results[freq][name] for freq in self.sample_freqs], width, label=name)
+        plt.xticks(x, self.sample_freqs)
+        plt.xlabel('Sample Frequency')
+        plt.ylabel('Time to Resample (s)')
+        plt.title('Per-building interp1d vs. Batched Resampling')
+        plt.legend()
+        plt.show()
+
+
+####################################################################################
+#
+#   Class: ReaderSpeedTest
+#
+####################################################################################
+
+class ReaderSpeedTest:
+    """Times the original CSV reader against the fast ingestion path on one WiFi report file."""
+    
+    def __init__(self, file_path=None, n_rows=2_000_000, start_date=None, end_date=None, repeats=3, seed=0):
+        self.file_path      = Path(file_path) if file_path else None
+        self.n_rows         = n_rows
+        self.start_date     = start_date
+        self.end_date       = end_date
+        self.repeats        = repeats
+        self.rng            = np.random.default_rng(seed)
+        self.time_results   = {}
+
+    def _write_synthetic_file(self, directory):
+        times   = pd.Timestamp('2019-08-16') + pd.to_timedelta(np.cumsum(self.rng.integers(60, 600, self.n_rows)), unit='s')
+        counts  = self.rng.integers(0, 500, self.n_rows)
+        path    = Path(directory).joinpath('SYNTH_Extracted_Data_8-16-2019.csv')
+        pd.DataFrame({'datetime': times.strftime('%Y-%m-%d %H:%M:%S'), 'devicecount': counts}).to_csv(path, header=False, index=False)
+        return path
+
+    def _time_reader(self, data_reader):
+        best = np.inf
+        
+        for _ in range(self.repeats):
+            start_time  = time.perf_counter()
+            data_reader.read_time_series_data()
+            best        = min(best, time.perf_counter() - start_time)
+            
+        return np.round(best, 3)
+
+    def run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path   = self.file_path or self._write_synthetic_file(directory)
+            engines     = {'original': None, 'fast (c)': 'c'}
+            
+            if HAS_PYARROW:
+                engines['fast (pyarrow)'] = 'pyarrow'
+            
+            for name, engine in engines.items():
+                data_reader = DataReader(file_path=file_path, start_date=self.start_date, end_date=self.end_date, fast_read=engine is not None)
+                
+                if engine is not None:
+                    data_reader.read_engine = engine
+                    
+                self.time_results[name] = self._time_reader(data_reader)
+                print(f"{name}:\t{self.time_results[name]} seconds")
+
+    def plot_results(self):
+        plt.figure(figsize=(10, 6))
+        plt.bar(list(self.time_results.keys()), list(self.time_results.values()))
+        plt.ylabel('Time to Read File (s)')
+        plt.title('CSV Ingestion: Original vs. Fast Reader')
+        plt.show()
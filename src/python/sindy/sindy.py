@@ -0,0 +1,289 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the Sparse Identification of Nonlinear Dynamics (SINDy) of every building series at once.
+
+Every series x(t) (one per network and building of a BuildingTensor) is modeled as dx/dt = Theta(x, t) xi with a sparse xi. The candidate library Theta has:
+- polynomial terms of the series: 1, x, x^2, ..., x^degree
+- Fourier terms of the time grid: sin and cos of the daily and weekly harmonics
+
+The Fourier block depends only on the time grid, so it and its Gram matrix are built once per grid (`CandidateLibrary`). The polynomial block is built for all series in one broadcast. The derivatives of all series are one Savitzky-Golay (or central difference) pass along the time axis.
+
+The regression is sequentially thresholded least squares (STLSQ) on the normal equations: the (term x term) Gram matrix and the right-hand side of every series are assembled once (in parallel over blocks of series, on the persistent `worker_pool`) and cached, and each STLSQ iteration is one batched `np.linalg.solve` over all series, with the inactive terms masked out. A threshold sweep therefore reuses the cached Gram matrices and costs only small solves; the residuals come from the same cache.
+
+Each series is scaled by its maximum (and time is in days), so the thresholds apply to comparable coefficients.
+
+"""
+
+import multiprocessing
+from typing import List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from joblib import delayed
+from scipy.signal import savgol_filter
+
+from src.python.processor.building_tensor import BuildingTensor
+from src.python.processor.data_processor import worker_pool
+
+
+DAY     = pd.Timedelta(days=1)
+WEEK    = pd.Timedelta(days=7)
+
+
+###############################################################################
+#
+#   Class: CandidateLibrary
+#
+###############################################################################
+
+class CandidateLibrary:
+
+    def __init__(
+        self,
+        degree              : int   = 3,
+        daily_harmonics     : int   = 3,
+        weekly_harmonics    : int   = 1
+        ):
+
+        self.degree             =   degree
+        self.daily_harmonics    =   daily_harmonics
+        self.weekly_harmonics   =   weekly_harmonics
+        self._fourier           =   {}
+
+
+    @property
+    def names(self) -> List[str]:
+
+        names = ['1'] + [f"x^{p}" if p > 1 else 'x' for p in range(1, self.degree + 1)]
+
+        for period, harmonics in (('day', self.daily_harmonics), ('week', self.weekly_harmonics)):
+            for n in range(1, harmonics + 1):
+                names += [f"sin({n}/{period})", f"cos({n}/{period})"]
+
+        return names
+
+
+    @property
+    def n_polynomial(self) -> int:
+        return self.degree + 1
+
+
+    def polynomial(self, values: np.ndarray) -> np.ndarray:
+        """(series x time x degree + 1) powers 0..degree of the (series x time) `values`."""
+        return values[..., None] ** np.arange(self.degree + 1)
+
+
+    def fourier(self, index: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+        """(time x terms) Fourier block of the grid and its Gram matrix, built once per grid."""
+
+        key = (index[0], index[-1], len(index)) if len(index) else None
+
+        if key not in self._fourier:
+            elapsed = ((index - index[0]) / DAY).to_numpy(dtype=np.float64)
+            columns = []
+
+            for period, harmonics in ((1.0, self.daily_harmonics), (WEEK / DAY, self.weekly_harmonics)):
+                for n in range(1, harmonics + 1):
+                    angle   = 2 * np.pi * n * elapsed / period
+                    columns += [np.sin(angle), np.cos(angle)]
+
+            block               = np.stack(columns, axis=1) if columns else np.zeros((len(index), 0))
+            self._fourier[key]  = (block, block.T @ block)
+
+        return self._fourier[key]
+
+
+def derivatives(values: np.ndarray, step: float, method: str = 'savgol', window: int = 31, order: int = 3) -> np.ndarray:
+    """dx/dt of every row of the (series x time) `values`, with time steps of `step`, in one pass along the time axis."""
+
+    if method == 'savgol' and values.shape[-1] > window:
+        return savgol_filter(values, window, order, deriv=1, delta=step, axis=-1, mode='nearest')
+
+    if method in ('savgol', 'central'):
+        return np.gradient(values, step, axis=-1)
+
+    raise ValueError(f"Unknown derivative method: {method}")
+
+
+def _assemble(values: np.ndarray, rates: np.ndarray, fourier: np.ndarray, fourier_gram: np.ndarray, library: CandidateLibrary) -> Tuple:
+    """
+    Worker: the Gram matrices, right-hand sides and rate norms of a block of series. Rows where the
+    series or its rate is NaN are left out; the shared Fourier Gram is corrected for them.
+    """
+
+    valid       = ~(np.isnan(values) | np.isnan(rates))
+    values      = np.where(valid, values, 0)
+    rates       = np.where(valid, rates,  0)
+    poly        = library.polynomial(values) * valid[..., None]
+
+    n_series    = values.shape[0]
+    n_poly      = poly.shape[2]
+    n_terms     = n_poly + fourier.shape[1]
+    grams       = np.empty((n_series, n_terms, n_terms))
+    rhs         = np.empty((n_series, n_terms))
+
+    grams[:, :n_poly, :n_poly]  = np.einsum('stp,stq->spq', poly, poly)
+    grams[:, :n_poly, n_poly:]  = np.einsum('stp,tf->spf', poly, fourier)
+    grams[:, n_poly:, :n_poly]  = grams[:, :n_poly, n_poly:].transpose(0, 2, 1)
+    grams[:, n_poly:, n_poly:]  = fourier_gram
+
+    # Remove the Fourier rows of the (few) invalid grid points from the shared Gram
+    for s in np.flatnonzero(~valid.all(axis=1)):
+        invalid                     = fourier[~valid[s]]
+        grams[s, n_poly:, n_poly:] -= invalid.T @ invalid
+
+    rhs[:, :n_poly] = np.einsum('stp,st->sp', poly, rates)
+    rhs[:, n_poly:] = rates @ fourier
+
+    return grams, rhs, np.einsum('st,st->s', rates, rates), valid.sum(axis=1)
+
+
+def stlsq(grams: np.ndarray, rhs: np.ndarray, threshold: float, ridge: float = 1e-6, max_iter: int = 10) -> np.ndarray:
+    """
+    Sequentially thresholded least squares for all series at once from their normal equations.
+    Inactive terms are masked out of every system, so one batched solve serves all series per iteration.
+    """
+
+    n_series, n_terms   = rhs.shape
+    active              = np.ones((n_series, n_terms), dtype=bool)
+    identity            = np.eye(n_terms)
+    coefficients        = np.zeros((n_series, n_terms))
+
+    for _ in range(max_iter):
+        mask            = active[:, :, None] & active[:, None, :]
+        systems         = np.where(mask, grams, 0) + identity * np.where(active, ridge, 1.0)[:, None, :]
+        coefficients    = np.linalg.solve(systems, np.where(active, rhs, 0)[..., None])[..., 0]
+        updated         = active & (np.abs(coefficients) >= threshold)
+
+        if (updated == active).all():
+            break
+
+        active = updated
+
+    return np.where(active, coefficients, 0)
+
+
+###############################################################################
+#
+#   Class: SINDy
+#
+###############################################################################
+
+class SINDy:
+
+    def __init__(
+        self,
+        library     : CandidateLibrary  = None,
+        threshold   : float = 0.05,
+        ridge       : float = 1e-6,
+        max_iter    : int   = 10,
+        derivative  : str   = 'savgol',
+        window      : int   = 31,
+        block_size  : int   = 16,
+        cpu_cores   : int   = multiprocessing.cpu_count()
+        ):
+
+        self.library        =   library or CandidateLibrary()
+        self.threshold      =   threshold
+        self.ridge          =   ridge
+        self.max_iter       =   max_iter
+        self.derivative     =   derivative
+        self.window         =   window
+        self.block_size     =   block_size
+        self.cpu_cores      =   cpu_cores
+        self.labels         =   None
+        self.scales         =   None
+        self.grams          =   None
+        self.rhs            =   None
+        self.rate_norms     =   None
+        self.counts         =   None
+
+
+    ##################################
+    #   Inputs
+    ##################################
+    @staticmethod
+    def from_tensor(tensor: BuildingTensor) -> Tuple[np.ndarray, pd.DatetimeIndex, List[Tuple[str, str]]]:
+        """(series x time) values of every (network, building) series with data, and their labels."""
+
+        present = tensor.present
+        labels  = [(tensor.networks[i], tensor.buildings[j]) for i, j in zip(*np.nonzero(present))]
+
+        return tensor.values[present], tensor.index, labels
+
+
+    def prepare(self, values: np.ndarray, index: pd.DatetimeIndex, labels: Sequence = None) -> 'SINDy':
+        """Builds and caches the Gram matrices of all series; `fit` and `sweep` reuse them."""
+
+        values          = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        scales          = np.nanmax(np.abs(values), axis=1)
+        scales          = np.where(np.isfinite(scales) & (scales > 0), scales, 1.0)
+        values          = values / scales[:, None]
+        step            = (index[1] - index[0]) / DAY if len(index) > 1 else 1.0
+        rates           = derivatives(values, step, self.derivative, self.window)
+        fourier, gram   = self.library.fourier(index)
+
+        blocks          = range(0, len(values), self.block_size)
+        parts           = worker_pool(self.cpu_cores)(
+                              delayed(_assemble)(values[b:b + self.block_size], rates[b:b + self.block_size], fourier, gram, self.library)
+                              for b in blocks)
+
+        self.grams, self.rhs, self.rate_norms, self.counts = (np.concatenate(part) for part in zip(*parts))
+        self.labels = list(labels) if labels is not None else list(range(len(values)))
+        self.scales = scales
+
+        return self
+
+
+    ##################################
+    #   Regression
+    ##################################
+    def fit(self, threshold: float = None) -> pd.DataFrame:
+        """The (series x term) sparse coefficients of the prepared series."""
+
+        if self.grams is None:
+            raise RuntimeError("Call `prepare` before `fit`.")
+
+        coefficients = stlsq(self.grams, self.rhs, self.threshold if threshold is None else threshold, self.ridge, self.max_iter)
+        return pd.DataFrame(coefficients, index=self._index(), columns=self.library.names)
+
+
+    def residuals(self, coefficients: np.ndarray) -> np.ndarray:
+        """Root-mean-square residual of every series, ||dx/dt - Theta xi|| from the cached normal equations."""
+
+        coefficients    = np.asarray(coefficients)
+        squared         = self.rate_norms - 2 * np.einsum('sm,sm->s', coefficients, self.rhs) \
+                          + np.einsum('sm,smn,sn->s', coefficients, self.grams, coefficients)
+
+        return np.sqrt(np.maximum(squared, 0) / np.maximum(self.counts, 1))
+
+
+    def sweep(self, thresholds: Sequence[float]) -> pd.DataFrame:
+        """The number of active terms and the mean residual for every threshold, on the cached Gram matrices."""
+
+        rows = []
+
+        for threshold in thresholds:
+            coefficients = stlsq(self.grams, self.rhs, threshold, self.ridge, self.max_iter)
+            rows.append({'threshold':       threshold,
+                         'active_terms':    float((coefficients != 0).sum(axis=1).mean()),
+                         'rms_residual':    float(self.residuals(coefficients).mean())})
+
+        return pd.DataFrame(rows).set_index('threshold')
+
+
+    def _index(self):
+        if self.labels and isinstance(self.labels[0], tuple):
+            return pd.MultiIndex.from_tuples(self.labels, names=['network', 'building'])
+
+        return pd.Index(self.labels)
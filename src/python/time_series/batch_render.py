@@ -0,0 +1,178 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the BatchRenderer class, which renders the per-building atlas of several DataVisualizer configurations (e.g. `Config1` - `Config10`) in parallel.
+
+The parent process prepares the compact arrays of every (building, config) pair with `DataVisualizer.prepare_single`; the workers only draw and save them with the Agg backend, so the DataFetcher results are never sent to the workers. A figure is skipped when its PNG exists and the hash of its inputs (data arrays, configuration and events) matches the one recorded in the render manifest.
+
+"""
+
+import os
+import json
+import hashlib
+import multiprocessing
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from joblib import delayed
+
+import data.input.events.event_dict as ev
+from src.python.processor.atomic import atomic_write
+from src.python.processor.data_processor import worker_pool
+from src.python.time_series.event_plotting import DataVisualizer
+from src.python.time_series.event_store import EventStore
+
+
+def _render_single(config: dict, payload: dict, events: dict) -> str:
+    """Draws and saves one building figure with the Agg backend. Returns the file path."""
+
+    plt.switch_backend('Agg')
+
+    visualizer              = DataVisualizer(None, {**config, 'SHOW_PLOT': False})
+    start_date, end_date    = visualizer.draw_single(payload, events)
+    folder_path             = visualizer.plot_saver.save_plot(payload['building'], start_date, end_date)
+
+    plt.close('all')
+
+    return os.path.join(folder_path, f"{payload['building']}.png") if folder_path else None
+
+
+###############################################################################
+#
+#   Class: BatchRenderer
+#
+###############################################################################
+
+class BatchRenderer:
+
+    def __init__(
+        self,
+        visualizers     : Dict[str, DataVisualizer],
+        cpu_cores       : int   = multiprocessing.cpu_count(),
+        manifest_path   : str   = None,
+        events                  = ev.events
+        ):
+
+        first_config            =   next(iter(visualizers.values())).config
+
+        self.visualizers        =   visualizers
+        self.cpu_cores          =   cpu_cores
+        self.manifest_path      =   manifest_path or first_config['RENDER_MANIFEST']
+        self.events             =   events
+        self.manifest           =   self._load_manifest()
+
+
+    ##################################
+    #   Manifest
+    ##################################
+    def _load_manifest(self) -> Dict[str, str]:
+
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+
+        except (OSError, ValueError):
+            return {}
+
+
+    def _save_manifest(self) -> None:
+
+        atomic_write(self.manifest_path, lambda f: json.dump(self.manifest, f, indent=4, sort_keys=True), mode='w')
+
+
+    def _input_hash(self, config: dict, payload: dict) -> str:
+        """Hashes the data arrays, the configuration and the events of one figure."""
+
+        events = self.events.to_frame().to_dict('list') if isinstance(self.events, EventStore) else self.events
+        digest = hashlib.sha1()
+        digest.update(json.dumps({'config':     config,
+                                  'events':     events,
+                                  'building':   payload['building'],
+                                  'networks':   payload['networks'],
+                                  'max_ys':     [float(max_y) for max_y in payload['max_ys']]
+                                  }, sort_keys=True, default=str).encode())
+
+        for times, values in zip(payload['times'], payload['values']):
+            digest.update(np.ascontiguousarray(times).tobytes())
+            digest.update(np.ascontiguousarray(values).tobytes())
+
+        return digest.hexdigest()
+
+
+    def _output_path(self, visualizer: DataVisualizer, payload: dict) -> str:
+        """The PNG path that `PlotSaver.save_plot` writes for this payload."""
+
+        start_date  = pd.Timestamp(payload['times'][0][ 0]).strftime('%b-%d-%Y')
+        end_date    = pd.Timestamp(payload['times'][0][-1]).strftime('%b-%d-%Y')
+        folder_path = visualizer.plot_saver.folder_path(payload['building'], start_date, end_date)
+
+        return os.path.join(folder_path, f"{payload['building']}.png")
+
+
+    ##################################
+    #   Rendering
+    ##################################
+    def buildings(self) -> List[str]:
+        """All buildings with data on any network of any visualizer."""
+
+        buildings = {}
+
+        for visualizer in self.visualizers.values():
+            for network in visualizer.NETWORKS:
+                buildings.update(dict.fromkeys(visualizer.data_fetcher.data.get(network, {})))
+
+        return list(buildings)
+
+
+    def render(self, buildings: List[str] = None) -> Dict[str, List[str]]:
+        """
+        Renders every (building, config) figure whose inputs changed since the last render.
+        Returns the 'rendered' and 'skipped' file paths.
+        """
+
+        buildings   = buildings if buildings is not None else self.buildings()
+        tasks       = []
+        paths       = []
+        hashes      = []
+        skipped     = []
+
+        for config_name, visualizer in self.visualizers.items():
+            for building in buildings:
+                payload = visualizer.prepare_single(building)
+
+                if payload is None:
+                    continue
+
+                output_path = self._output_path(visualizer, payload)
+                input_hash  = self._input_hash(visualizer.config, payload)
+
+                if self.manifest.get(output_path) == input_hash and os.path.exists(output_path):
+                    skipped.append(output_path)
+                    continue
+
+                tasks.append(delayed(_render_single)(visualizer.config, payload, self.events))
+                paths.append(output_path)
+                hashes.append(input_hash)
+
+        rendered = worker_pool(self.cpu_cores)(tasks)
+
+        for output_path, input_hash, file_path in zip(paths, hashes, rendered):
+            if file_path is not None:
+                self.manifest[output_path] = input_hash
+
+        self._save_manifest()
+
+        print(f"Rendered {sum(path is not None for path in rendered)} figures, skipped {len(skipped)} unchanged.")
+
+        return {'rendered': [path for path in rendered if path is not None], 'skipped': skipped}
@@ -18,6 +18,8 @@ from datetime import datetime
 from src.python.processor.data_processor import DataReader, BuildingProcessor
 from src.python.processor.config_manager import ConfigManager
 from src.python.time_series.event_plotting import DataVisualizer, CampusPlotter
+from src.python.time_series.plot_builder import DataFetcher
+from src.python.time_series.batch_render import BatchRenderer
 
 
 class VisualizerCreator:
@@ -36,8 +38,9 @@ class VisualizerCreator:
         An instance of ConfigManager
     data_reader : DataReader
         An instance of DataReader
-    data_processor : BuildingProcessor
-        An instance of BuildingProcessor
+    data_fetcher : DataFetcher
+        The lazily evaluated campus data, processed once on first access and
+        shared by every DataVisualizer and CampusPlotter
 
     Methods
     -------
@@ -47,6 +50,8 @@ class VisualizerCreator:
         Returns a dictionary of DataVisualizer instances for the given configuration names.
     create_campus_plotter():
         Returns a CampusPlotter instance.
+    create_batch_renderer(cpu_cores):
+        Returns a BatchRenderer over all time-series configurations.
     """
 
 
@@ -60,6 +65,7 @@ class VisualizerCreator:
             "Config1", "Config2", "Config3", "Config4","Config5", "Config6", "Config7", "Config8","Config9", "Config10"
             ]
         self.campus_configs     = [ "campus-plotter1", "campus-plotter2", "normalized-campus-plotter" ]
+        self.data_fetcher       = DataFetcher( self.create_processor() )
 
 
     def create_processor(self):
@@ -71,7 +77,7 @@ class VisualizerCreator:
     def create_visualizer(self, config_name):
         """Returns a DataVisualizer instance for the given configuration name."""
         config = self.config_manager.get_configuration(config_name)
-        return DataVisualizer(self.create_processor(), config)
+        return DataVisualizer(self.data_fetcher.data_processor, config, self.data_fetcher)
 
 
     def create_visualizers(self):
@@ -81,7 +87,7 @@ class VisualizerCreator:
 
     def create_campus_plotter(self, config_name):
         """Returns a CampusPlotter instance with and without normalization."""
-        data    = self.create_processor().process_all_buildings()["Campus"]
+        data    = self.data_fetcher.campus_data()
         config  = self.config_manager.get_configuration(config_name)
         return CampusPlotter(data, config)
     
@@ -90,3 +96,8 @@ class VisualizerCreator:
         """Returns a dictionary of DataVisualizer instances for the given configuration names."""
         return {config: self.create_campus_plotter(config) for config in  self.campus_configs}
 
+
+    def create_batch_renderer(self, cpu_cores=None):
+        """Returns a BatchRenderer that renders every building for all time-series configurations in parallel."""
+        visualizers = self.create_visualizers()
+        return BatchRenderer(visualizers, cpu_cores=cpu_cores) if cpu_cores else BatchRenderer(visualizers)
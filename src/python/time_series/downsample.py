@@ -0,0 +1,151 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the downsampling used before a time series is handed to matplotlib.
+
+A minute-level series of a few years has about 1M points, far more than the few thousand pixel columns of an axis. Two algorithms reduce it to roughly the pixel width of the axis without visible change:
+
+- M4: for each pixel column, the first, last, minimum and maximum point. The line drawn through them covers exactly the pixels of the full line, so spikes and dips are never lost. Fully vectorized.
+- LTTB (Largest-Triangle-Three-Buckets): one point per bucket, chosen to maximize the triangle it forms with the previously chosen point and the average of the next bucket. Fewer points than M4 for a similar shape; the bucket averages and areas are vectorized, the choice is a loop over the buckets (not the points).
+
+Both return the sorted indices of the points to keep, so the caller can slice its DataFrame. The series are NaN outside their span and at gaps: the extremes and the LTTB buckets come from the finite points only, and the first NaN of every gap is kept as well, so matplotlib breaks the line at the gap instead of joining the points on either side. The algorithm is chosen with the `DOWNSAMPLE` key of `config.json` ("m4", "lttb" or null to plot every point).
+
+"""
+
+import numpy as np
+
+
+def axis_width(ax) -> int:
+    """Returns the width of a matplotlib axis in pixels at its figure's dpi."""
+    return max(int(np.ceil(ax.get_window_extent().width)), 1)
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """Datetimes as float nanoseconds relative to the first point; other values as float."""
+
+    x = np.asarray(x)
+
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view(np.int64)
+        return (x - x[0]).astype(np.float64)
+
+    return x.astype(np.float64)
+
+
+def _gap_breaks(y: np.ndarray) -> np.ndarray:
+    """Returns the index of the first NaN of every run of NaNs in `y`."""
+
+    missing = np.isnan(y)
+    return np.flatnonzero(missing & ~np.r_[False, missing[:-1]])
+
+
+def m4_indices(x: np.ndarray, y: np.ndarray, width: int) -> np.ndarray:
+    """Returns the indices of the first, last, minimum and maximum point of each of `width` equal-time buckets."""
+
+    n = len(y)
+
+    if n <= 4 * width:
+        return np.arange(n)
+
+    x       = _as_float(x)
+    y       = np.asarray(y, dtype=np.float64)
+    span    = x[-1] - x[0]
+
+    # Pixel column of every point; the points are sorted by time, so every bucket is one contiguous run
+    if span > 0:
+        bucket = np.minimum(((x - x[0]) / span * width).astype(np.int64), width - 1)
+    else:
+        bucket = np.arange(n) * width // n
+
+    starts      = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends        = np.r_[starts[1:], n] - 1
+    bucket_id   = np.repeat(np.arange(len(starts)), ends - starts + 1)
+
+    # NaNs are never the extreme of a bucket
+    missing     = np.isnan(y)
+    y_min       = np.minimum.reduceat(np.where(missing,  np.inf, y), starts)
+    y_max       = np.maximum.reduceat(np.where(missing, -np.inf, y), starts)
+
+    return np.unique(np.concatenate([starts, ends,
+                                     _first_match(y == y_min[bucket_id], bucket_id),
+                                     _first_match(y == y_max[bucket_id], bucket_id),
+                                     _gap_breaks(y)]))
+
+
+def _first_match(mask: np.ndarray, bucket_id: np.ndarray) -> np.ndarray:
+    """Returns the first index where `mask` holds in each bucket that has one."""
+
+    matches = np.flatnonzero(mask)
+    ids     = bucket_id[matches]
+
+    return matches[np.r_[True, ids[1:] != ids[:-1]]] if len(matches) else matches
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Returns the indices of the `n_out` points chosen by Largest-Triangle-Three-Buckets."""
+
+    y       = np.asarray(y, dtype=np.float64)
+    finite  = np.flatnonzero(~np.isnan(y))
+
+    if len(y) <= n_out or n_out < 3:
+        return np.arange(len(y))
+
+    # The buckets are chosen among the finite points; the gaps are only marked by their first NaN
+    if len(finite) < len(y):
+        return np.unique(np.concatenate([finite[lttb_indices(np.asarray(x)[finite], y[finite], n_out)], _gap_breaks(y)]))
+
+    n = len(y)
+    x = _as_float(x)
+
+    # The first and last point are always kept; the points between them are split into n_out - 2 buckets
+    edges   = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts  = edges[:-1]
+    lengths = np.diff(edges)
+
+    # Average of the next bucket for every bucket; the last bucket looks ahead to the last point
+    mean_x  = np.add.reduceat(x[:n - 1], starts) / lengths
+    mean_y  = np.add.reduceat(y[:n - 1], starts) / lengths
+    next_x  = np.r_[mean_x[1:], x[-1]]
+    next_y  = np.r_[mean_y[1:], y[-1]]
+
+    selected        = np.empty(n_out, dtype=np.int64)
+    selected[0]     = 0
+    selected[-1]    = n - 1
+    a               = 0
+
+    for i, (lo, hi) in enumerate(zip(starts, edges[1:])):
+        area            = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a               = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, width: int, method: str = 'm4') -> np.ndarray:
+    """
+    Returns the sorted indices of the points of (x, y) to plot on an axis `width` pixels wide.
+
+    `method` is "m4" (at most 4 points per pixel column), "lttb" (2 points per pixel column)
+    or None to keep every point.
+    """
+
+    if method is None or method == 'none':
+        return np.arange(len(y))
+
+    if method == 'm4':
+        return m4_indices(x, y, width)
+
+    if method == 'lttb':
+        return lttb_indices(x, y, 2 * width)
+
+    raise ValueError(f"Unknown downsampling method: {method}")
@@ -0,0 +1,230 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the superposed-epoch (event-aligned) analysis of the building series.
+
+For every event occurrence, a fixed window of -before / +after around the event is cut out of every building series at once. The series share one regular time grid (a BuildingTensor, or the 'Sum' frames of `aggregate_network_data`), so the event times map to grid rows by arithmetic and the windows are a single fancy-indexing gather:
+
+    epochs[event, building, offset] = values[building, row(event) + offset]
+
+Offsets that fall outside the grid are NaN. The mean and the quantile bands over the events are NaN-aware reductions along the event axis.
+
+Example: the devicecount around every home game
+
+    store   = EventStore.from_file('data/input/events/events.csv').select('athletics')
+    stack   = SuperposedEpochs(before='6h', after='6h').analyze(tensor, store)
+    stack.mean()        # (building x offset)
+    stack.bands()       # {quantile: (building x offset)}
+
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from src.python.processor.building_tensor import BuildingTensor, DATETIME, DEVICECOUNT, nan_sum
+from src.python.time_series.event_store import EventStore
+
+
+def nan_quantiles(values: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """
+    Returns the `quantiles` of `values` over axis 0, ignoring NaN, as a (quantile x ...) array.
+
+    One sort along axis 0 serves every quantile; `np.nanquantile` is much slower on this layout.
+    """
+
+    ordered = np.sort(values, axis=0)
+    valid   = (~np.isnan(values)).sum(axis=0)
+    bands   = []
+
+    for q in quantiles:
+        position    = q * np.maximum(valid - 1, 0)
+        lower       = np.floor(position).astype(np.int64)
+        upper       = np.minimum(lower + 1, np.maximum(valid - 1, 0))
+        fraction    = position - lower
+        low_value   = np.take_along_axis(ordered, lower[None], axis=0)[0]
+        high_value  = np.take_along_axis(ordered, upper[None], axis=0)[0]
+        bands.append(np.where(valid > 0, low_value + fraction * (high_value - low_value), np.nan))
+
+    return np.array(bands)
+
+
+###############################################################################
+#
+#   Class: EpochStack
+#
+###############################################################################
+
+class EpochStack:
+    """The (event x building x offset) windows of one superposed-epoch analysis."""
+
+    def __init__(
+        self,
+        epochs      : np.ndarray,
+        offsets     : pd.TimedeltaIndex,
+        events      : np.ndarray,
+        event_times : np.ndarray,
+        buildings   : np.ndarray,
+        quantiles   : Sequence[float]
+        ):
+
+        self.epochs         =   epochs
+        self.offsets        =   offsets
+        self.events         =   events
+        self.event_times    =   event_times
+        self.buildings      =   buildings
+        self.quantiles      =   tuple(quantiles)
+
+
+    def building(self, building: str) -> np.ndarray:
+        """(event x offset) windows of one building."""
+        return self.epochs[:, list(self.buildings).index(building)]
+
+
+    def count(self) -> np.ndarray:
+        """(building x offset) number of events with data at each offset."""
+        return (~np.isnan(self.epochs)).sum(axis=0)
+
+
+    def mean(self) -> np.ndarray:
+        """(building x offset) mean over the events."""
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.nansum(self.epochs, axis=0) / self.count()
+
+
+    def bands(self) -> Dict[float, np.ndarray]:
+        """{quantile: (building x offset)} quantiles over the events (linear interpolation, as `np.nanquantile`)."""
+        return dict(zip(self.quantiles, nan_quantiles(self.epochs, self.quantiles)))
+
+
+    def to_frame(self, building: str) -> pd.DataFrame:
+        """The mean and quantile bands of one building, indexed by offset."""
+
+        j       = list(self.buildings).index(building)
+        frame   = pd.DataFrame({'mean': self.mean()[j], 'count': self.count()[j]}, index=self.offsets)
+
+        for q, band in self.bands().items():
+            frame[f"q{q:g}"] = band[j]
+
+        return frame
+
+
+###############################################################################
+#
+#   Class: SuperposedEpochs
+#
+###############################################################################
+
+class SuperposedEpochs:
+
+    def __init__(
+        self,
+        before      : Union[str, pd.Timedelta]  = '6h',
+        after       : Union[str, pd.Timedelta]  = '6h',
+        quantiles   : Sequence[float]           = (0.1, 0.5, 0.9)
+        ):
+
+        self.before     =   pd.Timedelta(before)
+        self.after      =   pd.Timedelta(after)
+        self.quantiles  =   quantiles
+
+
+    ##################################
+    #   Inputs
+    ##################################
+    @staticmethod
+    def from_tensor(tensor: BuildingTensor, network: str = None) -> Tuple[np.ndarray, pd.DatetimeIndex, np.ndarray]:
+        """(building x time) values of one network, or (network x building x time) values of all networks if `network` is None."""
+
+        if network is None:
+            return tensor.values, tensor.index, tensor.buildings
+
+        return tensor.values[list(tensor.networks).index(network)], tensor.index, tensor.buildings
+
+
+    @staticmethod
+    def from_results(results: Dict, key: str = 'Sum') -> Tuple[np.ndarray, pd.DatetimeIndex, np.ndarray]:
+        """(building x time) values of the `{building: df}` entry `key` of `aggregate_network_data`."""
+
+        frames = results[key]
+
+        if isinstance(frames, pd.DataFrame):
+            frames = {key: frames}
+
+        index   = pd.DatetimeIndex(next(iter(frames.values()))[DATETIME])
+        values  = np.stack([frame[DEVICECOUNT].to_numpy(dtype=np.float32) for frame in frames.values()])
+
+        return values, index, np.asarray(list(frames), dtype=object)
+
+
+    ##################################
+    #   Gather
+    ##################################
+    def offsets(self, step: pd.Timedelta) -> np.ndarray:
+        return np.arange(-int(self.before // step), int(self.after // step) + 1)
+
+
+    def gather(self, values: np.ndarray, index: pd.DatetimeIndex, event_times: np.ndarray) -> Tuple[np.ndarray, pd.TimedeltaIndex]:
+        """
+        Returns the (event x building x offset) windows of the (building x time) `values` around
+        `event_times`, and the offsets. `index` must be a regular grid; an event maps to its nearest grid row.
+        """
+
+        values      = np.atleast_2d(values)
+        step        = pd.Timedelta(index[1] - index[0]) if len(index) > 1 else pd.Timedelta(1, 'min')
+        offsets     = self.offsets(step)
+        event_times = np.asarray(event_times).astype('datetime64[ns]').view(np.int64)
+
+        anchors     = np.rint((event_times - index[0].value) / step.value).astype(np.int64) if len(index) else np.zeros(len(event_times), dtype=np.int64)
+        rows        = anchors[:, None] + offsets[None, :]
+        valid       = (rows >= 0) & (rows < len(index))
+
+        epochs      = values[:, np.clip(rows, 0, max(len(index) - 1, 0))].astype(np.float32) if len(index) else \
+                      np.full((values.shape[0],) + rows.shape, np.nan, dtype=np.float32)
+        epochs      = np.where(valid[None], epochs, np.nan).transpose(1, 0, 2)
+
+        return epochs, pd.to_timedelta(offsets * step.value, unit='ns')
+
+
+    def analyze(self,
+                data:       Union[BuildingTensor, Dict],
+                events:     Union[EventStore, Dict],
+                network:    str         = None,
+                buildings:  List[str]   = None  ) -> EpochStack:
+        """
+        Gathers the windows around every event of `events` (an EventStore or an event dictionary) for
+        every building of `data` (a BuildingTensor or the dict of `aggregate_network_data`).
+        """
+
+        if isinstance(data, BuildingTensor):
+            values, index, labels = self.from_tensor(data, network)
+
+        else:
+            values, index, labels = self.from_results(data, network or 'Sum')
+
+        if buildings is not None:
+            mask            = np.isin(labels, buildings)
+            values, labels  = values[..., mask, :], labels[mask]
+
+        store = events if isinstance(events, EventStore) else EventStore.from_dict(events)
+
+        # All networks: gather every network's windows and sum them, rather than summing the whole tensor first
+        if values.ndim == 3:
+            gathered        = [self.gather(network_values, index, store.starts) for network_values in values]
+            epochs, offsets = nan_sum(np.stack([epochs for epochs, offsets in gathered]), axis=0), gathered[0][1]
+
+        else:
+            epochs, offsets = self.gather(values, index, store.starts)
+
+        return EpochStack(epochs, offsets, store.names, store.starts, labels, self.quantiles)
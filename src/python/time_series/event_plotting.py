@@ -18,6 +18,9 @@ import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 import data.input.events.event_dict as ev
 from src.python.time_series.plot_builder import DataFetcher, PlotCreator, PlotSaver
+from src.python.time_series.downsample import axis_width, downsample_indices
+from src.python.time_series.event_store import EventStore
+from src.python.time_series.phase_space import PhaseSpace
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.dates as mdates
@@ -27,7 +30,7 @@ logger = logging.getLogger(__name__)
 
 class DataVisualizer:
     
-    def __init__(self, data_processor, config):
+    def __init__(self, data_processor, config, data_fetcher=None):
         
         self.data_processor     = data_processor
         self.config             = config
@@ -40,7 +43,7 @@ class DataVisualizer:
         self.show_plot          = config['SHOW_PLOT']
         self.devicecount        = config['DEVICECOUNT']
         self.COLORS             = config['COLORS']
-        self.data_fetcher   = DataFetcher(self.data_processor) 
+        self.data_fetcher   = data_fetcher or (DataFetcher(self.data_processor) if data_processor is not None else None)
         self.event_plotter  = EventPlotter(config)
         self.plot_saver     = PlotSaver(config)
         self.plot_creator   = PlotCreator(config)
@@ -48,39 +51,73 @@ class DataVisualizer:
 
     def plot_single(self, building: str, networks: List[str]=None, events=ev.events):
         
+        payload = self.prepare_single(building, networks)
+        
+        if payload is None:
+            return
+        
+        start_date, end_date = self.draw_single(payload, events)
+        
+        self.plot_saver.save_plot(building, start_date, end_date)  
+        
+        if self.show_plot:
+            plt.show()
+            
+        else:
+            plt.close()
+        # folder_path = self.plot_saver.save_plot(building, start_date, end_date)         
+        # return folder_path
+
+
+    def prepare_single(self, building: str, networks: List[str]=None):
+        """
+        Returns the compact arrays that `draw_single` needs for one building: the networks with 
+        data, their int64 timestamps, (normalized) device counts and y limits. None if there is no data.
+        """
+        
         if networks is None:
             networks = self.NETWORKS
             
-        dfs     = []
-        max_ys  = []
+        found   = []
+        times   = []
+        values  = []
         
         for network in networks:
             data = self.data_fetcher.fetch_building_data(network, building)
             
             if isinstance(data, pd.DataFrame):
-                data.rename(columns={'datetime':'dt'}, inplace=True)
-                dfs.append(data)
+                found.append(network)
+                times.append(data['datetime'].values.astype('datetime64[ns]').view(np.int64))
+                values.append(data[self.devicecount].to_numpy(dtype=np.float64))
                 
             else:
                 logger.error(f"fetch_building_data returned a non-DataFrame for network {network} and building {building}: {data}")
                 continue
             
-        if not dfs or dfs[0].empty:
+        if not values or len(values[0]) == 0:
             logger.error(f"No data available for building {building}")
-            return
+            return None
         
         # Normalize and set y axis limit
         if self.normalize:
             scaler = MinMaxScaler()
-
-            for df in dfs:
-                df[self.devicecount] = scaler.fit_transform(df[self.devicecount].values.reshape(-1,1))
-                
-            max_ys = [1 for _ in dfs]    
+            values = [scaler.fit_transform(v.reshape(-1,1)).ravel() for v in values]
+            max_ys = [1 for _ in values]    
              
         else:
-            max_ys = [df[self.devicecount].max() for df in dfs]
+            max_ys = [np.nanmax(v) for v in values]
             
+        return {'building': building, 'networks': found, 'times': times, 'values': values, 'max_ys': max_ys}
+
+
+    def draw_single(self, payload: dict, events=ev.events):
+        """Draws the figure of one building from the arrays of `prepare_single`. Returns its start and end date."""
+        
+        building    = payload['building']
+        networks    = payload['networks']
+        max_ys      = payload['max_ys']
+        dfs         = [pd.DataFrame({'dt': pd.to_datetime(t), self.devicecount: v}) for t, v in zip(payload['times'], payload['values'])]
+        
         # Create the figure     
         fig, axs, start_date, end_date = self.plot_creator.create_plot(dfs[0], building)
         
@@ -108,7 +145,7 @@ class DataVisualizer:
                 end_index = (i + 1) * len(dfs[0]) // self.intervals
                 if start_index < 0 or end_index > len(dfs[0]):
                     logger.error("Invalid start_index or end_index")
-                    return
+                    return start_date, end_date
                 
                 for df, max_y, network in zip(dfs, max_ys, networks):
                     if df.empty:
@@ -119,24 +156,31 @@ class DataVisualizer:
                     
                 ax2 = ax.twinx()
                 ax2.set_yticks([])
-                if events is not None and isinstance(events, dict):
+                if events is not None and isinstance(events, (dict, EventStore)):
                     self.event_plotter.plot_events(df, ax2, events, max_y, start_index, end_index, pd.Timedelta(hours=3), pd.Timedelta(hours=3))
                     
-        self.plot_saver.save_plot(building, start_date, end_date)  
-        
-        if self.show_plot:
-            plt.show()
-            
-        else:
-            plt.close()
-        # folder_path = self.plot_saver.save_plot(building, start_date, end_date)         
-        # return folder_path
+        return start_date, end_date
       
   
 class EventPlotter:
     
     def __init__(self,config):
-        self.label_sizes = config['LABEL_SIZES']
+        self.label_sizes    = config['LABEL_SIZES']
+        self._compiled      = (None, None)
+
+
+    def compile_events(self, events):
+        """
+        Returns the events (an event dictionary or an EventStore) as an EventStore of whole event days.
+        Compiled once per events object.
+        """
+        
+        if self._compiled[0] is not events:
+            store           = events if isinstance(events, EventStore) else EventStore.from_dict(events)
+            self._compiled  = (events, store.days())
+        
+        return self._compiled[1]
+
 
     def plot_events(self, data_frame, axis, events, max_y_value, plot_start_index, 
                                                                  plot_end_index, 
@@ -145,26 +189,25 @@ class EventPlotter:
         if events is not None:
             color   =   'grey'
             alpha   =   0.25
-            dt_str  =   data_frame['dt'].dt.strftime('%Y-%m-%d')
+            days    =   self.compile_events(events)
             
-            for event, dates    in events.items():
-                for year, date  in dates.items():
-                    event_date  = pd.to_datetime(date).strftime('%Y-%m-%d')
-                    
-                    if dt_str.iloc[plot_start_index:plot_end_index].isin([event_date]).any():
-                        event_index = dt_str[dt_str == event_date].index[0]
-                        highlight_start_index = max(0,event_index-int(pre_event_interval.total_seconds() 
-                                                                      / (data_frame['dt'].iloc[1]-data_frame['dt'].iloc[0]
-                                                                         ).total_seconds()
-                                                                      )
-                                                    )
-                        highlight_end_index = min(len(data_frame)-1, event_index+int(post_event_interval.total_seconds() 
-                                                                                     / (data_frame['dt'].iloc[1]-data_frame['dt'].iloc[0]).total_seconds()
-                                                                                     )
-                                                  )
-                        
-                        axis.fill_between(data_frame['dt'].iloc[highlight_start_index:highlight_end_index],0,max_y_value,color=color,alpha=alpha)
-                        axis.text(data_frame['dt'].iloc[event_index],max_y_value-0.1*max_y_value,event,ha='center',va='bottom',fontsize=8)
+            if len(days) == 0 or len(data_frame) < 2:
+                return
+            
+            # Events with a row on their day inside this subplot; the highlight is centred on the day's first row
+            times               = data_frame['dt'].values.astype('datetime64[ns]')
+            _, visible          = days.overlaps(times[plot_start_index], times[plot_end_index - 1])
+            day_rows            = days.index_windows(times, pd.Timedelta(0), pd.Timedelta(0))[1]
+            step                = (data_frame['dt'].iloc[1] - data_frame['dt'].iloc[0]).total_seconds()
+            pre_rows            = int(pre_event_interval.total_seconds()  / step)
+            post_rows           = int(post_event_interval.total_seconds() / step)
+            
+            for event, event_index in zip(days.names[visible], day_rows[visible]):
+                highlight_start_index   = max(0, event_index - pre_rows)
+                highlight_end_index     = min(len(data_frame) - 1, event_index + post_rows)
+                
+                axis.fill_between(data_frame['dt'].iloc[highlight_start_index:highlight_end_index],0,max_y_value,color=color,alpha=alpha)
+                axis.text(data_frame['dt'].iloc[event_index],max_y_value-0.1*max_y_value,event,ha='center',va='bottom',fontsize=8)
                         
             if axis.get_legend_handles_labels()[0]:
                 axis.legend(loc='upper left')
@@ -182,16 +225,23 @@ class CampusPlotter:
         self.show_plot      = config['SHOW_PLOT']
         self.normalize      = config['NORMALIZE']
         self.devicecount    = config['DEVICECOUNT']
+        self.downsample     = config['DOWNSAMPLE']
+        self.phase_config   = config['PHASE_SPACE']
 
 
-    def normalize_device_count(self):
+    def normalize_device_count(self) -> pd.DataFrame:
+        """Returns the campus data, with the device count min-max normalized when `NORMALIZE` is set. `self.data` is not modified."""
         
-        if self.normalize:
-            max_count = self.data[self.devicecount].max()
-            min_count = self.data[self.devicecount].min()
-            
-            if max_count != min_count:
-                self.data[self.devicecount] = (self.data[self.devicecount] - min_count) / (max_count - min_count)
+        if not self.normalize:
+            return self.data
+        
+        max_count = self.data[self.devicecount].max()
+        min_count = self.data[self.devicecount].min()
+        
+        if max_count == min_count:
+            return self.data
+        
+        return self.data.assign(**{self.devicecount: (self.data[self.devicecount] - min_count) / (max_count - min_count)})
 
 
     def create_output_dir(self):
@@ -200,35 +250,48 @@ class CampusPlotter:
             os.makedirs(self.output_path)
 
 
+    def phase_space(self) -> PhaseSpace:
+        """Returns the delay embedding of the campus device count, with the `PHASE_SPACE` dimension and delay."""
+        return PhaseSpace.from_frame(self.data, self.devicecount, self.normalize, name='Campus',
+                                     dimension=self.phase_config['dimension'], delay=self.phase_config['delay'])
+
+
     def plot_phase_space(self):
-        self.normalize_device_count()
+        
+        space = self.phase_space()
         
         plt.figure(figsize=(6,6))
-        plt.plot(self.data[self.devicecount][:-1], self.data[self.devicecount][1:], '#8B0000')
-        plt.xlabel('x(t2)')
-        plt.ylabel('x(t1)')
+        space.plot(plt.gca(), self.phase_config['max_points'])
         plt.title('Phase space plot')
         plt.grid()
         self.create_output_dir()
         plt.savefig(f'{self.output_path}/phase_space.png')
         
+        # The radii are fractions of the range of the series, normalized or not
+        radii = np.asarray(self.phase_config['radii']) * (space.extent or 1.0)
+        stats = space.statistics(radii, self.phase_config['theiler'], self.phase_config['samples'])
+        pd.DataFrame([stats]).to_csv(f'{self.output_path}/phase_space.csv', index=False)
+        
         if self.show_plot:
             plt.show()
+            
+        return stats
 
 
     def plot_data(self):
-        self.normalize_device_count()
+        campus = self.normalize_device_count()
         
         fig, axs = plt.subplots(self.intervals, figsize=self.figure_size)
         
         plt.suptitle('77 Building Aggregate: Device Count vs. Time', fontsize=16, fontweight='bold')
         plt.subplots_adjust(hspace=0.25)
         
-        split_data  = np.array_split(self.data, self.intervals)
-        max_y       = self.data[self.devicecount].max()
+        split_data  = [campus.iloc[rows] for rows in np.array_split(np.arange(len(campus)), self.intervals)]
+        max_y       = campus[self.devicecount].max()
         
         for i, data in enumerate(split_data):
-            axs[i].plot(data['datetime'], data[self.devicecount], linewidth=2.0, color='#A50021', linestyle='-')
+            keep = downsample_indices(data['datetime'].values, data[self.devicecount].values, axis_width(axs[i]), self.downsample)
+            axs[i].plot(data['datetime'].iloc[keep], data[self.devicecount].iloc[keep], linewidth=2.0, color='#A50021', linestyle='-')
             axs[i].set_xlabel('Datetime')
             axs[i].set_ylabel('Device Count')
             axs[i].set_ylim([0, max_y])
@@ -240,7 +303,7 @@ class CampusPlotter:
             axs[i].xaxis.set_major_locator(mdates.MonthLocator())
             axs[i].xaxis.set_major_formatter(mdates.DateFormatter('%b'))
             axs[i].xaxis.set_minor_locator(mdates.DayLocator())
-            axs[i].xaxis.set_minor_formatter(mdates.ConciseDateFormatter('%b'))
+            axs[i].xaxis.set_minor_formatter(mdates.DateFormatter('%d'))
             axs[i].tick_params(axis='x',which='minor',labelsize=self.label_sizes['tick_params'])
             axs[i].grid(True)
             
@@ -0,0 +1,212 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the EventStore class, an event calendar held as sorted NumPy arrays.
+
+Every event has a name, a category (e.g. "academic", "athletics", "holiday"), a start and an end. An event occupies [start, end); an event with no end is an instant. The events are sorted by start, and the longest duration is kept, so every query is a few `searchsorted` calls over all events and windows at once:
+
+- `overlapping` / `overlaps`: the events that overlap one window or many windows
+- `index_windows`: the row range of a sorted time series within -before / +after of every event
+
+A store is loaded from a CSV or JSON file (see `data/input/events/events.csv`) or from the event dictionary of `data/input/events/event_dict.py`.
+
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Union
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ['name', 'category', 'start', 'end']
+
+
+###############################################################################
+#
+#   Class: EventStore
+#
+###############################################################################
+
+class EventStore:
+
+    def __init__(
+        self,
+        names       : Iterable[str],
+        starts      : Iterable,
+        ends        : Iterable  = None,
+        categories  : Iterable[str] = None
+        ):
+
+        starts  = pd.to_datetime(pd.Series(list(starts), dtype=object)).values.astype('datetime64[ns]')
+        ends    = starts.copy() if ends is None else pd.to_datetime(pd.Series(list(ends), dtype=object)).values.astype('datetime64[ns]')
+        ends    = np.where(np.isnat(ends), starts, ends)
+        names   = np.array(list(names), dtype=object)
+
+        if categories is None:
+            categories = ['uncategorized'] * len(names)
+
+        categories  = np.array(list(categories), dtype=object)
+        order       = np.argsort(starts, kind='stable')
+
+        if (ends < starts).any():
+            raise ValueError("An event cannot end before it starts.")
+
+        self.names          =   names[order]
+        self.categories     =   categories[order]
+        self.starts         =   starts[order]
+        self.ends           =   ends[order]
+        self.max_duration   =   (self.ends - self.starts).max() if len(order) else np.timedelta64(0, 'ns')
+
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+    ##################################
+    #   Loading and saving
+    ##################################
+    @classmethod
+    def from_dict(cls, events: Dict[str, Dict[str, object]], categories: Dict[str, str] = None) -> 'EventStore':
+        """Builds a store from `{name: {year: datetime}}`, as in `event_dict.py`, with optional `{name: category}`."""
+
+        categories  = categories or {}
+        rows        = [(name, categories.get(name, 'uncategorized'), date) for name, dates in events.items() for date in dates.values()]
+
+        return cls([row[0] for row in rows], [row[2] for row in rows], categories=[row[1] for row in rows])
+
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'EventStore':
+
+        ends        = frame['end']      if 'end'        in frame else None
+        categories  = frame['category'] if 'category'   in frame else None
+
+        return cls(frame['name'], frame['start'], ends, categories)
+
+
+    @classmethod
+    def from_file(cls, file_path: Union[str, Path]) -> 'EventStore':
+        """Loads a store from a CSV or JSON file with the columns name, category, start and (optionally) end."""
+
+        file_path = Path(file_path)
+
+        if file_path.suffix == '.csv':
+            return cls.from_frame(pd.read_csv(file_path, dtype=str, keep_default_na=False).replace('', None))
+
+        if file_path.suffix == '.json':
+            with open(file_path, 'r') as f:
+                return cls.from_frame(pd.DataFrame(json.load(f)))
+
+        raise ValueError(f"Unsupported event file: {file_path}")
+
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'name': self.names, 'category': self.categories, 'start': self.starts, 'end': self.ends}, columns=COLUMNS)
+
+
+    def save(self, file_path: Union[str, Path]) -> None:
+
+        file_path   = Path(file_path)
+        frame       = self.to_frame()
+
+        if file_path.suffix == '.csv':
+            frame.to_csv(file_path, index=False, date_format='%Y-%m-%d %H:%M:%S')
+
+        elif file_path.suffix == '.json':
+            frame.to_json(file_path, orient='records', date_format='iso', indent=4)
+
+        else:
+            raise ValueError(f"Unsupported event file: {file_path}")
+
+
+    ##################################
+    #   Selections
+    ##################################
+    def _subset(self, mask: np.ndarray) -> 'EventStore':
+        return EventStore(self.names[mask], self.starts[mask], self.ends[mask], self.categories[mask])
+
+
+    def select(self, categories: Union[str, Iterable[str]] = None, names: Union[str, Iterable[str]] = None) -> 'EventStore':
+        """Returns the events in any of `categories` and with any of `names`."""
+
+        mask = np.ones(len(self), dtype=bool)
+
+        if categories is not None:
+            mask &= np.isin(self.categories, [categories] if isinstance(categories, str) else list(categories))
+
+        if names is not None:
+            mask &= np.isin(self.names, [names] if isinstance(names, str) else list(names))
+
+        return self._subset(mask)
+
+
+    def days(self) -> 'EventStore':
+        """
+        Returns the events stretched to whole days: from midnight of their start day to the first midnight at or
+        after their (exclusive) end. Instant events, and events that end on the midnight they start, cover their start day.
+        """
+
+        day     = np.timedelta64(1, 'D').astype('timedelta64[ns]').astype(np.int64)
+        first   = self.starts.astype('datetime64[D]').astype('datetime64[ns]')
+        last    = (-(-self.ends.astype('datetime64[ns]').astype(np.int64) // day) * day).astype('datetime64[ns]')
+        last    = np.where(last > first, last, first + np.timedelta64(1, 'D'))
+
+        return EventStore(self.names, first, last, self.categories)
+
+
+    ##################################
+    #   Window queries
+    ##################################
+    def overlaps(self, window_starts, window_ends) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the (window, event) index pairs of every event that overlaps one of the closed windows
+        [window_starts[k], window_ends[k]], ordered by window and then by event start.
+        """
+
+        window_starts   = np.atleast_1d(np.asarray(window_starts).astype('datetime64[ns]'))
+        window_ends     = np.atleast_1d(np.asarray(window_ends).astype('datetime64[ns]'))
+
+        # Only the events that start in [window_start - longest duration, window_end] can overlap a window
+        first           = np.searchsorted(self.starts, window_starts - self.max_duration, side='left')
+        last            = np.searchsorted(self.starts, window_ends, side='right')
+        counts          = np.maximum(last - first, 0)
+
+        windows         = np.repeat(np.arange(len(window_starts)), counts)
+        offsets         = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        events          = np.repeat(first, counts) + offsets
+
+        # An instant overlaps when it lies in the window; an interval when it ends after the window starts
+        instant         = self.ends[events] == self.starts[events]
+        keep            = np.where(instant, self.starts[events] >= window_starts[windows], self.ends[events] > window_starts[windows])
+
+        return windows[keep], events[keep]
+
+
+    def overlapping(self, window_start, window_end) -> np.ndarray:
+        """Returns the indices of the events that overlap [window_start, window_end]."""
+        return self.overlaps(window_start, window_end)[1]
+
+
+    def index_windows(self, times: np.ndarray, before: pd.Timedelta, after: pd.Timedelta) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the (first, event, last) row indices of every event in the sorted `times`: the rows in
+        [start - before, start + after) are times[first:last], and times[event] is the first row at or after the start.
+        """
+
+        times   = np.asarray(times).astype('datetime64[ns]')
+        first   = np.searchsorted(times, self.starts - np.timedelta64(pd.Timedelta(before)), side='left')
+        event   = np.searchsorted(times, self.starts,                                         side='left')
+        last    = np.searchsorted(times, self.starts + np.timedelta64(pd.Timedelta(after)),  side='left')
+
+        return first, event, last
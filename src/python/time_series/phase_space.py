@@ -0,0 +1,279 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the phase-space (delay-embedding) analysis of one building or aggregate series.
+
+The delay embedding of a series x with dimension m and delay tau has one point per time t:
+
+    (x(t), x(t + tau), ..., x(t + (m - 1) tau))
+
+It is a strided view of the series (`np.lib.stride_tricks.sliding_window_view`), as is the Hankel matrix H[i, j] = x(i + j), so neither copies the series, whatever its length. Only the KD-tree that the statistics query holds its own copy of the (point x m) coordinates.
+
+The recurrence and nearest-neighbour statistics use a `scipy.spatial.cKDTree` instead of the O(n^2) distance matrix:
+- recurrence rate: the fraction of point pairs closer than r, from the dual-tree pair count `count_neighbors` (of all the pairs, or of the pairs of a sample of the points with all the points, which keeps the cost linear in n)
+- correlation dimension: the slope of log(recurrence rate) against log(r)
+- nearest neighbours: the distance to, and the time gap from, the nearest point outside a Theiler window of +/- `theiler` steps (so that the neighbouring minutes of the same trajectory are not counted), for an evenly spaced sample of the points
+
+The phase portrait plots x(t) against x(t + tau) for an evenly strided subset of at most `max_points` points.
+
+Example: the campus aggregate
+
+    space = PhaseSpace.from_frame(campus, dimension=3, delay=60, normalize=True)
+    space.statistics(radii=[0.02, 0.05, 0.1], theiler=60)
+    space.plot(axis, max_points=20000)
+
+"""
+
+from typing import Dict, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.spatial import cKDTree
+
+from src.python.processor.building_tensor import DATETIME, DEVICECOUNT
+
+
+def delay_embedding(values: np.ndarray, dimension: int = 2, delay: int = 1) -> np.ndarray:
+    """The (point x dimension) delay embedding of the 1-D `values`, as a read-only view (no copy)."""
+
+    if dimension < 1 or delay < 1:
+        raise ValueError(f"The dimension and delay must be positive, got {dimension} and {delay}.")
+
+    values  = np.asarray(values)
+    span    = (dimension - 1) * delay + 1
+
+    if len(values) < span:
+        return np.empty((0, dimension), dtype=values.dtype)
+
+    return sliding_window_view(values, span)[:, ::delay]
+
+
+def hankel(values: np.ndarray, rows: int) -> np.ndarray:
+    """The (rows x len - rows + 1) Hankel matrix H[i, j] = values[i + j] of the 1-D `values`, as a read-only view."""
+
+    values = np.asarray(values)
+
+    if not 1 <= rows <= len(values):
+        raise ValueError(f"A Hankel matrix of {len(values)} values needs 1 to {len(values)} rows, got {rows}.")
+
+    return sliding_window_view(values, len(values) - rows + 1)
+
+
+def decimate(length: int, max_points: int) -> slice:
+    """The evenly strided slice that keeps at most `max_points` of `length` points."""
+    return slice(None, None, max(1, -(-length // max(max_points, 1))))
+
+
+###############################################################################
+#
+#   Class: PhaseSpace
+#
+###############################################################################
+
+class PhaseSpace:
+
+    def __init__(
+        self,
+        values      : np.ndarray,
+        index       : pd.DatetimeIndex  = None,
+        dimension   : int               = 2,
+        delay       : int               = 1,
+        name        : str               = ''
+        ):
+
+        self.values     =   np.asarray(values, dtype=np.float64)
+        self.index      =   index
+        self.dimension  =   dimension
+        self.delay      =   delay
+        self.name       =   name
+        self._tree      =   None
+        self._positions =   None
+
+        if self.values.ndim != 1:
+            raise ValueError(f"A phase space needs a 1-D series, got shape {self.values.shape}.")
+
+
+    ##################################
+    #   Inputs
+    ##################################
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = DEVICECOUNT, normalize: bool = False, **kwargs) -> 'PhaseSpace':
+        """
+        The phase space of one column of a building or aggregate frame. With `normalize`, the series is
+        min-max normalized into a new array; `df` itself is never modified.
+        """
+
+        values  = df[column].to_numpy(dtype=np.float64)
+        index   = pd.DatetimeIndex(df[DATETIME]) if DATETIME in df else None
+
+        if normalize and len(values):
+            low, high   = np.nanmin(values), np.nanmax(values)
+            values      = (values - low) / (high - low) if high > low else values - low
+
+        return cls(values, index, **kwargs)
+
+
+    @classmethod
+    def from_results(cls, results: Dict, key: str = 'Campus', building: str = None, **kwargs) -> 'PhaseSpace':
+        """
+        The phase space of one series of `aggregate_network_data`: the 'Campus' aggregate, or
+        `building` of a network, 'Sum', 'Type' or 'Average'.
+        """
+
+        df = results[key] if building is None else results[key][building]
+        return cls.from_frame(df, name=building or key, **kwargs)
+
+
+    ##################################
+    #   Embedding
+    ##################################
+    @property
+    def points(self) -> np.ndarray:
+        """The (point x dimension) delay embedding, a view of `values`."""
+        return delay_embedding(self.values, self.dimension, self.delay)
+
+
+    @property
+    def valid(self) -> np.ndarray:
+        """The points without NaN coordinates."""
+        return ~delay_embedding(np.isnan(self.values), self.dimension, self.delay).any(axis=1)
+
+
+    @property
+    def extent(self) -> float:
+        """The range (max - min) of the series, the scale of the recurrence radii; 1 for a normalized series."""
+
+        finite = self.values[np.isfinite(self.values)]
+        return float(finite.max() - finite.min()) if len(finite) else 0.0
+
+
+    @property
+    def tree(self) -> cKDTree:
+        """The KD-tree of the valid points, built once."""
+
+        if self._tree is None:
+            self._positions = np.flatnonzero(self.valid)
+            self._tree      = cKDTree(self.points[self._positions], balanced_tree=False, compact_nodes=False)
+
+        return self._tree
+
+
+    def hankel(self, rows: int = None) -> np.ndarray:
+        """The Hankel matrix of the series with `dimension` (or `rows`) rows, a view of `values`."""
+        return hankel(self.values, rows or self.dimension)
+
+
+    ##################################
+    #   Statistics
+    ##################################
+    def recurrence_rate(self, radii: Sequence[float], samples: int = None) -> np.ndarray:
+        """
+        The fraction of pairs of distinct valid points within each of `radii`, by a dual-tree pair count.
+        With `samples`, only the pairs of an evenly spaced sample of at most `samples` points with all the
+        points are counted: the cost of the count grows with the number of close pairs, i.e. with n^2.
+        """
+
+        tree    = self.tree
+        n       = tree.n
+        radii   = np.atleast_1d(np.asarray(radii, dtype=np.float64))
+
+        if n < 2:
+            return np.full(len(radii), np.nan)
+
+        queries = tree if samples is None or samples >= n else cKDTree(tree.data[decimate(n, samples)])
+        pairs   = np.asarray(queries.count_neighbors(tree, radii), dtype=np.float64) - queries.n
+
+        return pairs / (queries.n * (n - 1.0))
+
+
+    def correlation_dimension(self, radii: Sequence[float], samples: int = None, rates: np.ndarray = None) -> float:
+        """The least-squares slope of log(recurrence rate) against log(r) over `radii` (a scaling region)."""
+
+        radii   = np.asarray(radii, dtype=np.float64)
+        rates   = self.recurrence_rate(radii, samples) if rates is None else np.asarray(rates)
+        usable  = rates > 0
+
+        if usable.sum() < 2:
+            return np.nan
+
+        return float(np.polyfit(np.log(radii[usable]), np.log(rates[usable]), 1)[0])
+
+
+    def nearest_neighbours(self, theiler: int = 0, samples: int = 5000) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        For an evenly spaced sample of at most `samples` valid points, the distance to and the time gap
+        (in steps) from the nearest valid point more than `theiler` steps away. Returns (positions, distances, gaps);
+        a gap of 0 and a distance of inf mark points without such a neighbour.
+        """
+
+        tree        = self.tree
+        positions   = self._positions[decimate(tree.n, samples)]
+
+        if tree.n < 2 or len(positions) == 0:
+            return positions, np.full(len(positions), np.inf), np.zeros(len(positions), dtype=np.int64)
+
+        # At most 2 * theiler + 1 points (the point itself included) lie inside the window
+        k                   = min(2 * theiler + 2, tree.n)
+        distances, found    = tree.query(self.points[positions], k=[*range(1, k + 1)])
+        gaps                = np.abs(self._positions[found] - positions[:, None])
+        outside             = gaps > theiler
+        first               = outside.argmax(axis=1)
+        has                 = outside.any(axis=1)
+        rows                = np.arange(len(positions))
+
+        return positions, np.where(has, distances[rows, first], np.inf), np.where(has, gaps[rows, first], 0)
+
+
+    def statistics(self, radii: Sequence[float], theiler: int = 0, samples: int = 5000) -> Dict:
+        """The recurrence rates, the correlation dimension and the nearest-neighbour summary of the series, from `samples` query points."""
+
+        radii                   = np.atleast_1d(np.asarray(radii, dtype=np.float64))
+        rates                   = self.recurrence_rate(radii, samples)
+        _, distances, gaps      = self.nearest_neighbours(theiler, samples)
+        found                   = np.isfinite(distances)
+        step                    = (self.index[1] - self.index[0]) if self.index is not None and len(self.index) > 1 else 1
+
+        stats = {'name':                    self.name,
+                 'points':                  self.tree.n,
+                 'dimension':               self.dimension,
+                 'delay':                   self.delay,
+                 'theiler':                 theiler,
+                 'correlation_dimension':   self.correlation_dimension(radii, rates=rates),
+                 'median_neighbour':        float(np.median(distances[found])) if found.any() else np.nan,
+                 'median_recurrence_time':  np.median(gaps[found]) * step if found.any() else np.nan}
+
+        stats.update({f"recurrence_rate_{radius:g}": float(rate) for radius, rate in zip(radii, rates)})
+
+        return stats
+
+
+    ##################################
+    #   Portraits
+    ##################################
+    def portrait(self, max_points: int = 20000) -> np.ndarray:
+        """The (point x 2) coordinates x(t), x(t + delay) of at most `max_points` evenly strided points."""
+
+        points = delay_embedding(self.values, 2, self.delay)
+        return points[decimate(len(points), max_points)]
+
+
+    def plot(self, axis, max_points: int = 20000, color: str = '#8B0000', **kwargs):
+        """Draws the decimated phase portrait on `axis`."""
+
+        points = self.portrait(max_points)
+
+        axis.plot(points[:, 0], points[:, 1], color=color, linewidth=0.5, **kwargs)
+        axis.set_xlabel('x(t)')
+        axis.set_ylabel(f"x(t + {self.delay})")
+
+        return axis
@@ -15,14 +15,36 @@ import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from src.python.time_series.downsample import axis_width, downsample_indices
 
 
 class DataFetcher:
+    """
+    A lazily evaluated provider of the processed campus data.
+
+    `process_all_buildings` runs on the first access to `data`, not on construction, and its
+    results are kept, so one DataFetcher can be shared by every DataVisualizer and CampusPlotter.
+    """
     
     def __init__(self, data_processor):
         
         self.data_processor =   data_processor
-        self.data           =   self.data_processor.process_all_buildings()
+        self._data          =   None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self.data_processor.process_all_buildings()
+            
+        return self._data
+    
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def campus_data(self) -> pd.DataFrame:
+        """Returns a copy of the campus aggregate, which the caller may modify."""
+        return self.data["Campus"].copy()
 
     def fetch_building_data(self, network, building):
         if network not in self.data:
@@ -55,6 +77,7 @@ class PlotCreator:
         self.figure_size        = tuple(config['FIGURE_SIZE'])
         self.subplot_adjustment = config['SUBPLOT_ADJUSTMENT']
         self.label_sizes        = config['LABEL_SIZES']
+        self.downsample         = config['DOWNSAMPLE']
 
 
     def create_plot(self, df, building):
@@ -81,8 +104,12 @@ class PlotCreator:
         end_index       = (i + 1)   * len(df)   // self.intervals
         split_df        = df.iloc[start_index:end_index]
         
+        # Only about 4 points per pixel column of the subplot are drawn
+        keep            = downsample_indices(split_df["dt"].values, split_df["devicecount"].values, axis_width(ax), self.downsample)
+        plot_df         = split_df.iloc[keep]
+        
         ax.set_ylim([0, max_y]) 
-        ax.plot(split_df["dt"], split_df["devicecount"], linewidth=0.8, color=color, label=network)
+        ax.plot(plot_df["dt"], plot_df["devicecount"], linewidth=0.8, color=color, label=network)
         
         ax.set_xlabel( "Date (Month/Day)",   fontsize=self.label_sizes['xlabel'] )
         ax.set_ylabel( "Device Count",       fontsize=self.label_sizes['ylabel'] )
@@ -94,7 +121,7 @@ class PlotCreator:
         ax.xaxis.set_major_locator(mdates.MonthLocator())
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%b'))
         ax.xaxis.set_minor_locator(mdates.DayLocator())
-        ax.xaxis.set_minor_formatter(mdates.ConciseDateFormatter('%b'))
+        ax.xaxis.set_minor_formatter(mdates.DateFormatter('%d'))
         ax.tick_params(axis='x', which='minor', labelsize=self.label_sizes['tick_params'])
         ax.grid(True)
         ax.legend()
@@ -114,6 +141,24 @@ class PlotSaver:
 
     def save_plot(self, building, start_date, end_date):
         
+        folder_path = self.folder_path(building, start_date, end_date)
+        
+        os.makedirs(folder_path, exist_ok=True)
+        file_path = os.path.join(folder_path, f'{building}.png')
+        
+        try:
+            plt.savefig(file_path, dpi=360)
+            print(f"{building}\tsaved to: {folder_path}")
+            
+        except Exception as e:
+            print(f"Error saving plot to {folder_path}: {e}")
+            return None
+        
+        return folder_path
+
+
+    def folder_path(self, building, start_date, end_date):
+        
         folder_name_date    =   f'{start_date}_to_{end_date}'
         folder_path         =   os.path.join(self.output_path,folder_name_date,self.folder_name_interval)
 
@@ -126,15 +171,4 @@ class PlotSaver:
         if building in self.not_good:
             folder_path = os.path.join( folder_path, 'excluded'        )
             
-        os.makedirs(folder_path, exist_ok=True)
-        file_path = os.path.join(folder_path, f'{building}.png')
-        
-        try:
-            plt.savefig(file_path, dpi=360)
-            print(f"{building}\tsaved to: {folder_path}")
-            
-        except Exception as e:
-            print(f"Error saving plot to {folder_path}: {e}")
-            return None
-        
         return folder_path 
\ No newline at end of file
@@ -0,0 +1,40 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the shared pytest setup: the repository root on `sys.path` (so that `src.python...` imports
+resolve from any working directory) and the `repository` fixture, which runs a test from the repository root
+(where `config2.json` is read) with every output directory redirected to the test's temporary directory.
+
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def repository(monkeypatch, tmp_path):
+    """Runs the test from the repository root, with `BASE_DIR` (cache, range index, chunks) in `tmp_path`."""
+
+    from src.python.processor import data_processor
+
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(data_processor, 'BASE_DIR', tmp_path)
+
+    return tmp_path
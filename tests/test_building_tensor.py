@@ -0,0 +1,153 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the tests of the BuildingTensor aggregates (`building_tensor.py`) and of the Grouping
+membership products (`grouping.py`) against the DataFrame `+=` loop of the original `aggregate_network_data`.
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.python.processor.building_tensor import BuildingTensor, nan_sum
+from src.python.processor.grouping import Grouping
+
+
+NETWORKS    = ['Eduroam', 'UCBGuest', 'UCBWireless']
+GROUPS      = {'general':       ['ADEN', 'AERO', 'ATLS'],
+               'residential':   ['C4C', 'UMC'],
+               'community':     ['ZZZZ']}
+
+
+def network_results(seed: int = 0, length: int = 720):
+    """{network: {building: df}} on one grid, with every building missing from some networks; 'OTHR' is in no group."""
+
+    rng         = np.random.default_rng(seed)
+    index       = pd.date_range('2019-09-01', periods=length, freq='1Min')
+    buildings   = [building for group in GROUPS.values() for building in group] + ['OTHR']
+    results     = {network: {} for network in NETWORKS}
+
+    for network in NETWORKS:
+        for building in buildings:
+            if rng.random() < 0.75:
+                results[network][building] = pd.DataFrame({'datetime':    index,
+                                                           'devicecount': rng.integers(0, 500, length).astype(np.float32)})
+
+    return results, index
+
+
+def dataframe_aggregates(results, groups):
+    """The original DataFrame `+=` aggregation of `aggregate_network_data`."""
+
+    sums, type_sums, counts, campus = {}, {group: pd.DataFrame() for group in groups}, dict.fromkeys(groups, 0), None
+
+    for network in NETWORKS:
+        for building, df in results[network].items():
+            group = next((group for group, members in groups.items() if building in members), None)
+
+            if building not in sums:
+                sums[building] = df.copy()
+
+            else:
+                sums[building]['devicecount'] += df['devicecount']
+
+            if group:
+                if type_sums[group].empty:
+                    type_sums[group] = df.copy()
+
+                else:
+                    type_sums[group]['devicecount'] += df['devicecount']
+
+                counts[group] += 1
+
+            if campus is None:
+                campus = df.copy()
+
+            else:
+                campus['devicecount'] += df['devicecount']
+
+    averages = {group: type_sums[group].assign(devicecount=type_sums[group]['devicecount'] / counts[group])
+                for group in groups if counts[group]}
+
+    return {'Sum': sums, 'Type': type_sums, 'Campus': campus, 'Average': averages}
+
+
+def assert_frames_close(actual: pd.DataFrame, expected: pd.DataFrame):
+    np.testing.assert_array_equal(actual['datetime'].values, expected['datetime'].values)
+    np.testing.assert_allclose(actual['devicecount'].to_numpy(np.float64), expected['devicecount'].to_numpy(np.float64), rtol=1e-6)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_aggregates_match_dataframe_loop(seed):
+
+    results, index  = network_results(seed)
+    expected        = dataframe_aggregates(results, GROUPS)
+    tensor          = BuildingTensor.from_results(results, sample_freq='1Min', start_date=index[0], end_date=index[-1])
+    actual          = tensor.to_results(GROUPS)
+
+    assert set(actual['Sum']) == set(expected['Sum'])
+
+    for building in expected['Sum']:
+        assert_frames_close(actual['Sum'][building], expected['Sum'][building])
+
+    for group in GROUPS:
+        if expected['Type'][group].empty:
+            assert actual['Type'][group].empty and actual['Average'][group].empty
+            continue
+
+        assert_frames_close(actual['Type'][group],    expected['Type'][group])
+        assert_frames_close(actual['Average'][group], expected['Average'][group])
+
+    assert_frames_close(actual['Campus'], expected['Campus'])
+
+    for network in NETWORKS:
+        assert set(actual[network]) == set(results[network])
+
+
+def test_nan_sum_is_nan_only_where_every_element_is():
+
+    values = np.array([[1, np.nan, np.nan], [2, 3, np.nan]], dtype=np.float32)
+    np.testing.assert_array_equal(nan_sum(values, axis=0), np.array([3, 3, np.nan], dtype=np.float32))
+
+
+@pytest.mark.parametrize('groups', [GROUPS, {'north': ['ADEN', 'AERO', 'C4C'], 'south': ['AERO', 'UMC', 'ZZZZ'], 'empty': ['NONE']}])
+def test_grouping_products_match_masked_sums(groups):
+    """The membership product (disjoint or overlapping groups) against one masked `nan_sum` per group, with NaN spans."""
+
+    rng     = np.random.default_rng(4)
+    values  = rng.integers(0, 500, (3, 7, 240)).astype(np.float32)
+
+    # Partial spans and whole missing series, as the tensor has for buildings that start late or are absent
+    values[0, 1, :100]  = np.nan
+    values[:, 2, 150:]  = np.nan
+    values[1, 5]        = np.nan
+    values[:, 6]        = np.nan
+
+    buildings       = ['ADEN', 'AERO', 'C4C', 'UMC', 'ZZZZ', 'ATLS', 'OTHR']
+    tensor          = BuildingTensor(values, pd.date_range('2019-09-01', periods=240, freq='1Min'), NETWORKS, buildings)
+    sums, counts    = tensor.grouping_sums(Grouping(groups))
+
+    for g, members in enumerate(groups.values()):
+        np.testing.assert_allclose(sums[g], tensor.group_sum(members), rtol=1e-6, equal_nan=True)
+        assert counts[g] == tensor.group_count(members)
+
+
+def test_network_grouping_sums_over_buildings():
+
+    values  = np.random.default_rng(5).integers(0, 500, (3, 4, 60)).astype(np.float32)
+    tensor  = BuildingTensor(values, pd.date_range('2019-09-01', periods=60, freq='1Min'), NETWORKS, ['A', 'B', 'C', 'D'])
+    sums, _ = tensor.grouping_sums(Grouping({'guest': ['UCBGuest'], 'campus': ['Eduroam', 'UCBWireless']}, axis='network'))
+
+    np.testing.assert_allclose(sums[0], values[1].sum(axis=0), rtol=1e-6)
+    np.testing.assert_allclose(sums[1], values[[0, 2]].sum(axis=(0, 1)), rtol=1e-6)
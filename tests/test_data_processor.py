@@ -0,0 +1,108 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the tests of the BuildingProcessor (`data_processor.py`) on synthetic WiFi reports:
+chunked against unchunked processing, and the in-place compaction of the shared tensor memmap.
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.python.processor.benchmark import SyntheticWiFiData
+from src.python.processor.data_processor import DataReader, BuildingProcessor, _compact_buildings
+from src.python.processor.grouping import Grouping
+
+
+START_DATE  = pd.Timestamp('2019-08-16 06:00')
+END_DATE    = pd.Timestamp('2019-08-24 12:00')
+
+
+@pytest.fixture
+def processor(repository):
+    """
+    A single-core processor over 6 synthetic buildings. There are no outages and the read margin is the
+    `CHUNK_MARGIN` of `config2.json`, so every grid point (of a chunk or not) has both interpolation neighbours.
+    """
+
+    data_directory  = repository.joinpath('WiFiData')
+    generator       = SyntheticWiFiData(data_directory, n_buildings=6, n_rows=3000, gap_probability=0, missing_probability=0.2, seed=7)
+    generator.write()
+
+    processor = BuildingProcessor(DataReader(start_date=START_DATE, end_date=END_DATE, margin='1h'),
+                                  cpu_cores=1, use_cache=False, use_archive=False, data_directory=data_directory)
+    processor.groupings['type'] = Grouping({'even': ['B000', 'B002', 'B004'], 'odd': ['B001', 'B003', 'B005']})
+
+    return processor
+
+
+def assert_frames_close(actual: pd.DataFrame, expected: pd.DataFrame):
+    np.testing.assert_array_equal(actual['datetime'].values, expected['datetime'].values)
+    np.testing.assert_allclose(actual['devicecount'].values, expected['devicecount'].values, rtol=1e-5, equal_nan=True)
+
+
+def test_chunked_matches_unchunked(processor, repository):
+
+    paths       = processor.process_chunked(window='D', output_directory=repository.joinpath('chunks'))
+    chunked     = processor.load_aggregates(paths)
+
+    whole_path  = repository.joinpath('whole', 'aggregates.npz')
+    processor.save_aggregates(processor.process_tensor(), whole_path)
+    whole       = processor.load_aggregates([whole_path])
+
+    assert len(paths) == 9
+    assert len(whole['Campus']) == len(pd.date_range(START_DATE, END_DATE, freq='1Min'))
+    assert_frames_close(chunked['Campus'], whole['Campus'])
+
+    assert set(chunked['Sum']) == set(whole['Sum'])
+
+    for building in whole['Sum']:
+        assert_frames_close(chunked['Sum'][building], whole['Sum'][building])
+
+    for group in ('even', 'odd'):
+        assert_frames_close(chunked['Type'][group],    whole['Type'][group])
+        assert_frames_close(chunked['Average'][group], whole['Average'][group])
+
+
+def test_process_directories_matches_tensor(processor):
+
+    tensor  = processor.process_tensor()
+    frames  = processor.process_directories()
+
+    for i, network in enumerate(tensor.networks):
+        for j, building in enumerate(tensor.buildings):
+            if not tensor.present[i, j]:
+                assert building not in frames[network]
+                continue
+
+            series = tensor.values[i, j]
+            np.testing.assert_array_equal(frames[network][building]['devicecount'].values, series[~np.isnan(series)])
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_compact_buildings_in_place(tmp_path, seed):
+
+    rng     = np.random.default_rng(seed)
+    shape   = (3, 9, 50)
+    output  = np.memmap(tmp_path.joinpath('tensor.dat'), dtype=np.float32, mode='w+', shape=shape)
+    output[:] = rng.random(shape)
+    present = rng.random(shape[1]) < 0.6
+    kept    = np.array(output[:, present])
+
+    compacted = _compact_buildings(output, present)
+
+    np.testing.assert_array_equal(compacted, kept)
+
+    if kept.size:
+        assert np.shares_memory(compacted, output)
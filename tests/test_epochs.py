@@ -0,0 +1,49 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the tests of `nan_quantiles` (`epochs.py`) against `np.nanquantile`.
+
+"""
+
+import warnings
+import numpy as np
+import pytest
+
+from src.python.time_series.epochs import nan_quantiles
+
+
+QUANTILES = [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+
+
+@pytest.mark.parametrize('shape', [(1, 5), (7, 4, 30), (40, 6, 120)])
+@pytest.mark.parametrize('nan_fraction', [0.0, 0.3, 0.9])
+def test_matches_nanquantile(shape, nan_fraction):
+
+    rng     = np.random.default_rng(len(shape) * 10 + int(nan_fraction * 10))
+    values  = rng.normal(100, 30, shape).astype(np.float32)
+    values[rng.random(shape) < nan_fraction] = np.nan
+
+    # An all-NaN column has no quantiles
+    values[:, 0] = np.nan
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        expected = np.nanquantile(values.astype(np.float64), QUANTILES, axis=0)
+
+    np.testing.assert_allclose(nan_quantiles(values, QUANTILES), expected, rtol=1e-5, atol=1e-4, equal_nan=True)
+
+
+def test_ties_and_single_values():
+
+    values = np.array([[1.0, 5.0, np.nan], [1.0, np.nan, np.nan], [3.0, np.nan, 2.0]])
+    np.testing.assert_allclose(nan_quantiles(values, [0.5]), [[1.0, 5.0, 2.0]])
@@ -0,0 +1,91 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the tests of the EventStore window queries (`event_store.py`) against a brute-force scan
+of every (window, event) pair.
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.python.time_series.event_store import EventStore
+
+
+START = np.datetime64('2019-08-16T00:00:00', 'ns')
+
+
+def random_store(rng, n_events: int = 200) -> EventStore:
+    """Events over 60 days: a third instants, the rest from 1 minute to 10 days long, with repeated starts."""
+
+    starts      = START + rng.integers(0, 60 * 1440, n_events).astype('timedelta64[m]')
+    starts[:10] = starts[10:20]
+    durations   = np.where(rng.random(n_events) < 1 / 3, 0, rng.integers(1, 10 * 1440, n_events)).astype('timedelta64[m]')
+
+    return EventStore([f"event-{k}" for k in range(n_events)], starts, starts + durations,
+                      rng.choice(['academic', 'athletics', 'holiday'], n_events))
+
+
+def brute_force_overlaps(store: EventStore, window_starts, window_ends):
+    """Every (window, event) pair where the event [start, end) (or the instant start) meets the closed window."""
+
+    pairs = []
+
+    for w, (window_start, window_end) in enumerate(zip(window_starts, window_ends)):
+        for e, (start, end) in enumerate(zip(store.starts, store.ends)):
+            instant = start == end
+
+            if (window_start <= start <= window_end) if instant else (start <= window_end and end > window_start):
+                pairs.append((w, e))
+
+    return pairs
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_overlaps_match_brute_force(seed):
+
+    rng             = np.random.default_rng(seed)
+    store           = random_store(rng)
+    window_starts   = START + rng.integers(-1440, 61 * 1440, 300).astype('timedelta64[m]')
+    window_ends     = window_starts + rng.integers(0, 3 * 1440, 300).astype('timedelta64[m]')
+
+    # Windows that start or end exactly on event bounds
+    window_starts[:20]      = store.ends[:20]
+    window_ends[:20]        = np.maximum(window_ends[:20], window_starts[:20])
+    window_ends[20:40]      = store.starts[20:40]
+    window_starts[20:40]    = np.minimum(window_starts[20:40], window_ends[20:40])
+
+    windows, events = store.overlaps(window_starts, window_ends)
+
+    assert list(zip(windows, events)) == brute_force_overlaps(store, window_starts, window_ends)
+
+
+def test_overlapping_single_window():
+
+    store = EventStore(['a', 'b', 'c'], ['2019-09-01 00:00', '2019-09-02 00:00', '2019-09-03 12:00'],
+                                        ['2019-09-02 00:00', None,               '2019-09-04 00:00'])
+
+    assert list(store.names[store.overlapping(np.datetime64('2019-09-02'), np.datetime64('2019-09-03'))]) == ['b']
+    assert list(store.names[store.overlapping(np.datetime64('2019-09-01'), np.datetime64('2019-09-05'))]) == ['a', 'b', 'c']
+
+
+def test_days_treats_ends_as_exclusive():
+
+    store   = EventStore(['midnight', 'instant', 'overnight'],
+                         ['2019-09-01 00:00', '2019-09-02 15:00', '2019-09-03 20:00'],
+                         ['2019-09-02 00:00', None,               '2019-09-04 02:00'])
+    days    = store.days()
+
+    np.testing.assert_array_equal(days.starts, pd.to_datetime(['2019-09-01', '2019-09-02', '2019-09-03']).values)
+    np.testing.assert_array_equal(days.ends,   pd.to_datetime(['2019-09-02', '2019-09-03', '2019-09-05']).values)
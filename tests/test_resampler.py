@@ -0,0 +1,114 @@
+########################################################################
+#
+# AUTHOR:         TYLER A. REISER
+# CREATED:        OCTOBER     2026
+# MODIFIED:       OCTOBER     2026
+#
+# COPYRIGHT (c) 2026 Tyler A. Reiser
+#
+########################################################################
+
+
+"""
+
+This module contains the tests of the BatchResampler (`resampler.py`) against `scipy.interpolate.interp1d`,
+the per-file interpolation it replaced, and against a brute-force scan for the 'zero' kind.
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.interpolate import interp1d
+
+from src.python.processor.resampler import BatchResampler, resample_frames, to_nanoseconds
+
+
+START = np.datetime64('2019-08-16T00:00:00', 'ns')
+
+
+def irregular_series(rng, rows: int = 500):
+    """Sorted timestamps 20 s to 400 s apart, starting within the first hour, and device counts."""
+
+    offsets = rng.integers(0, 3600) + np.cumsum(rng.integers(20, 400, rows))
+    return START + offsets.astype('timedelta64[s]'), rng.integers(0, 500, rows).astype(np.float64)
+
+
+def grid_around(times, freq: str = '1Min') -> pd.DatetimeIndex:
+    """A grid that starts before the first sample and ends after the last one."""
+    return pd.date_range(START, pd.Timestamp(times[-1]) + pd.Timedelta('1h'), freq=freq)
+
+
+def reference(times, values, grid: pd.DatetimeIndex, kind: str) -> np.ndarray:
+    """`interp1d` on int64 nanoseconds, NaN outside the span of the samples."""
+
+    f = interp1d(to_nanoseconds(times).astype(np.float64), values, kind=kind, bounds_error=False, fill_value=np.nan, assume_sorted=True)
+    return f(to_nanoseconds(grid).astype(np.float64))
+
+
+@pytest.mark.parametrize('kind', ['linear', 'previous', 'nearest', 'next', 'slinear', 'cubic'])
+@pytest.mark.parametrize('freq', ['1Min', '5Min', '7s'])
+def test_matches_interp1d(kind, freq):
+
+    rng = np.random.default_rng(0)
+
+    for _ in range(20):
+        times, values   = irregular_series(rng)
+        grid            = grid_around(times, freq)
+        resampled       = BatchResampler(grid, kind=kind).resample_series(times, values)
+        expected        = reference(times, values, grid, kind)
+
+        np.testing.assert_array_equal(np.isnan(resampled), np.isnan(expected))
+        np.testing.assert_allclose(resampled, expected, rtol=1e-5, atol=1e-3, equal_nan=True)
+
+
+def test_zero_matches_brute_force():
+
+    rng             = np.random.default_rng(1)
+    times, values   = irregular_series(rng, 300)
+    grid            = grid_around(times, '2Min')
+    resampled       = BatchResampler(grid, kind='zero').resample_series(times, values)
+    step            = grid[1] - grid[0]
+
+    for g, point in enumerate(grid):
+        if point < times[0] or point > times[-1]:
+            assert np.isnan(resampled[g])
+            continue
+
+        # The last sample in the cell (point - step, point], 0 if the cell holds none
+        inside = np.flatnonzero((times > np.datetime64(point - step)) & (times <= np.datetime64(point)))
+        assert resampled[g] == (values[inside[-1]] if len(inside) else 0.0)
+
+
+def test_batch_matches_single_series():
+
+    rng         = np.random.default_rng(2)
+    series      = [irregular_series(rng, int(rows)) for rows in rng.integers(2, 400, 30)]
+    grid        = pd.date_range(START, START + np.timedelta64(3, 'D'), freq='1Min')
+    resampler   = BatchResampler(grid)
+    batch       = resampler.resample([t for t, _ in series], [v for _, v in series])
+
+    assert batch.shape == (len(series), len(grid))
+    assert batch.dtype == np.float32
+
+    for row, (times, values) in zip(batch, series):
+        np.testing.assert_array_equal(row, resampler.resample_series(times, values))
+
+
+def test_exact_on_grid_points():
+    """Frames already on the grid come back unchanged, as `BuildingTensor.from_results` relies on."""
+
+    grid    = pd.date_range('2019-09-01', periods=500, freq='1Min')
+    values  = np.random.default_rng(3).integers(0, 500, len(grid)).astype(np.float32)
+    frame   = pd.DataFrame({'datetime': grid, 'devicecount': values})
+
+    np.testing.assert_array_equal(resample_frames([frame], grid)[0], values)
+
+
+def test_rejects_uneven_grid_and_unknown_kind():
+
+    with pytest.raises(ValueError):
+        BatchResampler(pd.DatetimeIndex(['2019-09-01 00:00', '2019-09-01 00:01', '2019-09-01 00:03']))
+
+    with pytest.raises(ValueError):
+        BatchResampler(pd.date_range('2019-09-01', periods=3, freq='1Min'), kind='spline')